@@ -0,0 +1,241 @@
+import asyncio
+import contextlib
+import enum
+import json
+import math
+import os
+import re
+import time
+from typing import List, Optional, Pattern, Tuple
+
+from dotenv import load_dotenv
+
+from database import engine, settings
+from metrics import registry, Counter, Gauge, db_pool_checkout_wait, pipeline_in_progress
+
+load_dotenv()
+
+# 과부하 시 우선순위가 낮은 요청을 미리 거절 (off 면 모든 요청 통과)
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() in ("1", "true", "yes", "on")
+# 부하 신호 샘플링 주기와 지수 이동 평균(EWMA) 가중치
+ADMISSION_SAMPLE_INTERVAL = float(os.getenv("ADMISSION_SAMPLE_INTERVAL", "0.1"))
+ADMISSION_EWMA_ALPHA = float(os.getenv("ADMISSION_EWMA_ALPHA", "0.3"))
+# 신호별 과부하 기준 - 기준을 넘으면 AI 요청을, ADMISSION_WRITE_PRESSURE 배를 넘으면 쓰기 요청까지 거절
+ADMISSION_POOL_UTILIZATION = float(os.getenv("ADMISSION_POOL_UTILIZATION", "0.7"))
+ADMISSION_CHECKOUT_WAIT_MS = float(os.getenv("ADMISSION_CHECKOUT_WAIT_MS", "50"))
+ADMISSION_LOOP_LAG_MS = float(os.getenv("ADMISSION_LOOP_LAG_MS", "100"))
+ADMISSION_PIPELINE_DEPTH = int(os.getenv("ADMISSION_PIPELINE_DEPTH", "50"))
+ADMISSION_WRITE_PRESSURE = float(os.getenv("ADMISSION_WRITE_PRESSURE", "1.4"))
+# 우선순위별 동시 처리 요청 수 상한 - 신호가 올라가기 전에 몰려온 요청을 한 번에 받지 않도록
+ADMISSION_AI_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_AI_MAX_IN_FLIGHT", "16"))
+ADMISSION_WRITE_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_WRITE_MAX_IN_FLIGHT", "8"))
+# 백그라운드 태그 파이프라인의 DB 단계 동시 실행 수 - 요청이 아니라 거절할 수 없으므로 조회용 커넥션을 남겨 둠
+ADMISSION_PIPELINE_DB_CONCURRENCY = int(os.getenv("ADMISSION_PIPELINE_DB_CONCURRENCY", "2"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+
+
+class Priority(enum.IntEnum):
+    """요청 우선순위 - 값이 작을수록 먼저 거절"""
+    AI = 0
+    WRITE = 1
+    CRITICAL = 2  # 인증/조회 - 거절하지 않음
+
+
+# (메서드, 경로 정규식, 우선순위) - 위에서부터 처음 맞는 규칙 적용, 없으면 메서드로 결정
+PRIORITY_RULES: List[Tuple[str, Pattern, Priority]] = [
+    ("POST", re.compile(r"^/diaries/\d+/comment/?$"), Priority.AI),
+    ("POST", re.compile(r"^/user/(signup|signin|signout|token/refresh)/?$"), Priority.CRITICAL),
+]
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+admission_rejected_total = registry.register(Counter(
+    "admission_rejected_total", "과부하로 거절한 요청 수", ("priority", "reason")))
+admission_loop_lag = registry.register(Gauge(
+    "admission_event_loop_lag_seconds", "이벤트 루프 지연 EWMA"))
+admission_checkout_wait = registry.register(Gauge(
+    "admission_checkout_wait_seconds", "커넥션 풀 체크아웃 대기 시간 EWMA (primary)"))
+admission_in_flight = registry.register(Gauge(
+    "admission_in_flight", "우선순위별 처리 중인 요청 수", ("priority",)))
+
+
+def classify_request(method: str, path: str) -> Priority:
+    """요청 메서드/경로로 우선순위 결정 (라우팅 전에 호출되므로 경로 문자열 기준)"""
+    for rule_method, pattern, priority in PRIORITY_RULES:
+        if method == rule_method and pattern.match(path):
+            return priority
+    return Priority.CRITICAL if method in _READ_METHODS else Priority.WRITE
+
+
+class LoadSignals:
+    """
+    과부하 판단에 쓰는 신호를 주기적으로 샘플링해 EWMA 로 보관
+
+    - 이벤트 루프 지연: sleep 이 예정보다 늦게 깨어난 시간
+    - 커넥션 풀 체크아웃 대기: 샘플 구간 동안의 평균 대기 시간 (체크아웃이 없으면 0)
+    - 커넥션 풀 사용률, 태그 파이프라인 대기/처리 수: 판단 시점의 값
+
+    async 엔드포인트는 이벤트 루프에서 커넥션을 체크아웃하므로 풀이 가득 차면 루프 자체가 멈춘다.
+    EWMA 신호는 멈춘 뒤에야 올라가므로, 풀 사용률로 가득 차기 전에 거절을 시작한다.
+    """
+
+    def __init__(self, interval: float = ADMISSION_SAMPLE_INTERVAL, alpha: float = ADMISSION_EWMA_ALPHA):
+        self.interval = interval
+        self.alpha = alpha
+        self.loop_lag = 0.0
+        self.checkout_wait = 0.0
+        self._checkout_totals = db_pool_checkout_wait.totals(role="primary")
+        self._task: Optional[asyncio.Task] = None
+
+    def _ewma(self, previous: float, sample: float) -> float:
+        return previous + self.alpha * (sample - previous)
+
+    def sample(self, loop_lag: float):
+        count, total = db_pool_checkout_wait.totals(role="primary")
+        previous_count, previous_total = self._checkout_totals
+        self._checkout_totals = (count, total)
+        wait = (total - previous_total) / (count - previous_count) if count > previous_count else 0.0
+
+        self.loop_lag = self._ewma(self.loop_lag, loop_lag)
+        self.checkout_wait = self._ewma(self.checkout_wait, wait)
+        admission_loop_lag.set(self.loop_lag)
+        admission_checkout_wait.set(self.checkout_wait)
+
+    @staticmethod
+    def pool_utilization() -> float:
+        """primary 풀에서 사용 중인 커넥션 비율 (크기 제한이 없는 풀이면 0)"""
+        pool = engine.pool
+        if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+            return 0.0
+        capacity = pool.size() + max(settings.max_overflow, 0)
+        return pool.checkedout() / capacity if capacity else 0.0
+
+    @staticmethod
+    def pipeline_depth() -> float:
+        return pipeline_in_progress.value()
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.sample(max(0.0, time.perf_counter() - started - self.interval))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def pressure(self) -> Tuple[float, str]:
+        """
+        기준 대비 가장 높은 신호의 비율 (1 이상이면 과부하)
+
+        Returns:
+            Tuple[float, str]: (비율, 신호 이름)
+        """
+        ratios = [
+            (self.pool_utilization() / ADMISSION_POOL_UTILIZATION, "pool_utilization"),
+            (self.checkout_wait * 1000 / ADMISSION_CHECKOUT_WAIT_MS, "checkout_wait"),
+            (self.loop_lag * 1000 / ADMISSION_LOOP_LAG_MS, "loop_lag"),
+            (self.pipeline_depth() / ADMISSION_PIPELINE_DEPTH, "pipeline_depth"),
+        ]
+        return max(ratios)
+
+
+load_signals = LoadSignals()
+
+
+_MAX_IN_FLIGHT = {Priority.AI: ADMISSION_AI_MAX_IN_FLIGHT, Priority.WRITE: ADMISSION_WRITE_MAX_IN_FLIGHT}
+
+
+class AdmissionController:
+    """우선순위와 부하 신호로 요청을 받을지 결정"""
+
+    def __init__(self, signals: LoadSignals):
+        self.signals = signals
+        self.in_flight = {priority: 0 for priority in Priority}
+
+    def check(self, priority: Priority) -> Optional[str]:
+        """
+        Returns:
+            Optional[str]: 거절 사유 (받을 수 있으면 None)
+        """
+        if priority == Priority.CRITICAL:
+            return None
+        if self.in_flight[priority] >= _MAX_IN_FLIGHT[priority]:
+            return "in_flight"
+
+        ratio, signal = self.signals.pressure()
+        threshold = 1.0 if priority == Priority.AI else ADMISSION_WRITE_PRESSURE
+        if ratio >= threshold:
+            return signal
+        return None
+
+    def retry_after(self) -> int:
+        ratio, _ = self.signals.pressure()
+        return ADMISSION_RETRY_AFTER_SECONDS * max(1, min(math.ceil(ratio), 6))
+
+
+admission_controller = AdmissionController(load_signals)
+pipeline_db_slots = (asyncio.Semaphore(ADMISSION_PIPELINE_DB_CONCURRENCY) if ADMISSION_CONTROL
+                     else contextlib.nullcontext())
+
+_REJECT_BODY = json.dumps({"detail": "요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해 주세요."},
+                          ensure_ascii=False).encode("utf-8")
+
+
+class AdmissionControlMiddleware:
+    """과부하 시 우선순위가 낮은 요청을 503 + Retry-After 로 미리 거절하는 ASGI 미들웨어"""
+
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ADMISSION_CONTROL:
+            await self.app(scope, receive, send)
+            return
+
+        priority = classify_request(scope["method"], scope["path"])
+        reason = self.controller.check(priority)
+        if reason is not None:
+            admission_rejected_total.inc(priority=priority.name, reason=reason)
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_REJECT_BODY)).encode()),
+                    (b"retry-after", str(self.controller.retry_after()).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": _REJECT_BODY})
+            return
+
+        self.controller.in_flight[priority] += 1
+        admission_in_flight.inc(priority=priority.name)
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self.controller.in_flight[priority] -= 1
+                admission_in_flight.dec(priority=priority.name)
+
+        # 백그라운드 태스크는 응답을 보낸 뒤 같은 호출 안에서 실행되므로, 응답 전송이 끝나면 처리 중에서 제외
+        async def send_wrapper(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                release()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release()
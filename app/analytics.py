@@ -0,0 +1,316 @@
+import argparse
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import Diary, Tag, User, diary_tag, EmotionRollup, TagRollup, CategoryRollup
+
+PERIODS = ("day", "month")
+
+
+class DiaryContribution(NamedTuple):
+    """일기 한 건이 롤업 테이블에 기여하는 값"""
+    date: date
+    emotion: Optional[str]
+    tags: Tuple[Tuple[int, Optional[str]], ...]  # (tag_id, category)
+
+
+def period_start(value: date, period: str) -> date:
+    """날짜를 집계 구간의 시작일로 변환"""
+    if isinstance(value, datetime):
+        value = value.date()
+    if period == "month":
+        return value.replace(day=1)
+    return value
+
+
+def diary_contribution(diary: Diary) -> Optional[DiaryContribution]:
+    """현재 DB 상태 기준으로 일기의 롤업 기여분 계산"""
+    if diary is None or diary.date is None:
+        return None
+    return DiaryContribution(
+        date=diary.date.date() if isinstance(diary.date, datetime) else diary.date,
+        emotion=diary.emotion,
+        tags=tuple(sorted((tag.id, tag.category) for tag in diary.tags)),
+    )
+
+
+def _contribution_deltas(contribution: Optional[DiaryContribution], sign: int,
+                         emotions: Counter, tags: Counter, categories: Counter):
+    if contribution is None:
+        return
+    for period in PERIODS:
+        start = period_start(contribution.date, period)
+        if contribution.emotion:
+            emotions[(period, start, contribution.emotion)] += sign
+        for tag_id, category in contribution.tags:
+            tags[(period, start, tag_id)] += sign
+            if category:
+                categories[(period, start, category)] += sign
+
+
+def _apply_delta(db: Session, model, key: Dict, delta: int):
+    """롤업 행의 count 에 delta 를 더함 (행이 없으면 생성) - upsert 를 지원하지 않는 DB 용"""
+    if delta == 0:
+        return
+
+    updated = db.query(model).filter_by(**key).update(
+        {model.count: model.count + delta}, synchronize_session=False
+    )
+    if updated or delta < 0:
+        return
+
+    try:
+        with db.begin_nested():
+            db.add(model(**key, count=delta))
+    except IntegrityError:
+        # 동시에 다른 트랜잭션이 같은 행을 만든 경우
+        db.query(model).filter_by(**key).update(
+            {model.count: model.count + delta}, synchronize_session=False
+        )
+
+
+def _upsert_statement(dialect: str, table, rows: List[Dict]):
+    """count 를 더하는 다중 행 upsert 문 (지원하지 않는 DB 면 None)"""
+    if dialect == "mysql":
+        statement = mysql.insert(table).values(rows)
+        return statement.on_duplicate_key_update(count=table.c.count + statement.inserted.count)
+    if dialect == "sqlite":
+        statement = sqlite.insert(table).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[column.name for column in table.primary_key.columns],
+            set_={"count": table.c.count + statement.excluded.count}
+        )
+    return None
+
+
+def _apply_table_deltas(db: Session, model, key_column: str, user_id: int, deltas: Counter):
+    """
+    한 롤업 테이블의 delta 를 모아서 반영하는 함수
+
+    증가분은 upsert 한 번으로, 감소분은 (행이 이미 있으므로) executemany UPDATE 한 번으로 처리한다.
+    """
+    increments, decrements = [], []
+    for (period, start, value), delta in deltas.items():
+        row = {"user_id": user_id, "period": period, "period_start": start, key_column: value, "count": delta}
+        if delta > 0:
+            increments.append(row)
+        elif delta < 0:
+            decrements.append(row)
+
+    table = model.__table__
+    statement = _upsert_statement(db.get_bind().dialect.name, table, increments) if increments else None
+    if statement is None:
+        for row in increments:
+            delta = row.pop("count")
+            _apply_delta(db, model, row, delta)
+    else:
+        db.execute(statement)
+
+    if decrements:
+        db.execute(
+            update(table).where(and_(
+                table.c.user_id == bindparam("key_user_id"),
+                table.c.period == bindparam("key_period"),
+                table.c.period_start == bindparam("key_period_start"),
+                table.c[key_column] == bindparam("key_value"),
+            )).values(count=table.c.count + bindparam("delta")),
+            [{"key_user_id": row["user_id"], "key_period": row["period"], "key_period_start": row["period_start"],
+              "key_value": row[key_column], "delta": row["count"]} for row in decrements]
+        )
+
+
+def apply_contribution_change(db: Session, user_id: int,
+                              before: Optional[DiaryContribution],
+                              after: Optional[DiaryContribution]):
+    """
+    일기 변경 전후의 기여분 차이만큼 롤업 테이블을 갱신하는 함수.
+    호출한 쪽의 트랜잭션 안에서 실행되므로 일기 변경과 함께 커밋된다.
+
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        before: 변경 전 기여분 (새 일기라면 None)
+        after: 변경 후 기여분 (삭제라면 None)
+    """
+    if before == after:
+        return
+
+    emotions, tags, categories = Counter(), Counter(), Counter()
+    _contribution_deltas(before, -1, emotions, tags, categories)
+    _contribution_deltas(after, 1, emotions, tags, categories)
+    _apply_deltas(db, user_id, emotions, tags, categories)
+
+
+def _apply_deltas(db: Session, user_id: int, emotions: Counter, tags: Counter, categories: Counter):
+    _apply_table_deltas(db, EmotionRollup, "emotion", user_id, emotions)
+    _apply_table_deltas(db, TagRollup, "tag_id", user_id, tags)
+    _apply_table_deltas(db, CategoryRollup, "category", user_id, categories)
+
+
+def get_trends(db: Session, user_id: int, period: str, start: date, end: date,
+               top_tags: int = 5) -> List[Dict]:
+    """
+    롤업 테이블에서 기간별 감정/태그/카테고리 추이를 조회하는 함수
+
+    Returns:
+        List[Dict]: 구간 시작일 순으로 정렬된 집계 목록
+    """
+    start = period_start(start, period)
+    buckets = defaultdict(lambda: {"emotions": {}, "tags": [], "categories": {}})
+
+    emotion_rows = db.query(EmotionRollup).filter(
+        EmotionRollup.user_id == user_id,
+        EmotionRollup.period == period,
+        EmotionRollup.period_start.between(start, end),
+        EmotionRollup.count > 0
+    )
+    for row in emotion_rows:
+        buckets[row.period_start]["emotions"][row.emotion] = row.count
+
+    tag_rows = db.query(TagRollup.period_start, TagRollup.count, Tag.id, Tag.name, Tag.category).join(
+        Tag, Tag.id == TagRollup.tag_id
+    ).filter(
+        TagRollup.user_id == user_id,
+        TagRollup.period == period,
+        TagRollup.period_start.between(start, end),
+        TagRollup.count > 0
+    )
+    for row in tag_rows:
+        buckets[row.period_start]["tags"].append(
+            {"id": row.id, "name": row.name, "category": row.category, "count": row.count}
+        )
+
+    category_rows = db.query(CategoryRollup).filter(
+        CategoryRollup.user_id == user_id,
+        CategoryRollup.period == period,
+        CategoryRollup.period_start.between(start, end),
+        CategoryRollup.count > 0
+    )
+    for row in category_rows:
+        buckets[row.period_start]["categories"][row.category] = row.count
+
+    trends = []
+    for bucket_start in sorted(buckets):
+        bucket = buckets[bucket_start]
+        bucket["tags"].sort(key=lambda tag: (-tag["count"], tag["name"]))
+        trends.append({
+            "period_start": bucket_start,
+            "emotions": bucket["emotions"],
+            "top_tags": bucket["tags"][:top_tags],
+            "categories": bucket["categories"],
+        })
+    return trends
+
+
+def remove_diaries(db: Session, user_id: int, diary_ids: List[int]):
+    """
+    삭제할 일기들의 기여분을 롤업 테이블에서 한 번에 빼는 함수 (일괄 삭제용).
+    일기를 삭제하기 전에, 같은 트랜잭션 안에서 호출해야 한다.
+
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        diary_ids: 삭제할 일기 ID 목록
+    """
+    emotions, tags, categories = Counter(), Counter(), Counter()
+    for contribution in _user_contributions(db, user_id, diary_ids):
+        _contribution_deltas(contribution, -1, emotions, tags, categories)
+    _apply_deltas(db, user_id, emotions, tags, categories)
+
+
+def delete_user_rollups(db: Session, user_id: int):
+    """사용자의 롤업 행을 모두 삭제"""
+    for model in (EmotionRollup, TagRollup, CategoryRollup):
+        db.query(model).filter(model.user_id == user_id).delete(synchronize_session=False)
+
+
+def _user_contributions(db: Session, user_id: int,
+                        diary_ids: Optional[List[int]] = None) -> Iterable[DiaryContribution]:
+    diary_query = db.query(Diary.id, Diary.date, Diary.emotion).filter(Diary.user_id == user_id)
+    tag_query = db.query(diary_tag.c.diary_id, Tag.id, Tag.category).join(
+        Tag, Tag.id == diary_tag.c.tag_id
+    ).join(
+        Diary, Diary.id == diary_tag.c.diary_id
+    ).filter(Diary.user_id == user_id)
+    if diary_ids is not None:
+        diary_query = diary_query.filter(Diary.id.in_(diary_ids))
+        tag_query = tag_query.filter(diary_tag.c.diary_id.in_(diary_ids))
+    diary_rows = diary_query.all()
+
+    tags_by_diary = defaultdict(list)
+    tag_rows = tag_query
+    for diary_id, tag_id, category in tag_rows:
+        tags_by_diary[diary_id].append((tag_id, category))
+
+    for diary_id, diary_date, emotion in diary_rows:
+        if diary_date is None:
+            continue
+        yield DiaryContribution(
+            date=diary_date.date() if isinstance(diary_date, datetime) else diary_date,
+            emotion=emotion,
+            tags=tuple(sorted(tags_by_diary[diary_id])),
+        )
+
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    원본 테이블로부터 롤업 테이블을 다시 계산하는 함수 (백필/정합성 복구용)
+
+    Args:
+        db: DB 세션
+        user_id: 특정 사용자만 다시 계산할 경우 사용자 ID
+
+    Returns:
+        int: 다시 계산한 사용자 수
+    """
+    if user_id is None:
+        user_ids = [row.id for row in db.query(User.id).order_by(User.id)]
+    else:
+        user_ids = [user_id]
+
+    for uid in user_ids:
+        delete_user_rollups(db, uid)
+
+        emotions, tags, categories = Counter(), Counter(), Counter()
+        for contribution in _user_contributions(db, uid):
+            _contribution_deltas(contribution, 1, emotions, tags, categories)
+
+        db.bulk_insert_mappings(EmotionRollup, [
+            {"user_id": uid, "period": p, "period_start": s, "emotion": e, "count": c}
+            for (p, s, e), c in emotions.items() if c
+        ])
+        db.bulk_insert_mappings(TagRollup, [
+            {"user_id": uid, "period": p, "period_start": s, "tag_id": t, "count": c}
+            for (p, s, t), c in tags.items() if c
+        ])
+        db.bulk_insert_mappings(CategoryRollup, [
+            {"user_id": uid, "period": p, "period_start": s, "category": k, "count": c}
+            for (p, s, k), c in categories.items() if c
+        ])
+        db.commit()
+        print(f"사용자 ID {uid}의 통계 롤업 재계산 완료")
+
+    return len(user_ids)
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="감정/태그 통계 롤업 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild_parser = subparsers.add_parser("rebuild", help="원본 테이블로부터 롤업 재계산")
+    rebuild_parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        count = rebuild_rollups(session, args.user_id)
+        print(f"총 {count}명의 통계 롤업을 재계산했습니다.")
+    finally:
+        session.close()
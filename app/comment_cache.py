@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import CommentCache, Diary, IdempotencyKey
+from prompt import COMMENT_MODEL, COMMENT_PROMPT_TOKEN_BUDGET, COMMENT_PROMPT_VERSION
+
+load_dotenv()
+
+# Idempotency-Key 로 저장한 응답을 재사용하는 기간
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+
+def similar_diary_versions(db: Session, diary_ids: List[int]) -> List[Tuple[int, Optional[datetime]]]:
+    """유사 일기의 (ID, updated_at) 목록을 입력 순서대로 반환 - 유사 일기가 수정되면 캐시 키가 바뀜"""
+    if not diary_ids:
+        return []
+    updated = dict(db.query(Diary.id, Diary.updated_at).filter(Diary.id.in_(diary_ids)))
+    return [(diary_id, updated.get(diary_id)) for diary_id in diary_ids]
+
+
+def comment_cache_key(diary_id: int, diary_content: str,
+                      similar_versions: List[Tuple[int, Optional[datetime]]]) -> str:
+    """
+    코멘트 캐시 키 계산
+
+    현재 일기 내용, 프롬프트에 들어가는 유사 일기(ID, 수정 시각), 프롬프트/모델 버전이
+    모두 같으면 같은 키가 된다.
+
+    Returns:
+        str: sha256 hex
+    """
+    material = json.dumps({
+        "diary_id": diary_id,
+        "content": hashlib.sha256((diary_content or "").encode("utf-8")).hexdigest(),
+        "similar": [[similar_id, updated_at.isoformat() if updated_at else None]
+                    for similar_id, updated_at in similar_versions],
+        "prompt_version": COMMENT_PROMPT_VERSION,
+        "model": COMMENT_MODEL,
+        "budget": COMMENT_PROMPT_TOKEN_BUDGET,
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def get_cached_comment(db: Session, cache_key: str) -> Optional[str]:
+    """캐시된 코멘트 조회 (없으면 None)"""
+    row = db.query(CommentCache.comment).filter(CommentCache.cache_key == cache_key).first()
+    return row[0] if row else None
+
+
+def store_cached_comment(db: Session, diary_id: int, cache_key: str, comment: str):
+    """
+    코멘트를 캐시에 저장하는 함수 (커밋은 호출한 쪽에서)
+
+    일기당 최신 키 하나만 남기고, 다른 프로세스가 같은 키를 먼저 저장했으면 무시한다.
+    """
+    db.query(CommentCache).filter(
+        CommentCache.diary_id == diary_id,
+        CommentCache.cache_key != cache_key
+    ).delete(synchronize_session=False)
+    try:
+        with db.begin_nested():
+            db.add(CommentCache(cache_key=cache_key, diary_id=diary_id, comment=comment))
+    except IntegrityError:
+        pass
+
+
+def idempotency_request_hash(diary_id: int, similar_diaries_count: int) -> str:
+    """같은 Idempotency-Key 로 다른 요청을 보냈는지 확인하기 위한 요청 해시"""
+    material = json.dumps({"diary_id": diary_id, "similar_diaries_count": similar_diaries_count}, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _idempotency_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def get_idempotent_response(db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    """만료되지 않은 저장 응답 조회 (없으면 None)"""
+    return db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.created_at >= _idempotency_cutoff()
+    ).first()
+
+
+def store_idempotent_response(db: Session, user_id: int, key: str, request_hash: str, response: Dict):
+    """
+    응답을 Idempotency-Key 로 저장하는 함수 (커밋은 호출한 쪽에서)
+
+    저장하면서 해당 사용자의 만료된 키를 함께 정리한다.
+    동시에 같은 키로 먼저 저장된 응답이 있으면 그 응답을 유지한다.
+    """
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.created_at < _idempotency_cutoff()
+    ).delete(synchronize_session=False)
+    try:
+        with db.begin_nested():
+            db.add(IdempotencyKey(user_id=user_id, key=key, request_hash=request_hash,
+                                  response=json.dumps(response, ensure_ascii=False)))
+    except IntegrityError:
+        pass
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 비동기 작업을 한 번만 실행하고 결과를 공유 (프로세스 단위)
+
+    먼저 온 요청이 작업을 태스크로 시작하고, 끝나기 전에 같은 키로 들어온 요청은 그 태스크를 기다린다.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Returns:
+            Tuple[Any, bool]: (결과, 다른 요청의 실행 결과를 공유했는지 여부)
+        """
+        task = self._tasks.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        # 요청 하나가 취소(클라이언트 연결 끊김)되어도 다른 요청이 기다리는 작업은 계속 실행
+        return await asyncio.shield(task), shared
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+
+comment_flight = SingleFlight()
@@ -1,30 +1,328 @@
+import contextvars
+import hashlib
+import hmac
+import itertools
+import math
 import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 import urllib.parse
 
 load_dotenv()
 
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = urllib.parse.quote_plus(os.getenv("DB_PASSWORD"))
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_NAME = os.getenv("DB_NAME")
-
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_recycle=3600,  # 연결을 1시간마다 재생성
-    pool_pre_ping=True,  # 쿼리 실행 전 연결 상태 확인
-    pool_size=5,  # 기본 연결 풀 크기
-    max_overflow=10,  # 추가로 생성할 수 있는 최대 연결 수
-    # 연결 타임아웃 설정
-    connect_args={
-        "connect_timeout": 60,  # 연결 시도 타임아웃 (초)
+APP_ENV = os.getenv("APP_ENV", "development").lower()
+
+# 환경별 기본 커넥션 풀 설정 (개별 DB_* 환경 변수가 있으면 그 값을 우선 사용)
+POOL_PRESETS = {
+    "development": {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30, "pool_recycle": 3600},
+    "test": {"pool_size": 5, "max_overflow": 5, "pool_timeout": 5, "pool_recycle": -1},
+    "production": {"pool_size": 10, "max_overflow": 20, "pool_timeout": 10, "pool_recycle": 1800},
+}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def build_database_url() -> str:
+    """DATABASE_URL 이 없으면 DB_* 환경 변수로 MySQL URL 구성"""
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+
+    user = os.getenv("DB_USER", "")
+    password = urllib.parse.quote_plus(os.getenv("DB_PASSWORD") or "")
+    host = os.getenv("DB_HOST", "localhost")
+    port = os.getenv("DB_PORT", "3306")
+    name = os.getenv("DB_NAME", "")
+    return f"mysql+pymysql://{user}:{password}@{host}:{port}/{name}"
+
+
+class DatabaseSettings:
+    """엔진 생성에 필요한 설정 - 환경 변수에서 읽음"""
+
+    def __init__(self, url: str, env: str = APP_ENV, prefix: str = "DB_"):
+        preset = POOL_PRESETS.get(env, POOL_PRESETS["development"])
+
+        self.url = url
+        self.echo = _env_bool(f"{prefix}ECHO", False)
+        self.pool_size = int(os.getenv(f"{prefix}POOL_SIZE", preset["pool_size"]))
+        self.max_overflow = int(os.getenv(f"{prefix}MAX_OVERFLOW", preset["max_overflow"]))
+        self.pool_timeout = float(os.getenv(f"{prefix}POOL_TIMEOUT", preset["pool_timeout"]))
+        self.pool_recycle = int(os.getenv(f"{prefix}POOL_RECYCLE", preset["pool_recycle"]))
+        self.pool_pre_ping = _env_bool(f"{prefix}POOL_PRE_PING", True)
+        self.connect_timeout = int(os.getenv(f"{prefix}CONNECT_TIMEOUT", "10"))
+        # 트랜잭션 격리 수준 (MySQL 기본값 REPEATABLE READ 대신 갭 락이 적은 READ COMMITTED 사용)
+        self.isolation_level: Optional[str] = os.getenv(
+            f"{prefix}ISOLATION_LEVEL", None if self.is_sqlite else "READ COMMITTED"
+        )
+        # SQLAlchemy 컴파일된 SQL 캐시 크기 (0 이면 캐시 비활성화)
+        self.query_cache_size = int(os.getenv(f"{prefix}QUERY_CACHE_SIZE", "1000"))
+
+        # SQLite 전용 설정
+        self.sqlite_journal_mode = os.getenv(f"{prefix}SQLITE_JOURNAL_MODE", "WAL")
+        self.sqlite_synchronous = os.getenv(f"{prefix}SQLITE_SYNCHRONOUS", "NORMAL")
+        self.sqlite_busy_timeout_ms = int(os.getenv(f"{prefix}SQLITE_BUSY_TIMEOUT_MS", "5000"))
+        self.sqlite_cache_size_kb = int(os.getenv(f"{prefix}SQLITE_CACHE_SIZE_KB", "16000"))
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.url.startswith("sqlite")
+
+    @property
+    def is_sqlite_memory(self) -> bool:
+        return self.is_sqlite and (":memory:" in self.url or self.url.rstrip("/") in ("sqlite:", "sqlite+pysqlite:"))
+
+
+def _install_sqlite_pragmas(engine: Engine, settings: DatabaseSettings):
+    """커넥션이 만들어질 때마다 SQLite PRAGMA 적용"""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not settings.is_sqlite_memory:
+            cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kb}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+def create_db_engine(settings: DatabaseSettings) -> Engine:
+    """
+    설정에 맞는 엔진을 생성하는 함수
+
+    MySQL(PyMySQL)은 서버 측 prepared statement 를 지원하지 않으므로
+    SQLAlchemy 의 컴파일 캐시(query_cache_size)로 SQL 컴파일 비용을 줄인다.
+    """
+    options: Dict[str, Any] = {
+        "echo": settings.echo,
+        "query_cache_size": settings.query_cache_size,
     }
-)
+    if settings.isolation_level:
+        options["isolation_level"] = settings.isolation_level
+
+    if settings.is_sqlite:
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.sqlite_busy_timeout_ms / 1000,
+        }
+        if settings.is_sqlite_memory:
+            # 메모리 DB 는 커넥션마다 별도 DB 가 되므로 하나의 커넥션을 공유
+            options["poolclass"] = StaticPool
+        else:
+            options.update(
+                pool_size=settings.pool_size,
+                max_overflow=settings.max_overflow,
+                pool_timeout=settings.pool_timeout,
+                pool_pre_ping=False,
+            )
+        engine = create_engine(settings.url, **options)
+        _install_sqlite_pragmas(engine, settings)
+        return engine
+
+    options.update(
+        pool_size=settings.pool_size,  # 기본 연결 풀 크기
+        max_overflow=settings.max_overflow,  # 추가로 생성할 수 있는 최대 연결 수
+        pool_timeout=settings.pool_timeout,  # 풀이 가득 찼을 때 대기할 최대 시간 (초)
+        pool_recycle=settings.pool_recycle,  # 연결 재생성 주기 (초)
+        pool_pre_ping=settings.pool_pre_ping,  # 쿼리 실행 전 연결 상태 확인
+        connect_args={
+            "connect_timeout": settings.connect_timeout,  # 연결 시도 타임아웃 (초)
+        },
+    )
+    return create_engine(settings.url, **options)
+
+
+def pool_stats(target: Optional[Engine] = None) -> Dict[str, Any]:
+    """커넥션 풀 상태 조회"""
+    pool = (target or engine).pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    for attribute in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, attribute):
+            stats[attribute] = getattr(pool, attribute)()
+    stats["status"] = pool.status()
+    return stats
+
+
+DATABASE_URL = build_database_url()
+settings = DatabaseSettings(DATABASE_URL)
+
+engine = create_db_engine(settings)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# 읽기 전용 복제본 (쉼표로 구분, 없으면 모든 읽기도 primary 로)
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+# 사용자가 쓰기를 한 뒤 이 시간 동안은 해당 사용자의 읽기를 primary 로 보냄 (복제 지연 대응)
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+reader_engines: List[Engine] = [
+    create_db_engine(DatabaseSettings(url, prefix="DB_REPLICA_")) for url in DB_REPLICA_URLS
+]
+ReadSessionLocals = [
+    sessionmaker(autocommit=False, autoflush=False, bind=reader_engine) for reader_engine in reader_engines
+]
+_reader_cycle = itertools.cycle(ReadSessionLocals) if ReadSessionLocals else None
+_reader_lock = threading.Lock()
+
+# 사용자별 마지막 쓰기 시각 (프로세스 단위 - 같은 워커로 온 요청용)
+_recent_writes: Dict[int, float] = {}
+_recent_writes_lock = threading.Lock()
+
+# 워커가 여러 개일 때를 위해 쓰기 시각을 서명해서 응답으로 돌려주고, 다음 요청에서 헤더/쿠키로 받음
+READ_YOUR_WRITES_HEADER = "X-Last-Write"
+READ_YOUR_WRITES_COOKIE = "last_write"
+_WRITE_MARKER_SECRET = (os.getenv("JWT_SECRET_KEY") or "").encode("utf-8")
+if not _WRITE_MARKER_SECRET:
+    # 빈 키로 서명하면 쓰기 표시를 위조할 수 있으므로 프로세스별 임의 키 사용 (워커 간 표시는 공유되지 않음)
+    print("JWT_SECRET_KEY 가 설정되지 않아 쓰기 표시에 프로세스별 임의 키를 사용합니다.")
+    _WRITE_MARKER_SECRET = secrets.token_bytes(32)
+# 워커 간 시계 차이 허용 범위 (초)
+_WRITE_MARKER_CLOCK_SKEW = 1.0
+
+# 요청 중 커밋된 쓰기 목록 [(user_id, 시각)] - ReadYourWritesMiddleware 가 요청마다 설정
+_request_writes: contextvars.ContextVar = contextvars.ContextVar("request_writes", default=None)
+
+
+def mark_user_write(user_id: Optional[int]):
+    """사용자의 쓰기 커밋 시각 기록 - 일정 시간 동안 읽기를 primary 로 고정"""
+    if user_id is None or not ReadSessionLocals:
+        return
+    request_writes = _request_writes.get()
+    if request_writes is not None:
+        request_writes.append((user_id, time.time()))
+
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes[user_id] = now
+        if len(_recent_writes) > 10000:
+            expired = [uid for uid, at in _recent_writes.items() if now - at > DB_READ_YOUR_WRITES_SECONDS]
+            for uid in expired:
+                del _recent_writes[uid]
+
+
+def _sign_write_marker(payload: str) -> str:
+    return hmac.new(_WRITE_MARKER_SECRET, payload.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def create_write_marker(user_id: int, written_at: float) -> str:
+    """'사용자ID.쓰기시각(ms).서명' 형식의 쓰기 표시"""
+    payload = f"{user_id}.{int(written_at * 1000)}"
+    return f"{payload}.{_sign_write_marker(payload)}"
+
+
+def write_marker_is_fresh(marker: Optional[str], user_id: Optional[int]) -> bool:
+    """해당 사용자의 서명된 쓰기 표시이고 아직 복제 지연 대기 시간 안인지 확인"""
+    if not marker or user_id is None:
+        return False
+    try:
+        marker_user_id, written_ms, signature = marker.split(".")
+        written_at = int(written_ms) / 1000
+    except ValueError:
+        return False
+    if marker_user_id != str(user_id):
+        return False
+    if not hmac.compare_digest(signature, _sign_write_marker(f"{marker_user_id}.{written_ms}")):
+        return False
+    return -_WRITE_MARKER_CLOCK_SKEW <= time.time() - written_at < DB_READ_YOUR_WRITES_SECONDS
+
+
+def recently_wrote(user_id: Optional[int], write_marker: Optional[str] = None) -> bool:
+    if user_id is None:
+        return False
+    if write_marker_is_fresh(write_marker, user_id):
+        return True
+    written_at = _recent_writes.get(user_id)
+    return written_at is not None and time.monotonic() - written_at < DB_READ_YOUR_WRITES_SECONDS
+
+
+def get_read_session(user_id: Optional[int] = None, write_marker: Optional[str] = None) -> Session:
+    """
+    읽기 전용 세션 반환. 복제본이 없거나 사용자가 방금 쓰기를 했다면 primary 세션을 반환한다.
+
+    Args:
+        user_id: 요청한 사용자 ID (read-your-writes 판단용)
+        write_marker: 요청에 담겨 온 쓰기 표시 (X-Last-Write 헤더 또는 last_write 쿠키)
+    """
+    if _reader_cycle is None or recently_wrote(user_id, write_marker):
+        return SessionLocal()
+    with _reader_lock:
+        session_factory = next(_reader_cycle)
+    return session_factory()
+
+
+def is_replica_session(db: Session) -> bool:
+    return db.get_bind() is not engine
+
+
+class ReadYourWritesMiddleware:
+    """
+    요청 중 쓰기가 커밋되면 서명된 쓰기 시각을 응답 헤더(X-Last-Write)와 쿠키로 돌려주는 ASGI 미들웨어
+
+    다음 요청이 다른 워커로 가더라도 헤더/쿠키의 쓰기 표시로 primary 에서 읽는다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ReadSessionLocals:
+            await self.app(scope, receive, send)
+            return
+
+        request_writes = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and request_writes:
+                user_id, written_at = request_writes[-1]
+                marker = create_write_marker(user_id, written_at)
+                cookie = (f"{READ_YOUR_WRITES_COOKIE}={marker}; Max-Age={math.ceil(DB_READ_YOUR_WRITES_SECONDS)}; "
+                          f"Path=/; HttpOnly; SameSite=Lax")
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (READ_YOUR_WRITES_HEADER.lower().encode("latin-1"), marker.encode("latin-1")),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]}
+            await send(message)
+
+        token = _request_writes.set(request_writes)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_writes.reset(token)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_session_write(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flag_statement_write(orm_execute_state):
+    # delete()/update()/insert() 문을 바로 실행하면 flush 가 일어나지 않으므로 여기서 표시
+    if orm_execute_state.is_delete or orm_execute_state.is_update or orm_execute_state.is_insert:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_session_write(session):
+    if session.info.pop("has_writes", False):
+        mark_user_write(session.info.get("user_id"))
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+@event.listens_for(SessionLocal, "after_rollback")
+def _clear_session_write(session):
+    session.info.pop("has_writes", None)
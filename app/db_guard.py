@@ -0,0 +1,89 @@
+import contextvars
+import os
+import weakref
+
+from sqlalchemy import event
+
+from database import SessionLocal, ReadSessionLocals
+from metrics import registry, Counter
+
+# 외부 API 를 기다리는 동안 DB 세션(트랜잭션/커넥션)을 잡고 있는지 검사
+# off: 검사 안 함 / warn: 로그와 메트릭만 남김 / strict: 예외 발생 (개발/테스트용)
+DB_AWAIT_GUARD = os.getenv("DB_AWAIT_GUARD", "warn").lower()
+
+sessions_held_across_await = registry.register(Counter(
+    "db_sessions_held_across_await_total", "외부 호출 대기 중 커넥션을 잡고 있던 세션 수", ("operation",)))
+
+# 요청(및 그 요청의 백그라운드 태스크) 단위로 세션 소유자를 구분하기 위한 값
+_await_scope: contextvars.ContextVar = contextvars.ContextVar("db_await_scope", default=None)
+_open_sessions = weakref.WeakSet()
+
+
+class SessionHeldAcrossAwait(RuntimeError):
+    """DB 커넥션을 잡은 채 외부 호출을 기다리려 할 때 발생하는 예외"""
+    pass
+
+
+def _track_session(session, transaction, connection):
+    session.info["await_scope"] = _await_scope.get()
+    _open_sessions.add(session)
+
+
+def _untrack_session(session, transaction):
+    if transaction.parent is None:
+        _open_sessions.discard(session)
+
+
+for _session_factory in [SessionLocal, *ReadSessionLocals]:
+    event.listen(_session_factory, "after_begin", _track_session)
+    event.listen(_session_factory, "after_transaction_end", _untrack_session)
+
+
+class DBAwaitGuardMiddleware:
+    """요청마다 새 scope 를 만들어 그 요청에서 열린 세션만 검사 대상이 되도록 함"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or DB_AWAIT_GUARD == "off":
+            await self.app(scope, receive, send)
+            return
+
+        token = _await_scope.set(object())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _await_scope.reset(token)
+
+
+def held_sessions():
+    """현재 요청 scope 에서 트랜잭션(커넥션)을 잡고 있는 세션 목록"""
+    current = _await_scope.get()
+    if current is None:
+        return []
+    return [
+        session for session in list(_open_sessions)
+        if session.info.get("await_scope") is current and session.in_transaction()
+    ]
+
+
+def check_no_session_held(operation: str):
+    """
+    외부 호출을 await 하기 직전에 호출하여 커넥션을 잡고 있는 세션이 없는지 확인
+
+    Args:
+        operation: 로그/메트릭에 남길 외부 호출 이름
+    """
+    if DB_AWAIT_GUARD == "off":
+        return
+
+    held = held_sessions()
+    if not held:
+        return
+
+    sessions_held_across_await.inc(len(held), operation=operation)
+    message = f"{operation}: DB 세션 {len(held)}개가 커넥션을 잡은 채 외부 호출을 기다립니다"
+    if DB_AWAIT_GUARD == "strict":
+        raise SessionHeldAcrossAwait(message)
+    print(f"경고: {message}")
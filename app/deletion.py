@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, or_
+from sqlalchemy.orm import Session
+
+from analytics import delete_user_rollups, remove_diaries
+from keywords import invalidate_user_corpus
+from models import DeletionJob, DeletionJobStatus, Diary, DiaryStatus, User, diary_tag
+
+# 한 번의 DELETE 문(= 한 트랜잭션)에서 지울 최대 일기 수 - 락 유지 시간과 undo 로그 크기를 제한
+DELETE_BATCH_SIZE = int(os.getenv("DELETE_BATCH_SIZE", "500"))
+# RUNNING 상태에서 이 시간 동안 진행이 없으면 중단된 작업으로 보고 다른 프로세스가 이어서 실행
+DELETE_JOB_STALE_SECONDS = int(os.getenv("DELETE_JOB_STALE_SECONDS", "300"))
+
+
+def delete_diary_batch(db: Session, user_id: int, diary_ids: List[int], update_rollups: bool = True) -> int:
+    """
+    일기 ID 목록을 set-based DELETE 로 삭제하는 함수 (커밋은 호출한 쪽에서)
+
+    외래 키의 ON DELETE CASCADE 로도 지워지지만, 자식 테이블부터 명시적으로 지워
+    락 획득 순서를 일정하게 유지한다.
+
+    Args:
+        db: DB 세션
+        user_id: 일기 소유자 ID
+        diary_ids: 삭제할 일기 ID 목록 (DELETE_BATCH_SIZE 이하 권장)
+        update_rollups: 통계 롤업에서 기여분을 뺄지 여부 (회원 탈퇴 시에는 롤업을 통째로 삭제하므로 False)
+
+    Returns:
+        int: 삭제된 일기 수
+    """
+    if not diary_ids:
+        return 0
+
+    owned_ids = [diary_id for (diary_id,) in db.query(Diary.id).filter(
+        Diary.id.in_(diary_ids),
+        Diary.user_id == user_id
+    )]
+    if not owned_ids:
+        return 0
+
+    if update_rollups:
+        remove_diaries(db, user_id, owned_ids)
+
+    options = {"synchronize_session": False}
+    db.execute(delete(diary_tag).where(diary_tag.c.diary_id.in_(owned_ids)))
+    db.execute(delete(DiaryStatus).where(DiaryStatus.diary_id.in_(owned_ids)).execution_options(**options))
+    result = db.execute(delete(Diary).where(Diary.id.in_(owned_ids)).execution_options(**options))
+    return result.rowcount
+
+
+def matching_diary_ids(db: Session, user_id: int, diary_ids: Optional[List[int]] = None,
+                       start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                       after_id: int = 0, limit: Optional[int] = None) -> List[int]:
+    """
+    삭제 조건에 맞는 일기 ID 를 ID 순으로 조회 (after_id 이후부터, keyset 페이지네이션)
+
+    Args:
+        start_date: 이 시각 이후 (포함)
+        end_date: 이 시각 이전 (미포함)
+    """
+    query = db.query(Diary.id).filter(Diary.user_id == user_id, Diary.id > after_id)
+    if diary_ids is not None:
+        query = query.filter(Diary.id.in_(diary_ids))
+    if start_date is not None:
+        query = query.filter(Diary.date >= start_date)
+    if end_date is not None:
+        query = query.filter(Diary.date < end_date)
+    query = query.order_by(Diary.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return [diary_id for (diary_id,) in query]
+
+
+def create_deletion_job(db: Session, user_id: int, kind: str, diary_ids: Optional[List[int]] = None,
+                        start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None) -> DeletionJob:
+    """삭제 작업을 등록하는 함수 (커밋은 호출한 쪽에서)"""
+    job = DeletionJob(
+        user_id=user_id,
+        kind=kind,
+        diary_ids=json.dumps(diary_ids) if diary_ids is not None else None,
+        start_date=start_date,
+        end_date=end_date,
+        status=DeletionJobStatus.PENDING,
+        cursor=0,
+        deleted_count=0,
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def _claim_job(db: Session, job_id: int) -> bool:
+    """
+    PENDING 이거나 오래 멈춘 RUNNING 작업만 가져옴 - 여러 워커가 같은 작업을 동시에 실행하지 않도록
+
+    상태 확인과 RUNNING 변경을 조건부 UPDATE 한 문장으로 처리하므로, 여러 워커가 동시에 시작해
+    같은 작업을 가져가려 해도 영향받은 행이 1 인 한 곳만 실행한다.
+    """
+    now = datetime.utcnow()
+    claimed = db.query(DeletionJob).filter(
+        DeletionJob.id == job_id,
+        or_(
+            DeletionJob.status == DeletionJobStatus.PENDING,
+            and_(DeletionJob.status == DeletionJobStatus.RUNNING,
+                 DeletionJob.updated_at < now - timedelta(seconds=DELETE_JOB_STALE_SECONDS))
+        )
+    ).update({DeletionJob.status: DeletionJobStatus.RUNNING, DeletionJob.updated_at: now},
+             synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+def run_deletion_job(job_id: int):
+    """
+    삭제 작업을 배치 단위로 실행하는 함수 (백그라운드 태스크/CLI 에서 호출)
+
+    배치마다 커밋하며 마지막으로 삭제한 일기 ID(cursor)를 저장하므로,
+    프로세스가 중단되어도 resume_deletion_jobs 로 이어서 실행할 수 있다.
+    """
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if not _claim_job(db, job_id):
+            return
+
+        job = db.query(DeletionJob).filter(DeletionJob.id == job_id).first()
+        db.info["user_id"] = job.user_id
+        is_account = job.kind == "account"
+        diary_ids = json.loads(job.diary_ids) if job.diary_ids else None
+
+        while True:
+            batch = matching_diary_ids(db, job.user_id, diary_ids, job.start_date, job.end_date,
+                                       after_id=job.cursor, limit=DELETE_BATCH_SIZE)
+            if not batch:
+                break
+            job.deleted_count += delete_diary_batch(db, job.user_id, batch, update_rollups=not is_account)
+            job.cursor = batch[-1]
+            job.updated_at = datetime.utcnow()
+            db.commit()
+
+        if is_account:
+            delete_user_rollups(db, job.user_id)
+            db.query(User).filter(User.id == job.user_id).delete(synchronize_session=False)
+
+        job.status = DeletionJobStatus.COMPLETED
+        db.commit()
+        invalidate_user_corpus(job.user_id)
+        print(f"삭제 작업 {job_id} 완료: 일기 {job.deleted_count}개 삭제")
+
+    except Exception as e:
+        db.rollback()
+        print(f"삭제 작업 {job_id} 실패: {str(e)}")
+        db.query(DeletionJob).filter(DeletionJob.id == job_id).update(
+            {DeletionJob.status: DeletionJobStatus.FAILED, DeletionJob.error: str(e)},
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def resume_deletion_jobs(retry_failed: bool = False) -> int:
+    """
+    대기 중이거나 중단된 삭제 작업을 이어서 실행하는 함수
+
+    Returns:
+        int: 실행을 시도한 작업 수
+    """
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if retry_failed:
+            db.query(DeletionJob).filter(DeletionJob.status == DeletionJobStatus.FAILED).update(
+                {DeletionJob.status: DeletionJobStatus.PENDING, DeletionJob.error: None},
+                synchronize_session=False
+            )
+            db.commit()
+        job_ids = [job_id for (job_id,) in db.query(DeletionJob.id).filter(
+            DeletionJob.status.in_([DeletionJobStatus.PENDING, DeletionJobStatus.RUNNING])
+        ).order_by(DeletionJob.id)]
+    finally:
+        db.close()
+
+    for job_id in job_ids:
+        run_deletion_job(job_id)
+    return len(job_ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일괄 삭제/회원 탈퇴 작업 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    resume_parser = subparsers.add_parser("resume", help="대기 중이거나 중단된 작업 이어서 실행")
+    resume_parser.add_argument("--retry-failed", action="store_true", help="실패한 작업도 다시 실행")
+    args = parser.parse_args()
+
+    count = resume_deletion_jobs(args.retry_failed)
+    print(f"총 {count}개의 삭제 작업을 실행했습니다.")
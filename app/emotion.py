@@ -0,0 +1,184 @@
+import json
+import os
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 감정 사전 설정 (JSON 파일 경로, {"단어": 가중치} 형식)
+EMOTION_LEXICON_PATH = os.getenv("EMOTION_LEXICON_PATH")
+EMOTION_THRESHOLD = float(os.getenv("EMOTION_THRESHOLD", "1.0"))
+# LLM 태그가 본문 점수를 보정할 때의 가중치
+EMOTION_TAG_WEIGHT = float(os.getenv("EMOTION_TAG_WEIGHT", "1.5"))
+
+POSITIVE = "긍정적"
+NEGATIVE = "부정적"
+NEUTRAL = "중립적"
+
+# 기본 감정 사전 - 활용형이 모두 잡히도록 어간 위주로 등록
+DEFAULT_LEXICON: Dict[str, float] = {
+    "행복": 2.0, "기쁘": 2.0, "기뻤": 2.0, "기쁨": 2.0, "즐거": 1.5, "즐겁": 1.5,
+    "감사": 1.5, "고마": 1.5, "만족": 1.0, "좋았": 1.0, "좋다": 1.0, "좋은": 0.5,
+    "설레": 1.5, "설렜": 1.5, "뿌듯": 1.5, "편안": 1.0, "신나": 1.5, "신났": 1.5,
+    "웃었": 1.0, "사랑": 1.5, "상쾌": 1.0, "힐링": 1.0, "재밌": 1.0, "재미있": 1.0,
+    "슬프": -2.0, "슬펐": -2.0, "슬픔": -2.0, "우울": -2.0, "불안": -1.5, "화가": -1.5,
+    "화났": -1.5, "분노": -2.0, "좌절": -2.0, "짜증": -1.5, "외로": -1.5, "외롭": -1.5,
+    "힘들": -1.5, "힘든": -1.5, "지쳤": -1.0, "지친": -1.0, "피곤": -1.0, "걱정": -1.0,
+    "스트레스": -1.5, "눈물": -1.0, "울었": -1.5, "아팠": -1.0, "아프": -1.0,
+    "후회": -1.5, "싫": -1.0, "답답": -1.0, "서운": -1.0, "무기력": -1.5,
+}
+
+# 감정 단어 바로 앞에 띄어 쓴 부정 부사 ("안 좋았다", "못 잤다")
+# 독립된 단어일 때만 부정으로 봄 - "동안", "불안", "편안" 처럼 안으로 끝나는 단어는 제외
+_NEGATION_WORDS = ("안", "못")
+# 감정 단어 뒤에 붙는 부정 표현 ("행복하지 않았다", "걱정 없이", "재미가 없다")
+# 같은 어절의 "~지" 뒤 않/못/말, 또는 조사 하나까지만 붙은 바로 다음 어절의 "없" 만 부정으로 봄
+# - "우울했다 없는 돈" 처럼 다른 어절을 건너뛴 "없" 은 제외
+_NEGATION_SUFFIX = re.compile(r"^(\S*지\s*(않|못|말)|[가이은는도]?\s?없)")
+_NEGATION_FACTOR = -0.5
+
+
+class AhoCorasick:
+    """여러 패턴을 한 번의 순회로 찾는 Aho-Corasick 오토마톤"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        outputs: List[List[int]] = [[]]
+        for pattern in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(len(self.patterns))
+            self.patterns.append(pattern)
+
+        # BFS 로 실패 링크 구성
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                outputs[next_state].extend(outputs[self._fail[next_state]])
+
+        self._output = [tuple(out) for out in outputs]
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, int]]:
+        """(패턴 인덱스, 매칭 끝 위치) 를 순서대로 반환"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for index in output[state]:
+                    yield index, position + 1
+
+
+class EmotionAnalyzer:
+    """가중치 감정 사전을 이용한 로컬 감정 분석기"""
+
+    def __init__(self, lexicon: Dict[str, float], threshold: float = EMOTION_THRESHOLD):
+        self.lexicon = dict(lexicon)
+        self.threshold = threshold
+        self._automaton = AhoCorasick(self.lexicon)
+        self._weights = [self.lexicon[pattern] for pattern in self._automaton.patterns]
+        self._lengths = [len(pattern) for pattern in self._automaton.patterns]
+
+    @staticmethod
+    def _is_negated(text: str, start: int, end: int) -> bool:
+        word_end = start
+        while word_end > 0 and text[word_end - 1].isspace():
+            word_end -= 1
+        if word_end < start and word_end > 0 and text[word_end - 1] in _NEGATION_WORDS:
+            # 부정 부사 앞이 텍스트 시작이거나 공백/문장부호여야 함
+            if word_end == 1 or not text[word_end - 2].isalnum():
+                return True
+        return bool(_NEGATION_SUFFIX.match(text[end:end + 8]))
+
+    def score(self, text: str) -> float:
+        """텍스트의 감정 점수 (양수: 긍정, 음수: 부정)"""
+        if not text:
+            return 0.0
+
+        # 겹치는 매칭은 왼쪽부터, 같은 시작 위치에서는 가장 긴 패턴만 집계
+        matches = sorted(
+            (end - self._lengths[index], -self._lengths[index], index)
+            for index, end in self._automaton.iter_matches(text)
+        )
+        total = 0.0
+        last_end = -1
+        for start, negative_length, index in matches:
+            if start < last_end:
+                continue
+            end = start - negative_length
+            last_end = end
+
+            weight = self._weights[index]
+            if self._is_negated(text, start, end):
+                weight *= _NEGATION_FACTOR
+            total += weight
+        return total
+
+    def label(self, score: float) -> str:
+        if score >= self.threshold:
+            return POSITIVE
+        if score <= -self.threshold:
+            return NEGATIVE
+        return NEUTRAL
+
+    def analyze(self, content: str, tag_names: Optional[Iterable[str]] = None) -> str:
+        """
+        일기 내용(과 선택적으로 LLM 태그)으로 감정을 판정하는 함수
+
+        Args:
+            content: 일기 내용
+            tag_names: LLM 이 추출한 태그 이름 목록 (있으면 점수를 보정)
+
+        Returns:
+            str: "긍정적" / "부정적" / "중립적"
+        """
+        score = self.score(content)
+        if tag_names:
+            score += EMOTION_TAG_WEIGHT * sum(self.score(name) for name in tag_names)
+        return self.label(score)
+
+
+def load_lexicon(path: Optional[str] = EMOTION_LEXICON_PATH) -> Dict[str, float]:
+    """기본 사전에 설정 파일의 단어를 덮어써서 감정 사전 구성"""
+    lexicon = dict(DEFAULT_LEXICON)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            lexicon.update({word: float(weight) for word, weight in json.load(f).items()})
+    return lexicon
+
+
+@lru_cache(maxsize=1)
+def get_emotion_analyzer() -> EmotionAnalyzer:
+    """프로세스당 한 번만 오토마톤을 컴파일"""
+    return EmotionAnalyzer(load_lexicon())
+
+
+def analyze_emotion(content: str, tag_names: Optional[Iterable[str]] = None) -> str:
+    return get_emotion_analyzer().analyze(content, tag_names)
@@ -0,0 +1,212 @@
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from models import Diary, Tag
+
+load_dotenv()
+
+# 로컬 키워드 추출 설정
+KEYWORD_FAST_PATH = os.getenv("KEYWORD_FAST_PATH", "true").lower() == "true"  # 작성 시점에 임시 태그 부여
+KEYWORD_TAG_LIMIT = int(os.getenv("KEYWORD_TAG_LIMIT", "5"))
+KEYWORD_CORPUS_SIZE = int(os.getenv("KEYWORD_CORPUS_SIZE", "200"))  # IDF 계산에 쓰는 사용자 최근 일기 수
+KEYWORD_VOCAB_TTL = float(os.getenv("KEYWORD_VOCAB_TTL", "300"))
+KEYWORD_CACHE_USERS = int(os.getenv("KEYWORD_CACHE_USERS", "1000"))
+# 사용자별 문서 빈도 캐시 유지 시간 - 다른 워커의 수정/삭제가 이 시간 안에 반영됨
+KEYWORD_CORPUS_TTL = float(os.getenv("KEYWORD_CORPUS_TTL", "600"))
+
+# LLM 태그가 도착했을 때 임시 태그 처리 방식: replace(교체) / merge(병합)
+TAG_MERGE_POLICY = os.getenv("TAG_MERGE_POLICY", "replace").lower()
+if TAG_MERGE_POLICY not in ("replace", "merge"):
+    raise ValueError(f"TAG_MERGE_POLICY 는 replace 또는 merge 여야 합니다: {TAG_MERGE_POLICY}")
+
+_TOKEN_PATTERN = re.compile(r"[가-힣A-Za-z0-9]+")
+# 명사 뒤에 붙는 조사 (긴 것부터 제거)
+_PARTICLES = sorted([
+    "에서는", "에게서", "으로는", "이랑", "에서", "에게", "으로", "까지", "부터", "처럼", "보다",
+    "하고", "와의", "과의", "이나", "한테", "은", "는", "이", "가", "을", "를", "에", "의",
+    "도", "와", "과", "로", "만", "랑", "들",
+], key=len, reverse=True)
+_PARTICLE_SET = set(_PARTICLES)
+# 태그 이름 뒤에 붙어도 같은 대상을 가리키는 접미사 ("친구들", "선생님")
+_NOUN_SUFFIXES = ("들", "님", "씨")
+# 용언 활용형으로 보이는 어미 - 이 어미로 끝나는 토큰은 키워드 후보에서 제외
+_VERB_ENDINGS = ("다", "고", "서", "며", "면", "게", "지", "요", "니", "었", "았", "했", "해", "하", "던", "된", "한", "할", "운")
+_STOPWORDS = {
+    "오늘", "어제", "내일", "정말", "너무", "조금", "그냥", "하루", "다시", "같이", "요즘", "아침",
+    "저녁", "이번", "다음", "생각", "시간", "우리", "나는", "그리고", "그런데", "하지만", "때문",
+    "동안", "한동안", "며칠", "지금", "이제", "항상", "매일", "가끔", "계속", "처음", "마지막",
+    "정도", "오랜만", "요새", "주말", "하나", "모두", "전부", "자신", "무엇", "그것", "이것",
+}
+
+
+def tokenize(content: str) -> List[str]:
+    """일기 내용을 키워드 후보 토큰 목록으로 변환"""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(content or ""):
+        for particle in _PARTICLES:
+            if token.endswith(particle) and len(token) - len(particle) >= 2:
+                token = token[:-len(particle)]
+                break
+        if not 2 <= len(token) <= 50 or token in _STOPWORDS or token.endswith(_VERB_ENDINGS):
+            continue
+        tokens.append(token)
+    return tokens
+
+
+class _UserCorpusCache:
+    """
+    사용자별 문서 빈도(DF) 캐시 - 최근 일기 기준, LRU 로 크기 제한
+
+    새 일기는 커밋 후 observe 로 더하고, 수정/삭제는 invalidate 로 다시 계산하게 한다.
+    다른 워커에서 일어난 변경은 TTL 이 지나면 반영된다.
+    """
+
+    def __init__(self, max_users: int, ttl: float):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._stats: "OrderedDict[int, Tuple[int, Counter]]" = OrderedDict()
+        self._loaded_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id: int) -> Tuple[int, Counter]:
+        with self._lock:
+            if user_id in self._stats and time.monotonic() - self._loaded_at[user_id] < self.ttl:
+                self._stats.move_to_end(user_id)
+                return self._stats[user_id]
+
+        rows = db.query(Diary.content).filter(
+            Diary.user_id == user_id
+        ).order_by(Diary.id.desc()).limit(KEYWORD_CORPUS_SIZE).all()
+        document_frequency = Counter()
+        for (content,) in rows:
+            document_frequency.update(set(tokenize(content)))
+        stats = (len(rows), document_frequency)
+
+        with self._lock:
+            self._stats[user_id] = stats
+            self._stats.move_to_end(user_id)
+            self._loaded_at[user_id] = time.monotonic()
+            while len(self._stats) > self.max_users:
+                evicted, _ = self._stats.popitem(last=False)
+                del self._loaded_at[evicted]
+        return stats
+
+    def observe(self, user_id: int, tokens: List[str]):
+        """새 일기가 커밋되면 캐시된 통계에 반영"""
+        with self._lock:
+            if user_id in self._stats:
+                document_count, document_frequency = self._stats[user_id]
+                document_frequency.update(set(tokens))
+                self._stats[user_id] = (document_count + 1, document_frequency)
+
+    def invalidate(self, user_id: int):
+        """일기가 수정/삭제되면 다음 조회 때 다시 계산"""
+        with self._lock:
+            self._stats.pop(user_id, None)
+            self._loaded_at.pop(user_id, None)
+
+
+class _TagVocabulary:
+    """카테고리가 있는 전역 태그의 이름 -> 카테고리 사전 (TTL 동안 메모리에 유지)"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._categories: Dict[str, str] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> Dict[str, str]:
+        if time.monotonic() - self._loaded_at < self.ttl:
+            return self._categories
+        with self._lock:
+            if time.monotonic() - self._loaded_at >= self.ttl:
+                self._categories = {
+                    name: category
+                    for name, category in db.query(Tag.name, Tag.category).filter(Tag.category.isnot(None))
+                }
+                self._loaded_at = time.monotonic()
+        return self._categories
+
+
+_corpus_cache = _UserCorpusCache(KEYWORD_CACHE_USERS, KEYWORD_CORPUS_TTL)
+_vocabulary = _TagVocabulary(KEYWORD_VOCAB_TTL)
+
+
+def _is_noun_suffix(rest: str) -> bool:
+    """태그 이름 뒤에 남은 부분이 접미사/조사뿐인지 ("들", "님과" 는 허용, "니", "화" 는 불가)"""
+    for suffix in _NOUN_SUFFIXES:
+        if rest.startswith(suffix):
+            rest = rest[len(suffix):]
+            break
+    return not rest or rest in _PARTICLE_SET
+
+
+def _match_vocabulary(token: str, vocabulary: Dict[str, str]) -> Optional[str]:
+    """
+    토큰과 가장 길게 일치하는 기존 태그 이름 반환 ("친구들" -> "친구")
+
+    나머지가 접미사/조사가 아니면 다른 단어로 보고 매칭하지 않는다 ("사랑니" 는 "사랑" 이 아님).
+    """
+    for length in range(len(token), 1, -1):
+        if token[:length] in vocabulary and _is_noun_suffix(token[length:]):
+            return token[:length]
+    return None
+
+
+def extract_keywords(db: Session, user_id: int, content: str,
+                     limit: int = KEYWORD_TAG_LIMIT) -> List[Dict[str, str]]:
+    """
+    사용자 본인의 일기 코퍼스 대비 TF-IDF 로 키워드를 골라 기존 태그로 변환하는 함수
+
+    새 태그는 만들지 않고, 카테고리가 있는 기존 태그와 일치하는 키워드만 반환한다.
+    (임시 태그와 LLM 장애 시 대체 태그가 전역 태그 테이블을 늘리지 않도록)
+
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        content: 일기 내용
+        limit: 반환할 최대 태그 수
+
+    Returns:
+        List[Dict[str, str]]: extract_tags_from_diary 와 같은 형식의 태그 목록
+    """
+    tokens = tokenize(content)
+    if not tokens:
+        return []
+
+    vocabulary = _vocabulary.get(db)
+    matches = {token: _match_vocabulary(token, vocabulary) for token in set(tokens)}
+    if not any(matches.values()):
+        return []
+
+    document_count, document_frequency = _corpus_cache.get(db, user_id)
+
+    scores: Dict[str, float] = {}
+    term_frequency = Counter(tokens)
+    for token, count in term_frequency.items():
+        name = matches[token]
+        if name is None:
+            continue
+        idf = math.log((document_count + 1) / (document_frequency.get(token, 0) + 1)) + 1
+        scores[name] = scores.get(name, 0.0) + (count / len(tokens)) * idf
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [{"name": name, "category": vocabulary[name]} for name, _ in ranked]
+
+
+def observe_diary(user_id: int, content: str):
+    """새 일기가 커밋된 뒤 호출 - 롤백된 일기가 IDF 에 반영되지 않도록"""
+    _corpus_cache.observe(user_id, tokenize(content))
+
+
+def invalidate_user_corpus(user_id: int):
+    """일기 수정/삭제가 커밋된 뒤 호출 - 문서 빈도를 다시 계산"""
+    _corpus_cache.invalidate(user_id)
@@ -1,19 +1,68 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
-from database import engine
-from models import Base
-from routers import user_router, diary_router
+from database import engine, reader_engines, ReadYourWritesMiddleware
+from metrics import MetricsMiddleware, instrument_engine, render_metrics
+from db_guard import DBAwaitGuardMiddleware
+from admission import AdmissionControlMiddleware, load_signals
+from migrations import check_schema_version, upgrade
+from deletion import resume_deletion_jobs
+from routers import user_router, diary_router, analytics_router
 
-Base.metadata.create_all(bind=engine)
+# 스키마는 'python migrate.py upgrade' 로 배포 시 한 번만 적용하고, 앱은 버전만 확인한다.
+# 로컬 개발처럼 워커가 하나뿐인 환경에서는 DB_AUTO_MIGRATE=true 로 시작 시 자동 적용 가능
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "false").lower() in ("1", "true", "yes", "on")
+# 중단된 일괄 삭제 작업은 'python deletion.py resume' 으로 이어서 실행하고,
+# DELETE_JOBS_RESUME_ON_START=true 이면 시작 시 자동으로 이어서 실행 (워커마다 실행되지만 _claim_job 으로 중복 실행은 막힘)
+DELETE_JOBS_RESUME_ON_START = os.getenv("DELETE_JOBS_RESUME_ON_START", "false").lower() in ("1", "true", "yes", "on")
 
-app = FastAPI()
+instrument_engine(engine)
+for reader_engine in reader_engines:
+    instrument_engine(reader_engine, role="reader")
+
+
+def _report_resume_failure(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"삭제 작업 재개 실패: {str(future.exception())}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_AUTO_MIGRATE:
+        upgrade(engine)
+    check_schema_version(engine)
+    if DELETE_JOBS_RESUME_ON_START:
+        # 재시작 등으로 중단된 일괄 삭제 작업 이어서 실행 (시작을 막지 않도록 스레드에서)
+        resume = asyncio.get_running_loop().run_in_executor(None, resume_deletion_jobs)
+        resume.add_done_callback(_report_resume_failure)
+    # 과부하 판단용 신호(이벤트 루프 지연, 체크아웃 대기) 샘플링 시작
+    load_signals.start()
+    yield
+    await load_signals.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(DBAwaitGuardMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+# 거절한 요청도 메트릭에 남도록 MetricsMiddleware 안쪽에 둠
+app.add_middleware(AdmissionControlMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 app.include_router(user_router.router)
 app.include_router(diary_router.router)
+app.include_router(analytics_router.router)
 
 
 @app.get("/")
 def read_root():
     return {"message": "FastAPI 서버가 실행 중입니다."}
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
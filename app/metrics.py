@@ -0,0 +1,321 @@
+import bisect
+import contextvars
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+# 기본 지연 시간 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callbacks: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set_function(self, callback: Callable[[], float], **labels):
+        """조회 시점에 callback 으로 값을 계산"""
+        with self._lock:
+            self._callbacks[self._key(labels)] = callback
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            callback = self._callbacks.get(key)
+            if callback is None:
+                return self._values.get(key, 0.0)
+        return float(callback())
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+            callbacks = list(self._callbacks.items())
+        items.extend((key, float(callback())) for key, callback in callbacks)
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 조합별 [버킷별 개수..., +Inf 개수, 합계]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            data[index] += 1
+            data[-1] += value
+
+    def totals(self, **labels) -> Tuple[int, float]:
+        """(관측 횟수, 합계) - 구간별 평균 계산용"""
+        with self._lock:
+            data = self._values.get(self._key(labels))
+            if data is None:
+                return 0, 0.0
+            return int(sum(data[:-1])), data[-1]
+
+    def _samples(self):
+        with self._lock:
+            items = [(key, list(data)) for key, data in self._values.items()]
+        for key, data in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), data[:-1]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {data[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# HTTP
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP 요청 수", ("method", "route", "status")))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간 (응답 전송까지, 백그라운드 태스크 제외)", ("method", "route")))
+http_requests_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "처리 중인 HTTP 요청 수"))
+
+# DB
+db_queries_total = registry.register(Counter(
+    "db_queries_total", "실행된 SQL 수"))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL 실행 시간"))
+http_request_db_queries = registry.register(Histogram(
+    "http_request_db_queries", "요청당 SQL 수", ("method", "route"), buckets=COUNT_BUCKETS))
+http_request_db_seconds = registry.register(Histogram(
+    "http_request_db_seconds", "요청당 SQL 실행 시간 합계", ("method", "route")))
+db_pool_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "커넥션 풀 체크아웃 대기 시간", ("role",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)))
+_pool_gauges = {
+    attribute: registry.register(Gauge(name, documentation, ("role", "pool")))
+    for name, documentation, attribute in (
+        ("db_pool_checked_out", "사용 중인 커넥션 수", "checkedout"),
+        ("db_pool_checked_in", "풀에서 대기 중인 커넥션 수", "checkedin"),
+        ("db_pool_overflow", "pool_size 를 넘어 생성된 커넥션 수", "overflow"),
+        ("db_pool_size", "커넥션 풀 크기", "size"),
+    )
+}
+
+# LLM / 파이프라인
+llm_request_duration = registry.register(Histogram(
+    "llm_request_duration_seconds", "LLM API 호출 시간", ("operation", "outcome")))
+llm_tokens_total = registry.register(Counter(
+    "llm_tokens_total", "LLM 토큰 사용량", ("operation", "kind")))
+pipeline_stage_duration = registry.register(Histogram(
+    "diary_pipeline_stage_seconds", "일기 태그 파이프라인 단계별 소요 시간", ("stage",)))
+pipeline_in_progress = registry.register(Gauge(
+    "diary_pipeline_in_progress", "대기/처리 중인 태그 파이프라인 수"))
+comment_cache_total = registry.register(Counter(
+    "comment_cache_total", "AI 코멘트 요청 처리 결과 (hit/miss/coalesced/replayed)", ("result",)))
+
+# 요청 단위 SQL 집계용 [쿼리 수, 실행 시간, 집계 중 여부] - 응답을 보낸 뒤(백그라운드 태스크)에는 집계하지 않음
+_request_db_stats: contextvars.ContextVar = contextvars.ContextVar("request_db_stats", default=None)
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    """라우트별 지연 시간/상태 코드와 요청당 SQL 수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = [500]
+        db_stats = [0, 0.0, True]
+        finished = False
+
+        def finish():
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            elapsed = time.perf_counter() - started
+            db_stats[2] = False
+            http_requests_in_progress.dec()
+
+            method, route = scope["method"], _route_label(scope)
+            http_requests_total.inc(method=method, route=route, status=str(status_holder[0]))
+            http_request_duration.observe(elapsed, method=method, route=route)
+            http_request_db_queries.observe(db_stats[0], method=method, route=route)
+            http_request_db_seconds.observe(db_stats[1], method=method, route=route)
+
+        # 백그라운드 태스크는 응답을 보낸 뒤 같은 호출 안에서 실행되므로, 응답 전송이 끝나면 기록
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        token = _request_db_stats.set(db_stats)
+        http_requests_in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
+            _request_db_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    db_queries_total.inc()
+    db_query_duration.observe(elapsed)
+    stats = _request_db_stats.get()
+    if stats is not None and stats[2]:
+        stats[0] += 1
+        stats[1] += elapsed
+
+
+def instrument_engine(engine, role: str = "primary"):
+    """
+    엔진에 SQL 실행/커넥션 풀 계측을 설치
+
+    engine.dispose() 는 풀 객체를 새로 만들므로 풀이 아니라 엔진에 설치한다.
+    풀 이벤트는 체크아웃이 끝난 뒤에만 발생해 대기 시간을 잴 수 없으므로,
+    커넥션이 풀에서 커넥션을 받아 오는 engine.raw_connection 을 감싼다.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    raw_connection = engine.raw_connection
+
+    # 체크아웃 대기 시간 측정 (풀이 가득 차면 여기서 대기)
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - started, role=role)
+
+    engine.raw_connection = timed_raw_connection
+
+    pool_label = f"{engine.url.host or ''}/{engine.url.database or ''}"
+    for attribute, gauge in _pool_gauges.items():
+        if hasattr(engine.pool, attribute):
+            # 조회 시점의 engine.pool 을 사용 - dispose 후 새 풀의 값을 보고하도록
+            gauge.set_function(lambda attribute=attribute: getattr(engine.pool, attribute)(),
+                               role=role, pool=pool_label)
+
+
+def record_llm_call(operation: str, elapsed: float, outcome: str, usage: Optional[Dict] = None):
+    llm_request_duration.observe(elapsed, operation=operation, outcome=outcome)
+    if usage:
+        for kind in ("prompt_tokens", "completion_tokens"):
+            if usage.get(kind):
+                llm_tokens_total.inc(usage[kind], operation=operation, kind=kind)
+
+
+def render_metrics() -> str:
+    return registry.render()
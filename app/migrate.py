@@ -0,0 +1,31 @@
+"""
+스키마 마이그레이션 명령 - 배포 시 앱 프로세스와 별도로 한 번 실행
+
+    python migrate.py upgrade      # 최신 버전까지 적용
+    python migrate.py current      # 현재 적용된 버전 확인
+"""
+import argparse
+
+from database import engine
+from migrations import upgrade, current_version, latest_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser("upgrade", help="마이그레이션 적용")
+    upgrade_parser.add_argument("--target", type=int, default=None)
+    subparsers.add_parser("current", help="현재 스키마 버전 확인")
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, args.target)
+        print(f"{len(applied)}개의 마이그레이션을 적용했습니다." if applied else "이미 최신 버전입니다.")
+    else:
+        with engine.connect() as connection:
+            print(f"현재 버전: {current_version(connection)} / 최신 버전: {latest_version()}")
+    print(f"대상 DB: {engine.url.render_as_string(hide_password=True)}")
+
+
+if __name__ == "__main__":
+    main()
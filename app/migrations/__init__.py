@@ -0,0 +1,135 @@
+"""
+버전별 스키마 마이그레이션.
+
+각 마이그레이션 모듈(vNNNN_*.py)은 VERSION, DESCRIPTION 과 upgrade(connection) 함수를 가진다.
+앱은 시작 시 schema_version 테이블만 확인하며, 마이그레이션은 배포 시 한 번만 실행한다.
+
+    python migrate.py upgrade
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# 여러 배포 프로세스가 동시에 마이그레이션하지 않도록 MySQL 네임드 락 사용
+_LOCK_NAME = "diary_schema_migration"
+_LOCK_TIMEOUT_SECONDS = 60
+
+
+class SchemaVersionError(RuntimeError):
+    """DB 스키마 버전이 코드가 기대하는 버전과 다를 때 발생하는 예외"""
+    pass
+
+
+class MigrationLockError(RuntimeError):
+    """다른 프로세스가 마이그레이션 락을 잡고 있어 획득하지 못했을 때 발생하는 예외"""
+    pass
+
+
+def load_migrations() -> List:
+    """vNNNN_*.py 모듈을 버전 순으로 로드"""
+    modules = []
+    for module_info in pkgutil.iter_modules(__path__):
+        if module_info.name.startswith("v"):
+            module = importlib.import_module(f"{__name__}.{module_info.name}")
+            if module.VERSION != int(module_info.name[1:5]):
+                raise RuntimeError(f"파일 이름과 VERSION 이 다릅니다: {module_info.name}")
+            modules.append(module)
+    modules.sort(key=lambda module: module.VERSION)
+
+    versions = [module.VERSION for module in modules]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"중복된 마이그레이션 버전이 있습니다: {versions}")
+    return modules
+
+
+def latest_version() -> int:
+    """최신 마이그레이션 버전 - 시작 시간을 위해 모듈을 import 하지 않고 파일 이름(vNNNN_)으로 판단"""
+    versions = [
+        int(module_info.name[1:5]) for module_info in pkgutil.iter_modules(__path__)
+        if module_info.name.startswith("v")
+    ]
+    return max(versions, default=0)
+
+
+def current_version(connection: Connection) -> int:
+    """적용된 최신 스키마 버전 (schema_version 테이블이 없으면 0)"""
+    try:
+        return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        connection.rollback()
+        return 0
+
+
+def upgrade(engine: Engine, target: int = None) -> List[int]:
+    """
+    아직 적용되지 않은 마이그레이션을 순서대로 적용하는 함수
+
+    Args:
+        engine: 마이그레이션할 DB 엔진
+        target: 이 버전까지만 적용 (기본값: 최신)
+
+    Returns:
+        List[int]: 새로 적용된 버전 목록
+    """
+    applied = []
+    with engine.connect() as connection:
+        if engine.dialect.name == "mysql":
+            # 1: 획득, 0: 시간 초과, NULL: 오류 - 락 없이 진행하면 DDL 이 동시에 실행될 수 있음
+            acquired = connection.exec_driver_sql(
+                f"SELECT GET_LOCK('{_LOCK_NAME}', {_LOCK_TIMEOUT_SECONDS})"
+            ).scalar()
+            if acquired != 1:
+                raise MigrationLockError(
+                    f"마이그레이션 락을 {_LOCK_TIMEOUT_SECONDS}초 안에 얻지 못했습니다. "
+                    f"다른 프로세스의 마이그레이션이 끝난 뒤 다시 실행해 주세요."
+                )
+        try:
+            _metadata.create_all(connection, tables=[schema_version])
+            connection.commit()
+
+            version = current_version(connection)
+            for migration in load_migrations():
+                if migration.VERSION <= version or (target is not None and migration.VERSION > target):
+                    continue
+                # MySQL DDL 은 암묵적으로 커밋되므로 마이그레이션은 재실행해도 안전하게(checkfirst) 작성
+                migration.upgrade(connection)
+                connection.execute(schema_version.insert().values(
+                    version=migration.VERSION,
+                    description=migration.DESCRIPTION,
+                    applied_at=datetime.utcnow(),
+                ))
+                connection.commit()
+                applied.append(migration.VERSION)
+                print(f"마이그레이션 {migration.VERSION:04d} 적용: {migration.DESCRIPTION}")
+        finally:
+            if engine.dialect.name == "mysql":
+                connection.exec_driver_sql(f"SELECT RELEASE_LOCK('{_LOCK_NAME}')")
+    return applied
+
+
+def check_schema_version(engine: Engine, expected: int = None):
+    """앱 시작 시 호출 - 쿼리 한 번으로 스키마 버전만 확인"""
+    expected = latest_version() if expected is None else expected
+    with engine.connect() as connection:
+        version = current_version(connection)
+    if version < expected:
+        raise SchemaVersionError(
+            f"DB 스키마 버전({version})이 필요한 버전({expected})보다 낮습니다. "
+            f"'python migrate.py upgrade' 를 먼저 실행해 주세요."
+        )
+    return version
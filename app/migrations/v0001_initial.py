@@ -0,0 +1,59 @@
+"""기존 create_all 로 만들어지던 기본 테이블 (이미 있으면 건너뜀)"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, MetaData, String, Table, Text
+
+VERSION = 1
+DESCRIPTION = "users, tags, diaries, diary_tag, diary_status"
+
+metadata = MetaData()
+
+users = Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String(100), unique=True, nullable=False),
+    Column("password", String(200), nullable=False),
+    Column("nickname", String(50), nullable=False),
+    Column("profile_image_url", String(300), nullable=True),
+)
+
+tags = Table(
+    "tags", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(50), nullable=False, unique=True),
+    Column("category", String(50), nullable=True),
+    Column("created_at", DateTime, default=datetime.utcnow),
+)
+
+diaries = Table(
+    "diaries", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(200), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("date", DateTime, nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("emotion", String(50), nullable=True),
+    Column("image_url", String(300), nullable=True),
+    Column("ai_comment", Text, nullable=True),
+)
+
+diary_tag = Table(
+    "diary_tag", metadata,
+    Column("diary_id", Integer, ForeignKey("diaries.id"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+)
+
+diary_status = Table(
+    "diary_status", metadata,
+    Column("diary_id", Integer, ForeignKey("diaries.id"), primary_key=True),
+    Column("status", Enum("QUEUED", "ANALYZING", "GENERATING", "COMPLETED", "FAILED", name="processingstatus"),
+           nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
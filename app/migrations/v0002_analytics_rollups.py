@@ -0,0 +1,42 @@
+"""감정/태그/카테고리 통계 롤업 테이블"""
+from sqlalchemy import Column, Date, ForeignKey, Integer, MetaData, String, Table
+
+VERSION = 2
+DESCRIPTION = "emotion_rollups, tag_rollups, category_rollups"
+
+metadata = MetaData()
+
+# FK 대상 테이블 (v0001 에서 생성됨)
+Table("users", metadata, Column("id", Integer, primary_key=True))
+Table("tags", metadata, Column("id", Integer, primary_key=True))
+
+emotion_rollups = Table(
+    "emotion_rollups", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("period", String(10), primary_key=True),
+    Column("period_start", Date, primary_key=True),
+    Column("emotion", String(50), primary_key=True),
+    Column("count", Integer, nullable=False, default=0),
+)
+
+tag_rollups = Table(
+    "tag_rollups", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("period", String(10), primary_key=True),
+    Column("period_start", Date, primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    Column("count", Integer, nullable=False, default=0),
+)
+
+category_rollups = Table(
+    "category_rollups", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("period", String(10), primary_key=True),
+    Column("period_start", Date, primary_key=True),
+    Column("category", String(50), primary_key=True),
+    Column("count", Integer, nullable=False, default=0),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, tables=[emotion_rollups, tag_rollups, category_rollups], checkfirst=True)
@@ -0,0 +1,30 @@
+"""사용자별 일기 목록/유사 일기 조회용 인덱스"""
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, Table
+
+VERSION = 3
+DESCRIPTION = "index diaries(user_id, date), diary_tag(tag_id)"
+
+metadata = MetaData()
+
+diaries = Table(
+    "diaries", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Column("date", DateTime),
+)
+
+diary_tag = Table(
+    "diary_tag", metadata,
+    Column("diary_id", Integer, primary_key=True),
+    Column("tag_id", Integer, primary_key=True),
+)
+
+indexes = [
+    Index("ix_diaries_user_id_date", diaries.c.user_id, diaries.c.date),
+    Index("ix_diary_tag_tag_id", diary_tag.c.tag_id),
+]
+
+
+def upgrade(connection):
+    for index in indexes:
+        index.create(connection, checkfirst=True)
@@ -0,0 +1,109 @@
+"""일기/사용자 삭제를 DB 에서 처리하도록 외래 키에 ON DELETE CASCADE 추가, 삭제 작업 테이블"""
+from sqlalchemy import Column, DateTime, Enum, Integer, MetaData, String, Table, Text, inspect
+
+VERSION = 4
+DESCRIPTION = "ON DELETE CASCADE foreign keys, deletion_jobs"
+
+metadata = MetaData()
+
+deletion_jobs = Table(
+    "deletion_jobs", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, nullable=False, index=True),
+    Column("kind", String(20), nullable=False),
+    Column("diary_ids", Text, nullable=True),
+    Column("start_date", DateTime, nullable=True),
+    Column("end_date", DateTime, nullable=True),
+    Column("status", Enum("PENDING", "RUNNING", "COMPLETED", "FAILED", name="deletionjobstatus"), nullable=False),
+    Column("cursor", Integer, nullable=False, default=0),
+    Column("deleted_count", Integer, nullable=False, default=0),
+    Column("error", Text, nullable=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+# (테이블, 컬럼, 참조 테이블) - 부모 테이블부터 순서대로
+CASCADE_FOREIGN_KEYS = [
+    ("diaries", "user_id", "users"),
+    ("diary_tag", "diary_id", "diaries"),
+    ("diary_tag", "tag_id", "tags"),
+    ("diary_status", "diary_id", "diaries"),
+    ("emotion_rollups", "user_id", "users"),
+    ("tag_rollups", "user_id", "users"),
+    ("tag_rollups", "tag_id", "tags"),
+    ("category_rollups", "user_id", "users"),
+]
+
+
+def _pending_foreign_keys(connection):
+    """아직 CASCADE 가 아닌 외래 키 목록 [(테이블, 컬럼, 참조 테이블, 기존 FK 이름)]"""
+    inspector = inspect(connection)
+    pending = []
+    for table, column, referred in CASCADE_FOREIGN_KEYS:
+        for foreign_key in inspector.get_foreign_keys(table):
+            if foreign_key["constrained_columns"] != [column]:
+                continue
+            if (foreign_key.get("options") or {}).get("ondelete", "").upper() != "CASCADE":
+                pending.append((table, column, referred, foreign_key.get("name")))
+            break
+        else:
+            pending.append((table, column, referred, None))
+    return pending
+
+
+def _upgrade_mysql(connection, pending):
+    for table, column, referred, name in pending:
+        if name:
+            connection.exec_driver_sql(f"ALTER TABLE `{table}` DROP FOREIGN KEY `{name}`")
+        connection.exec_driver_sql(
+            f"ALTER TABLE `{table}` ADD CONSTRAINT `fk_{table}_{column}` "
+            f"FOREIGN KEY (`{column}`) REFERENCES `{referred}` (`id`) ON DELETE CASCADE"
+        )
+
+
+def _upgrade_sqlite(connection, pending):
+    """SQLite 는 외래 키를 변경할 수 없으므로 테이블을 새로 만들어 복사 (공식 문서의 12단계 방식)"""
+    tables = list(dict.fromkeys(table for table, _, _, _ in pending))
+
+    connection.commit()
+    connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+    try:
+        reflected_metadata = MetaData()
+        for name in tables:
+            reflected = Table(name, reflected_metadata, autoload_with=connection)
+            rebuilt = reflected.to_metadata(reflected_metadata, name=f"_{name}_new")
+            rebuilt.indexes.clear()
+            for foreign_key in rebuilt.foreign_keys:
+                if any(table == name and column == foreign_key.parent.name
+                       for table, column, _, _ in pending):
+                    foreign_key.ondelete = "CASCADE"
+                    foreign_key.constraint.ondelete = "CASCADE"
+
+            rebuilt.create(connection)
+            columns = ", ".join(f'"{column.name}"' for column in reflected.columns)
+            connection.exec_driver_sql(f'INSERT INTO "_{name}_new" ({columns}) SELECT {columns} FROM "{name}"')
+            connection.exec_driver_sql(f'DROP TABLE "{name}"')
+            connection.exec_driver_sql(f'ALTER TABLE "_{name}_new" RENAME TO "{name}"')
+            for index in reflected.indexes:
+                index.create(connection)
+
+        violations = connection.exec_driver_sql("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            raise RuntimeError(f"외래 키 위반 행이 있습니다: {violations[:10]}")
+        connection.commit()
+    finally:
+        connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
+
+    pending = _pending_foreign_keys(connection)
+    if not pending:
+        return
+    if connection.dialect.name == "mysql":
+        _upgrade_mysql(connection, pending)
+    elif connection.dialect.name == "sqlite":
+        _upgrade_sqlite(connection, pending)
+    else:
+        raise RuntimeError(f"지원하지 않는 DB 입니다: {connection.dialect.name}")
@@ -0,0 +1,23 @@
+"""코멘트 생성 프롬프트용 일기 요약 컬럼"""
+from sqlalchemy import Column, MetaData, String, Table, Text, inspect
+from sqlalchemy.schema import CreateColumn
+
+VERSION = 5
+DESCRIPTION = "diaries.summary, diaries.summary_hash"
+
+metadata = MetaData()
+
+new_columns = [
+    Column("summary", Text, nullable=True),
+    Column("summary_hash", String(64), nullable=True),
+]
+Table("diaries", metadata, *new_columns)
+
+
+def upgrade(connection):
+    existing = {column["name"] for column in inspect(connection).get_columns("diaries")}
+    for column in new_columns:
+        if column.name in existing:
+            continue
+        column_sql = CreateColumn(column).compile(dialect=connection.dialect)
+        connection.exec_driver_sql(f"ALTER TABLE diaries ADD COLUMN {column_sql}")
@@ -0,0 +1,32 @@
+"""AI 코멘트 캐시, Idempotency-Key 응답 저장 테이블"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text
+
+VERSION = 6
+DESCRIPTION = "comment_cache, idempotency_keys"
+
+metadata = MetaData()
+
+# FK 대상 테이블 (v0001 에서 생성됨)
+Table("users", metadata, Column("id", Integer, primary_key=True))
+Table("diaries", metadata, Column("id", Integer, primary_key=True))
+
+comment_cache = Table(
+    "comment_cache", metadata,
+    Column("cache_key", String(64), primary_key=True),
+    Column("diary_id", Integer, ForeignKey("diaries.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("comment", Text, nullable=False),
+    Column("created_at", DateTime),
+)
+
+idempotency_keys = Table(
+    "idempotency_keys", metadata,
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("key", String(100), primary_key=True),
+    Column("request_hash", String(64), nullable=False),
+    Column("response", Text, nullable=False),
+    Column("created_at", DateTime),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, tables=[comment_cache, idempotency_keys], checkfirst=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum, Boolean, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Text, Enum, Boolean, Table, Index
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
 import enum
@@ -21,14 +21,16 @@ class User(Base):
     nickname = Column(String(50), nullable=False)
     profile_image_url = Column(String(300), nullable=True)
 
-    diaries = relationship("Diary", back_populates="owner", cascade="all, delete-orphan")
+    # 삭제는 DB 의 ON DELETE CASCADE 에 맡김 (일기를 메모리로 불러오지 않음)
+    diaries = relationship("Diary", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
 
 # 일기-태그 다대다 관계 테이블
 diary_tag = Table(
     "diary_tag",
     Base.metadata,
-    Column("diary_id", Integer, ForeignKey("diaries.id"), primary_key=True),
-    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True)
+    Column("diary_id", Integer, ForeignKey("diaries.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_diary_tag_tag_id", "tag_id")
 )
 
 class Tag(Base):
@@ -50,21 +52,104 @@ class Diary(Base):
     date = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     emotion = Column(String(50), nullable=True)
     image_url = Column(String(300), nullable=True)
     ai_comment = Column(Text, nullable=True)  # AI가 생성한 코멘트 저장
+    summary = Column(Text, nullable=True)  # 코멘트 생성 시 유사 일기로 쓰일 요약
+    summary_hash = Column(String(64), nullable=True)  # 요약 당시 내용의 해시 (내용이 바뀌면 다시 요약)
 
     owner = relationship("User", back_populates="diaries")
-    status_tracking = relationship("DiaryStatus", back_populates="diary", uselist=False, cascade="all, delete-orphan")
-    tags = relationship("Tag", secondary=diary_tag, back_populates="diaries")
+    status_tracking = relationship("DiaryStatus", back_populates="diary", uselist=False,
+                                   cascade="all, delete-orphan", passive_deletes=True)
+    tags = relationship("Tag", secondary=diary_tag, back_populates="diaries", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_diaries_user_id_date", "user_id", "date"),
+    )
 
 class DiaryStatus(Base):
     __tablename__ = "diary_status"
 
-    diary_id = Column(Integer, ForeignKey("diaries.id"), primary_key=True)
+    diary_id = Column(Integer, ForeignKey("diaries.id", ondelete="CASCADE"), primary_key=True)
     status = Column(Enum(ProcessingStatus), nullable=False, default=ProcessingStatus.QUEUED)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    diary = relationship("Diary", back_populates="status_tracking")
\ No newline at end of file
+    diary = relationship("Diary", back_populates="status_tracking")
+
+
+# 통계용 롤업 테이블 - period 는 "day" 또는 "month", period_start 는 해당 구간의 시작일
+class EmotionRollup(Base):
+    __tablename__ = "emotion_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(String(10), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    emotion = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class TagRollup(Base):
+    __tablename__ = "tag_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(String(10), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    tag = relationship("Tag")
+
+class CategoryRollup(Base):
+    __tablename__ = "category_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(String(10), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    category = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class DeletionJobStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+# 일괄 삭제/회원 탈퇴 작업 - 배치마다 cursor(마지막으로 삭제한 일기 ID)를 저장하여 중단되어도 이어서 실행
+class DeletionJob(Base):
+    __tablename__ = "deletion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, index=True)  # 회원 탈퇴 후에도 작업 기록은 남도록 FK 없음
+    kind = Column(String(20), nullable=False)  # "diaries" 또는 "account"
+    diary_ids = Column(Text, nullable=True)  # JSON 배열
+    start_date = Column(DateTime, nullable=True)
+    end_date = Column(DateTime, nullable=True)
+    status = Column(Enum(DeletionJobStatus), nullable=False, default=DeletionJobStatus.PENDING)
+    cursor = Column(Integer, nullable=False, default=0)
+    deleted_count = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# AI 코멘트 캐시 - 같은 일기 내용/유사 일기 집합/프롬프트 버전이면 LLM 을 다시 호출하지 않음
+class CommentCache(Base):
+    __tablename__ = "comment_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # 캐시 키의 sha256
+    diary_id = Column(Integer, ForeignKey("diaries.id", ondelete="CASCADE"), nullable=False, index=True)
+    comment = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# Idempotency-Key 헤더로 재시도된 요청에 저장된 응답을 그대로 돌려주기 위한 테이블
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # 같은 키로 다른 요청을 보냈는지 확인용
+    response = Column(Text, nullable=False)  # 응답 JSON
+    created_at = Column(DateTime, default=datetime.utcnow)
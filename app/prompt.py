@@ -0,0 +1,214 @@
+import hashlib
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from emotion import get_emotion_analyzer
+from keywords import tokenize
+from models import Diary
+
+load_dotenv()
+
+# 코멘트 생성 프롬프트(시스템 메시지 포함)의 최대 입력 토큰 수
+COMMENT_PROMPT_TOKEN_BUDGET = int(os.getenv("COMMENT_PROMPT_TOKEN_BUDGET", "2500"))
+# 현재 일기에 쓸 수 있는 최대 비율 - 나머지는 유사 일기 요약에 사용
+COMMENT_CURRENT_DIARY_RATIO = float(os.getenv("COMMENT_CURRENT_DIARY_RATIO", "0.6"))
+# 유사 일기 요약 한 건의 최대 토큰 수
+DIARY_SUMMARY_TOKENS = int(os.getenv("DIARY_SUMMARY_TOKENS", "120"))
+# 요약 알고리즘이 바뀌면 올려서 저장된 요약을 모두 무효화
+SUMMARY_VERSION = 1
+# 프롬프트 문구/구성이 바뀌면 올려서 캐시된 코멘트를 모두 무효화
+COMMENT_PROMPT_VERSION = 1
+COMMENT_MODEL = "gpt-3.5-turbo"
+
+COMMENT_SYSTEM_MESSAGE = "당신은 공감적이고 전문적인 심리 상담사입니다. 사용자가 자신의 감정을 이해하고 정신 건강을 개선할 수 있도록 도와주세요."
+
+COMMENT_PROMPT_TEMPLATE = """
+사용자의 현재 일기와 과거에 작성한 유사한 일기들의 요약을 분석하여 개인화된 코멘트를 작성해 주세요.
+
+코멘트는 다음과 같은 내용을 포함해야 합니다:
+1. 사용자의 감정 상태 분석
+2. 우울함이 감지된다면 적절한 조언
+3. 사용자의 패턴이나 습관에 대한 통찰
+4. 긍정적인 측면 강조 및 격려
+5. 필요하다면 전문가 상담 권유
+
+코멘트는 따뜻하고 공감적이며 지지적인 톤으로 작성해 주세요.
+
+현재 일기:
+{diary_content}
+
+과거 유사 일기 요약:
+{similar_texts}
+"""
+
+# 한글/한자/가나 - BPE 토크나이저에서 대부분 글자당 1토큰 이상
+_CJK_PATTERN = re.compile(r"[ᄀ-ᇿ぀-ヿ㄰-㆏一-鿿가-힯]")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。…~])\s+|\n+")
+
+
+@lru_cache(maxsize=1)
+def _tiktoken_encoding():
+    """tiktoken 이 설치되어 있으면 실제 토크나이저 사용 (선택 의존성)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"tiktoken 인코딩 로드 실패, 추정치 사용: {str(e)}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 계산 (tiktoken 이 없으면 보수적으로 추정)
+
+    추정치: 한글 등 CJK 글자는 글자당 1토큰, 나머지는 4글자당 1토큰
+    """
+    if not text:
+        return 0
+    encoding = _tiktoken_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """토큰 수가 max_tokens 이하가 되도록 뒤를 자름"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) + 1 <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip() + "…"
+
+
+def summarize_diary(content: str, max_tokens: int = DIARY_SUMMARY_TOKENS) -> str:
+    """
+    LLM 호출 없이 일기에서 핵심 문장을 골라 요약하는 함수 (추출 요약)
+
+    일기 전체에서 자주 나온 키워드와 감정 표현이 많은 문장을 우선으로 고르고,
+    원래 순서대로 이어 붙인다.
+    """
+    content = (content or "").strip()
+    if count_tokens(content) <= max_tokens:
+        return content
+
+    sentences = [sentence.strip() for sentence in _SENTENCE_SPLIT.split(content) if sentence.strip()]
+    term_frequency = Counter(tokenize(content))
+    analyzer = get_emotion_analyzer()
+
+    def score(sentence: str) -> float:
+        tokens = tokenize(sentence)
+        keyword_score = sum(term_frequency[token] for token in set(tokens)) / (len(tokens) + 1)
+        return keyword_score + abs(analyzer.score(sentence))
+
+    ranked = sorted(range(len(sentences)), key=lambda index: (-score(sentences[index]), index))
+    chosen, seen, used = [], set(), 0
+    for index in ranked:
+        tokens = count_tokens(sentences[index]) + 1
+        if sentences[index] in seen or used + tokens > max_tokens:
+            continue
+        chosen.append(index)
+        seen.add(sentences[index])
+        used += tokens
+
+    if not chosen:
+        return truncate_to_tokens(sentences[ranked[0]], max_tokens)
+    return " ".join(sentences[index] for index in sorted(chosen))
+
+
+def content_hash(content: str) -> str:
+    """요약 캐시 무효화용 내용 해시 (요약 알고리즘 버전 포함)"""
+    return hashlib.sha256(f"{SUMMARY_VERSION}:{content or ''}".encode("utf-8")).hexdigest()
+
+
+def refresh_diary_summary(diary: Diary):
+    """내용이 바뀌었으면 저장된 요약을 다시 계산 (커밋은 호출한 쪽에서)"""
+    digest = content_hash(diary.content)
+    if diary.summary_hash != digest:
+        diary.summary = summarize_diary(diary.content)
+        diary.summary_hash = digest
+
+
+def get_diary_summaries(db: Session, diaries: List[Tuple[int, str]]) -> List[str]:
+    """
+    (일기 ID, 내용) 목록의 요약을 순서대로 반환하는 함수.
+    저장된 요약이 없거나 내용이 바뀐 일기만 요약을 계산해 저장한다 (커밋은 호출한 쪽에서).
+    """
+    if not diaries:
+        return []
+
+    stored: Dict[int, Tuple[Optional[str], Optional[str]]] = {
+        diary_id: (summary, summary_hash)
+        for diary_id, summary, summary_hash in db.query(Diary.id, Diary.summary, Diary.summary_hash).filter(
+            Diary.id.in_([diary_id for diary_id, _ in diaries])
+        )
+    }
+
+    summaries = []
+    for diary_id, content in diaries:
+        summary, summary_hash = stored.get(diary_id, (None, None))
+        digest = content_hash(content)
+        if summary is None or summary_hash != digest:
+            summary = summarize_diary(content)
+            # 요약 저장은 일기 수정이 아니므로 updated_at 을 유지
+            db.query(Diary).filter(Diary.id == diary_id).update(
+                {Diary.summary: summary, Diary.summary_hash: digest, Diary.updated_at: Diary.updated_at},
+                synchronize_session=False
+            )
+        summaries.append(summary)
+    return summaries
+
+
+def build_comment_prompt(diary_content: str, similar_summaries: List[str],
+                         budget: int = COMMENT_PROMPT_TOKEN_BUDGET) -> str:
+    """
+    토큰 예산 안에서 코멘트 생성 프롬프트를 구성하는 함수
+
+    현재 일기는 예산의 COMMENT_CURRENT_DIARY_RATIO 까지 그대로 쓰고 넘치면 요약하며,
+    남은 예산에 유사 일기 요약을 유사도 순으로 들어가는 만큼만 넣는다.
+
+    Args:
+        diary_content: 현재 일기 내용
+        similar_summaries: 유사도 순으로 정렬된 과거 일기 요약 목록
+        budget: 시스템 메시지를 포함한 최대 입력 토큰 수
+
+    Returns:
+        str: user 메시지로 보낼 프롬프트
+    """
+    fixed = count_tokens(COMMENT_SYSTEM_MESSAGE) + count_tokens(
+        COMMENT_PROMPT_TEMPLATE.format(diary_content="", similar_texts="")
+    )
+    available = max(budget - fixed, 0)
+
+    current_limit = int(available * COMMENT_CURRENT_DIARY_RATIO)
+    if count_tokens(diary_content) > current_limit:
+        diary_content = summarize_diary(diary_content, current_limit)
+    remaining = available - count_tokens(diary_content)
+
+    similar_texts = []
+    for summary in similar_summaries:
+        text = f"유사 일기 {len(similar_texts) + 1}:\n{summary}"
+        tokens = count_tokens(text) + 1
+        if tokens > remaining:
+            break
+        similar_texts.append(text)
+        remaining -= tokens
+
+    return COMMENT_PROMPT_TEMPLATE.format(
+        diary_content=diary_content,
+        similar_texts="\n\n".join(similar_texts) or "(없음)",
+    )
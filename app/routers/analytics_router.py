@@ -0,0 +1,44 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from models import User
+from schemas import TrendResponse
+from analytics import get_trends, PERIODS
+
+from .diary_router import get_read_db, get_current_user_readonly
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/trends", response_model=TrendResponse)
+def get_emotion_tag_trends(
+        period: str = Query(default="month"),
+        start: date = Query(default=None),
+        end: date = Query(default=None),
+        top_tags: int = Query(default=5, ge=1, le=50),
+        db: Session = Depends(get_read_db),
+        current_user: User = Depends(get_current_user_readonly)
+):
+    if period not in PERIODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"period 는 {', '.join(PERIODS)} 중 하나여야 합니다."
+        )
+
+    # 기본 조회 구간: 월별은 최근 1년, 일별은 최근 30일
+    end = end or date.today()
+    if start is None:
+        start = end - timedelta(days=365 if period == "month" else 30)
+
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="시작일이 종료일보다 늦을 수 없습니다."
+        )
+
+    return {
+        "period": period,
+        "start": start,
+        "end": end,
+        "trends": get_trends(db, current_user.id, period, start, end, top_tags)
+    }
@@ -1,13 +1,31 @@
 # routers/diary_router.py
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Header, Request
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, NamedTuple, Optional
+import json
+import time
+from datetime import datetime, timedelta
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from database import SessionLocal
-from models import Diary, User, DiaryStatus, ProcessingStatus, Tag
-from schemas import DiaryCreate, DiaryUpdate, DiaryResponse, DiaryTagExtraction, DiaryCommentGeneration
-from utils import verify_access_token, TokenError, extract_tags_from_diary, generate_diary_comment, find_similar_diaries
+from starlette.concurrency import run_in_threadpool
+from database import (SessionLocal, get_read_session, is_replica_session, READ_YOUR_WRITES_COOKIE,
+                      READ_YOUR_WRITES_HEADER)
+from models import Diary, User, DiaryStatus, ProcessingStatus, Tag, DeletionJob, DeletionJobStatus
+from schemas import (DiaryCreate, DiaryUpdate, DiaryResponse, DiaryTagExtraction, DiaryCommentGeneration,
+                     DiaryBulkDelete, DeletionJobResponse)
+from utils import (verify_access_token, TokenError, extract_tags_from_diary, generate_diary_comment,
+                   find_similar_diaries, COMMENT_ERROR_MESSAGE)
+from analytics import diary_contribution, apply_contribution_change
+from emotion import analyze_emotion
+from metrics import pipeline_stage_duration, pipeline_in_progress, comment_cache_total
+from admission import pipeline_db_slots
+from keywords import extract_keywords, observe_diary, invalidate_user_corpus, KEYWORD_FAST_PATH, TAG_MERGE_POLICY
+from tags import canonicalize_tag
+from prompt import get_diary_summaries, refresh_diary_summary
+from deletion import (DELETE_BATCH_SIZE, delete_diary_batch, matching_diary_ids, create_deletion_job,
+                      run_deletion_job)
+from comment_cache import (comment_flight, comment_cache_key, similar_diary_versions, get_cached_comment,
+                           store_cached_comment, idempotency_request_hash, get_idempotent_response,
+                           store_idempotent_response)
 
 router = APIRouter(prefix="/diaries", tags=["Diary"])
 http_bearer = HTTPBearer()
@@ -21,20 +39,9 @@ def get_db():
         db.close()
 
 
-def get_current_user(
-        credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
-        db: Session = Depends(get_db)
-):
+def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(http_bearer)):
     try:
-        payload = verify_access_token(credentials.credentials)
-        user_id = payload.get("user_id")
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="존재하지 않는 유저입니다."
-            )
-        return user
+        return verify_access_token(credentials.credentials)
     except TokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,8 +49,75 @@ def get_current_user(
         )
 
 
+def get_read_db(request: Request, payload: dict = Depends(get_token_payload)):
+    """읽기 전용 세션 - 복제본으로 보내되 방금 쓰기를 한 사용자는 primary 로 (다른 워커의 쓰기는 헤더/쿠키로 판단)"""
+    write_marker = request.headers.get(READ_YOUR_WRITES_HEADER) or request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    db = get_read_session(payload.get("user_id"), write_marker)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _load_current_user(db: Session, payload: dict) -> User:
+    user_id = payload.get("user_id")
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user and is_replica_session(db):
+        # 방금 가입한 사용자가 아직 복제되지 않았을 수 있으므로 primary 에서 한 번 더 확인
+        with SessionLocal() as primary:
+            user = primary.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="존재하지 않는 유저입니다."
+        )
+    # 커밋 후 read-your-writes 판단에 사용
+    db.info["user_id"] = user.id
+    return user
+
+
+def get_current_user(
+        payload: dict = Depends(get_token_payload),
+        db: Session = Depends(get_db)
+):
+    return _load_current_user(db, payload)
+
+
+def get_current_user_readonly(
+        payload: dict = Depends(get_token_payload),
+        db: Session = Depends(get_read_db)
+):
+    """조회 전용 엔드포인트용 - 복제본 세션으로 사용자 확인"""
+    return _load_current_user(db, payload)
+
+
+def attach_tags(db: Session, diary: Diary, tags_data: List[Dict[str, Any]]):
+    """태그 목록을 대표 이름으로 정규화한 뒤 기존 태그와 매칭(없으면 생성)하여 일기에 연결"""
+    for tag_data in tags_data:
+        name = canonicalize_tag(tag_data["name"])
+        if not name:
+            continue
+
+        # 기존 태그 확인
+        tag = db.query(Tag).filter(Tag.name == name).first()
+
+        # 없으면 새로 생성
+        if not tag:
+            tag = Tag(
+                name=name,
+                category=tag_data.get("category")
+            )
+            db.add(tag)
+            db.flush()
+
+        # 일기와 태그 연결 (중복 연결 방지)
+        if tag not in diary.tags:
+            diary.tags.append(tag)
+
+
+# await 하는 작업이 없으므로 sync 함수로 두어 스레드풀에서 실행 (이벤트 루프에서 커넥션을 기다리지 않도록)
 @router.post("/", response_model=DiaryResponse)
-async def create_diary(
+def create_diary(
         diary_data: DiaryCreate,
         background_tasks: BackgroundTasks,
         db: Session = Depends(get_db),
@@ -54,7 +128,9 @@ async def create_diary(
         title=diary_data.title,
         content=diary_data.content,
         date=diary_data.date,
-        user_id=current_user.id
+        user_id=current_user.id,
+        # 로컬 감정 분석으로 작성 시점에 바로 감정 채움 (LLM 태그로 이후 보정)
+        emotion=analyze_emotion(diary_data.content)
     )
 
     # 상태 추적 객체 생성
@@ -65,10 +141,20 @@ async def create_diary(
     new_diary.status_tracking = new_diary_status
 
     db.add(new_diary)
+
+    # 로컬 키워드 추출로 임시 태그 부여 (LLM 결과가 오면 정책에 따라 교체/병합)
+    if KEYWORD_FAST_PATH:
+        attach_tags(db, new_diary, extract_keywords(db, current_user.id, diary_data.content))
+
+    # 통계 롤업 갱신
+    apply_contribution_change(db, current_user.id, None, diary_contribution(new_diary))
+
     db.commit()
     db.refresh(new_diary)
+    observe_diary(current_user.id, diary_data.content)
 
     # 백그라운드 태스크로 태그 추출 처리
+    pipeline_in_progress.inc()
     background_tasks.add_task(
         process_diary_tags,
         new_diary.id,
@@ -79,57 +165,58 @@ async def create_diary(
     return new_diary
 
 
-async def process_diary_tags(diary_id: int, content: str, user_id: int):
-    """일기에서 태그를 추출하고 저장하는 백그라운드 프로세스"""
-    db = SessionLocal()
-    try:
-        # 일기 상태 업데이트
+def _start_tag_analysis(diary_id: int) -> bool:
+    """1단계: 상태를 분석 중으로 바꾸고 바로 커넥션 반환"""
+    with SessionLocal() as db:
+        diary_status = db.query(DiaryStatus).filter(DiaryStatus.diary_id == diary_id).first()
+        if not diary_status:
+            print(f"일기를 찾을 수 없음: {diary_id}")
+            return False
+
+        pipeline_stage_duration.observe(
+            (datetime.utcnow() - diary_status.updated_at).total_seconds(), stage="queued"
+        )
+        diary_status.status = ProcessingStatus.ANALYZING
+        diary_status.updated_at = datetime.utcnow()
+        db.commit()
+        return True
+
+
+def _save_tag_analysis(diary_id: int, content: str, user_id: int, tags_data: List[Dict[str, Any]]) -> bool:
+    """3단계: LLM 결과(또는 로컬 대체 결과)를 저장하고 완료 처리"""
+    with SessionLocal() as db:
+        db.info["user_id"] = user_id
         diary = db.query(Diary).filter(Diary.id == diary_id).first()
         if not diary:
             print(f"일기를 찾을 수 없음: {diary_id}")
-            return
+            return False
 
-        # 상태 업데이트 - 분석 중
-        if diary.status_tracking:
-            diary.status_tracking.status = ProcessingStatus.ANALYZING
-            diary.status_tracking.updated_at = datetime.utcnow()
-            db.commit()
+        # 분석하는 동안 일기가 수정되었다면 새로 등록된 작업이 처리하도록 결과를 버림
+        if diary.content != content:
+            print(f"일기 ID {diary_id}가 분석 중에 수정되어 결과를 저장하지 않음")
+            return False
 
-        # 태그 추출
-        tags_data = await extract_tags_from_diary(content)
+        # 통계 롤업 갱신을 위한 변경 전 기여분
+        before = diary_contribution(diary)
 
-        # 태그 저장
-        for tag_data in tags_data:
-            # 기존 태그 확인
-            tag = db.query(Tag).filter(Tag.name == tag_data["name"]).first()
-
-            # 없으면 새로 생성
-            if not tag:
-                tag = Tag(
-                    name=tag_data["name"],
-                    category=tag_data.get("category")
-                )
-                db.add(tag)
-                db.flush()
-
-            # 일기와 태그 연결
-            diary.tags.append(tag)
+        if tags_data:
+            # LLM 태그 저장 - replace 정책이면 로컬 임시 태그를 교체
+            if TAG_MERGE_POLICY == "replace":
+                diary.tags = []
+            attach_tags(db, diary, tags_data)
 
-        # 감정 분석 (간단한 예시)
-        positive_emotions = ["행복", "기쁨", "즐거움", "감사", "만족"]
-        negative_emotions = ["슬픔", "우울", "불안", "분노", "좌절"]
+            # 추출된 태그로 작성 시점의 감정 분석 결과 보정
+            diary.emotion = analyze_emotion(content, [tag_data["name"] for tag_data in tags_data])
+        elif not diary.tags:
+            # LLM 장애/서킷 오픈 시 로컬 키워드 추출 결과로 대체 (기존 태그와 일치하는 키워드만)
+            print(f"일기 ID {diary_id}: LLM 태그 추출 실패, 로컬 키워드로 대체")
+            attach_tags(db, diary, extract_keywords(db, user_id, content))
 
-        # 태그 기반 간단한 감정 분석
-        emotion_tags = [tag_data["name"] for tag_data in tags_data]
-        positive_count = sum(1 for emotion in positive_emotions if emotion in emotion_tags)
-        negative_count = sum(1 for emotion in negative_emotions if emotion in emotion_tags)
+        # 통계 롤업 갱신
+        apply_contribution_change(db, user_id, before, diary_contribution(diary))
 
-        if positive_count > negative_count:
-            diary.emotion = "긍정적"
-        elif negative_count > positive_count:
-            diary.emotion = "부정적"
-        else:
-            diary.emotion = "중립적"
+        # 이후 코멘트 생성에서 유사 일기로 쓰일 요약을 미리 계산
+        refresh_diary_summary(diary)
 
         # 상태 업데이트 - 완료
         if diary.status_tracking:
@@ -137,31 +224,102 @@ async def process_diary_tags(diary_id: int, content: str, user_id: int):
             diary.status_tracking.updated_at = datetime.utcnow()
 
         db.commit()
-        print(f"일기 ID {diary_id}의 태그 추출 완료")
+        return True
+
+
+def _mark_tag_analysis_failed(diary_id: int):
+    with SessionLocal() as db:
+        diary_status = db.query(DiaryStatus).filter(DiaryStatus.diary_id == diary_id).first()
+        if diary_status:
+            diary_status.status = ProcessingStatus.FAILED
+            diary_status.updated_at = datetime.utcnow()
+            db.commit()
+
+
+async def _run_pipeline_db_stage(func, *args):
+    """파이프라인 DB 단계를 동시 실행 수 제한 안에서 스레드풀로 실행 (조회 요청이 쓸 커넥션을 남겨 둠)"""
+    async with pipeline_db_slots:
+        return await run_in_threadpool(func, *args)
+
+
+async def process_diary_tags(diary_id: int, content: str, user_id: int):
+    """
+    일기에서 태그를 추출하고 저장하는 백그라운드 프로세스.
+    LLM 응답을 기다리는 동안에는 DB 커넥션을 잡고 있지 않도록
+    짧은 DB 단계와 네트워크 단계를 나누어 처리한다.
+    DB 단계는 스레드풀에서 실행해 풀이 가득 차도 이벤트 루프가 멈추지 않도록 한다.
+    """
+    analyzing_started = time.perf_counter()
+    try:
+        if not await _run_pipeline_db_stage(_start_tag_analysis, diary_id):
+            return
+
+        # 2단계: 태그 추출 (커넥션 없이 대기)
+        tags_data = await extract_tags_from_diary(content)
+
+        if await _run_pipeline_db_stage(_save_tag_analysis, diary_id, content, user_id, tags_data):
+            pipeline_stage_duration.observe(time.perf_counter() - analyzing_started, stage="analyzing")
+            print(f"일기 ID {diary_id}의 태그 추출 완료")
 
     except Exception as e:
         # 오류 발생 시 상태 업데이트
-        if diary and diary.status_tracking:
-            diary.status_tracking.status = ProcessingStatus.FAILED
-            diary.status_tracking.updated_at = datetime.utcnow()
-            db.commit()
+        try:
+            await _run_pipeline_db_stage(_mark_tag_analysis_failed, diary_id)
+        except Exception as status_error:
+            print(f"실패 상태 저장 중 오류 발생: {str(status_error)}")
 
         print(f"태그 추출 중 오류 발생: {str(e)}")
     finally:
-        db.close()
+        pipeline_in_progress.dec()
 
 
-@router.post("/{diary_id}/comment", response_model=DiaryResponse)
-async def generate_comment(
-        diary_id: int,
-        comment_data: DiaryCommentGeneration,
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user)
-):
+def _store_comment_cache(diary_id: int, cache_key: str, comment: str):
+    with SessionLocal() as db:
+        try:
+            store_cached_comment(db, diary_id, cache_key, comment)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"코멘트 캐시 저장 중 오류 발생: {str(e)}")
+
+
+async def _generate_and_cache_comment(diary_id: int, cache_key: str, diary_content: str,
+                                     similar_summaries: List[str]) -> str:
+    """LLM 으로 코멘트를 생성하고 성공한 경우에만 캐시에 저장 (single-flight 로 키당 한 번만 실행)"""
+    comment = await generate_diary_comment(diary_content, similar_summaries)
+    if comment != COMMENT_ERROR_MESSAGE:
+        await run_in_threadpool(_store_comment_cache, diary_id, cache_key, comment)
+    return comment
+
+
+class _CommentContext(NamedTuple):
+    """코멘트 생성에 필요한 값 (세션을 닫은 뒤에도 쓸 수 있도록 복사)"""
+    diary_content: str
+    similar_summaries: List[str]
+    cache_key: str
+    cached_comment: Optional[str]
+
+
+def _find_idempotent_replay(db: Session, user_id: int, idempotency_key: str,
+                            request_hash: str) -> Optional[Dict[str, Any]]:
+    """같은 Idempotency-Key 로 저장된 응답이 있으면 반환 (다른 요청에 쓰인 키면 409)"""
+    stored = get_idempotent_response(db, user_id, idempotency_key)
+    if stored is None:
+        return None
+    if stored.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="같은 Idempotency-Key 로 다른 요청을 보낼 수 없습니다."
+        )
+    return json.loads(stored.response)
+
+
+def _load_comment_context(db: Session, user_id: int, diary_id: int, similar_diaries_count: int) -> _CommentContext:
+    """1단계: 일기/유사 일기 요약/캐시 조회 후 LLM 을 기다리는 동안 커넥션을 잡고 있지 않도록 세션 반환"""
     # 일기 확인
     diary = db.query(Diary).filter(
         Diary.id == diary_id,
-        Diary.user_id == current_user.id
+        Diary.user_id == user_id
     ).first()
 
     if not diary:
@@ -180,40 +338,103 @@ async def generate_comment(
 
     # 태그 이름 목록 추출
     diary_tags = [tag.name for tag in diary.tags]
+    diary_content = diary.content
 
     # 유사한 일기 찾기
     similar_diaries = find_similar_diaries(
         db,
         diary_id,
-        current_user.id,
+        user_id,
         diary_tags,
         min_matching_tags=2,
-        limit=comment_data.similar_diaries_count
+        limit=similar_diaries_count
     )
 
-    # 유사한 일기가 없는 경우
-    if not similar_diaries:
-        # 유사한 일기 없이 코멘트 생성
-        comment = await generate_diary_comment(diary.content, [])
-    else:
-        # 유사한 일기의 내용만 추출
-        similar_contents = [content for _, content in similar_diaries]
-
-        # 코멘트 생성
-        comment = await generate_diary_comment(diary.content, similar_contents)
+    # 유사한 일기는 원문 대신 저장된 요약을 사용 (없거나 내용이 바뀐 일기만 새로 요약)
+    similar_summaries = get_diary_summaries(db, similar_diaries)
 
-    # 코멘트 저장
-    diary.ai_comment = comment
+    # 내용/유사 일기/프롬프트 버전이 같으면 이전에 생성한 코멘트를 재사용
+    cache_key = comment_cache_key(
+        diary_id, diary_content, similar_diary_versions(db, [similar_id for similar_id, _ in similar_diaries])
+    )
+    cached_comment = get_cached_comment(db, cache_key)
     db.commit()
-    db.refresh(diary)
+    db.close()
 
-    return diary
+    return _CommentContext(diary_content, similar_summaries, cache_key, cached_comment)
 
 
-@router.get("/", response_model=List[DiaryResponse])
-def get_all_diaries(
+def _save_comment(db: Session, user_id: int, diary_id: int, comment: str,
+                  idempotency_key: Optional[str], request_hash: str) -> DiaryResponse:
+    """3단계: 코멘트 저장 (새 트랜잭션)"""
+    diary = db.query(Diary).filter(
+        Diary.id == diary_id,
+        Diary.user_id == user_id
+    ).first()
+
+    if not diary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="일기를 찾을 수 없습니다."
+        )
+
+    if diary.ai_comment != comment:
+        diary.ai_comment = comment
+        db.commit()
+        db.refresh(diary)
+
+    response = DiaryResponse.model_validate(diary)
+
+    # 실패 메시지는 저장하지 않음 (재시도 시 다시 생성)
+    if idempotency_key and comment != COMMENT_ERROR_MESSAGE:
+        store_idempotent_response(db, user_id, idempotency_key, request_hash, response.model_dump(mode="json"))
+        db.commit()
+
+    return response
+
+
+@router.post("/{diary_id}/comment", response_model=DiaryResponse)
+async def generate_comment(
+        diary_id: int,
+        comment_data: DiaryCommentGeneration,
+        idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", max_length=100),
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user)
+):
+    user_id = current_user.id
+
+    # DB 작업은 스레드풀에서 실행 - 풀이 가득 찼을 때 이벤트 루프가 커넥션을 기다리며 멈추지 않도록
+    # 같은 Idempotency-Key 로 재시도한 요청이면 저장된 응답을 그대로 반환
+    request_hash = idempotency_request_hash(diary_id, comment_data.similar_diaries_count)
+    if idempotency_key:
+        replay = await run_in_threadpool(_find_idempotent_replay, db, user_id, idempotency_key, request_hash)
+        if replay is not None:
+            comment_cache_total.inc(result="replayed")
+            return replay
+
+    context = await run_in_threadpool(
+        _load_comment_context, db, user_id, diary_id, comment_data.similar_diaries_count
+    )
+
+    comment = context.cached_comment
+    if comment is not None:
+        comment_cache_total.inc(result="hit")
+    else:
+        # 동시에 들어온 같은 요청은 한 번의 LLM 호출 결과를 공유
+        comment, shared = await comment_flight.do(
+            context.cache_key,
+            lambda: _generate_and_cache_comment(diary_id, context.cache_key, context.diary_content,
+                                                context.similar_summaries)
+        )
+        comment_cache_total.inc(result="coalesced" if shared else "miss")
+
+    return await run_in_threadpool(_save_comment, db, user_id, diary_id, comment, idempotency_key, request_hash)
+
+
+@router.get("/", response_model=List[DiaryResponse])
+def get_all_diaries(
+        db: Session = Depends(get_read_db),
+        current_user: User = Depends(get_current_user_readonly)
 ):
     diaries = db.query(Diary).filter(
         Diary.user_id == current_user.id
@@ -224,8 +445,8 @@ def get_all_diaries(
 @router.get("/{diary_id}", response_model=DiaryResponse)
 def get_diary(
         diary_id: int,
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user)
+        db: Session = Depends(get_read_db),
+        current_user: User = Depends(get_current_user_readonly)
 ):
     diary = db.query(Diary).filter(
         Diary.id == diary_id,
@@ -239,8 +460,9 @@ def get_diary(
     return diary
 
 
+# create_diary 와 같은 이유로 sync 함수
 @router.put("/{diary_id}", response_model=DiaryResponse)
-async def update_diary(
+def update_diary(
         diary_id: int,
         diary_data: DiaryUpdate,
         background_tasks: BackgroundTasks,
@@ -258,13 +480,24 @@ async def update_diary(
             detail="일기를 찾을 수 없습니다."
         )
 
+    # 통계 롤업 갱신을 위한 변경 전 기여분
+    before = diary_contribution(diary)
+
     # 기존 태그 연결 제거
     diary.tags = []
+    if KEYWORD_FAST_PATH:
+        attach_tags(db, diary, extract_keywords(db, current_user.id, diary_data.content))
+
+    # 내용이 바뀌면 저장된 요약 무효화 (다음 코멘트 생성 또는 태그 분석 완료 시 다시 계산)
+    if diary.content != diary_data.content:
+        diary.summary = None
+        diary.summary_hash = None
 
     # 일기 내용 업데이트
     diary.title = diary_data.title
     diary.content = diary_data.content
     diary.date = diary_data.date
+    diary.emotion = analyze_emotion(diary_data.content)
     diary.updated_at = datetime.utcnow()
 
     # 상태 초기화
@@ -272,10 +505,15 @@ async def update_diary(
         diary.status_tracking.status = ProcessingStatus.QUEUED
         diary.status_tracking.updated_at = datetime.utcnow()
 
+    # 통계 롤업 갱신
+    apply_contribution_change(db, current_user.id, before, diary_contribution(diary))
+
     db.commit()
     db.refresh(diary)
+    invalidate_user_corpus(current_user.id)
 
     # 태그 재추출
+    pipeline_in_progress.inc()
     background_tasks.add_task(
         process_diary_tags,
         diary.id,
@@ -292,17 +530,75 @@ def delete_diary(
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_user)
 ):
-    diary = db.query(Diary).filter(
-        Diary.id == diary_id,
-        Diary.user_id == current_user.id
-    ).first()
-
-    if not diary:
+    # 일기/태그/상태를 ORM 으로 불러오지 않고 DELETE 문으로 바로 삭제 (통계 롤업도 함께 갱신)
+    deleted = delete_diary_batch(db, current_user.id, [diary_id])
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="일기를 찾을 수 없습니다."
         )
 
-    db.delete(diary)
     db.commit()
-    return {"message": "일기가 삭제되었습니다."}
\ No newline at end of file
+    invalidate_user_corpus(current_user.id)
+    return {"message": "일기가 삭제되었습니다."}
+
+
+@router.post("/bulk-delete", response_model=DeletionJobResponse)
+def bulk_delete_diaries(
+        delete_data: DiaryBulkDelete,
+        background_tasks: BackgroundTasks,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    ID 목록 또는 기간으로 일기를 일괄 삭제.
+    대상이 DELETE_BATCH_SIZE 이하이면 바로 삭제하고, 그보다 많으면 백그라운드 작업으로 나누어 삭제한다.
+    """
+    if delete_data.diary_ids is None and delete_data.start_date is None and delete_data.end_date is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="삭제할 일기 ID 또는 기간을 지정해 주세요."
+        )
+    if delete_data.start_date and delete_data.end_date and delete_data.start_date > delete_data.end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="시작일이 종료일보다 늦습니다."
+        )
+
+    # 날짜 범위는 양 끝 포함 -> [start 00:00, end 다음날 00:00)
+    start_date = datetime.combine(delete_data.start_date, datetime.min.time()) if delete_data.start_date else None
+    end_date = (datetime.combine(delete_data.end_date + timedelta(days=1), datetime.min.time())
+                if delete_data.end_date else None)
+
+    diary_ids = matching_diary_ids(db, current_user.id, delete_data.diary_ids, start_date, end_date,
+                                   limit=DELETE_BATCH_SIZE + 1)
+    if len(diary_ids) <= DELETE_BATCH_SIZE:
+        deleted = delete_diary_batch(db, current_user.id, diary_ids)
+        db.commit()
+        invalidate_user_corpus(current_user.id)
+        return {"id": None, "kind": "diaries", "status": DeletionJobStatus.COMPLETED, "deleted_count": deleted}
+
+    job = create_deletion_job(db, current_user.id, "diaries", delete_data.diary_ids, start_date, end_date)
+    db.commit()
+    db.refresh(job)
+    background_tasks.add_task(run_deletion_job, job.id)
+    return job
+
+
+@router.get("/bulk-delete/{job_id}", response_model=DeletionJobResponse)
+def get_bulk_delete_job(
+        job_id: int,
+        db: Session = Depends(get_read_db),
+        current_user: User = Depends(get_current_user_readonly)
+):
+    job = db.query(DeletionJob).filter(
+        DeletionJob.id == job_id,
+        DeletionJob.user_id == current_user.id
+    ).first()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="삭제 작업을 찾을 수 없습니다."
+        )
+    return job
\ No newline at end of file
@@ -1,32 +1,35 @@
 import os
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Header, UploadFile, File
+from functools import lru_cache
+from fastapi import APIRouter, Depends, HTTPException, status, Header, UploadFile, File, BackgroundTasks
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from database import SessionLocal
+from database import mark_user_write
 from models import User
-from schemas import UserCreate, UserLogin, UserResponse, UserProfileUpdate, PasswordChange
+from schemas import (UserCreate, UserLogin, UserResponse, UserProfileUpdate, PasswordChange, AccountDelete,
+                     DeletionJobResponse)
 from utils import create_access_token, create_refresh_token, verify_refresh_token, TokenError
+from deletion import create_deletion_job, run_deletion_job
 
-from .diary_router import get_current_user
+# get_current_user 와 같은 세션을 쓰도록 get_db 도 함께 사용 (요청당 커넥션 1개)
+from .diary_router import get_db, get_current_user, get_current_user_readonly
 
 router = APIRouter(prefix="/user", tags=["User"])
 
 http_bearer = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """비밀번호 해시 컨텍스트 - passlib/bcrypt 로드 비용을 첫 사용 시점으로 미룸"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 
 UPLOAD_DIR = "static/profile_images"
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/signup")
 def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     # 이메일 중복 확인
@@ -38,7 +41,7 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
     # 비밀번호 해싱
-    hashed_password = pwd_context.hash(user_data.password)
+    hashed_password = get_pwd_context().hash(user_data.password)
 
     # 새 사용자 생성
     new_user = User(
@@ -49,6 +52,7 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    mark_user_write(new_user.id)
 
     # 토큰 생성
     access_token = create_access_token({"user_id": new_user.id})
@@ -65,7 +69,7 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
 def signin(user_data: UserLogin, db: Session = Depends(get_db)):
     # 사용자 확인
     user = db.query(User).filter(User.email == user_data.email).first()
-    if not user or not pwd_context.verify(user_data.password, user.password):
+    if not user or not get_pwd_context().verify(user_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다."
@@ -126,7 +130,7 @@ def signout(credentials: HTTPAuthorizationCredentials = Depends(http_bearer)):
 
 @router.get("/profile", response_model=UserResponse)
 def get_current_user_profile(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_readonly)
 ):
     return {
         'id': current_user.id,
@@ -190,7 +194,7 @@ def change_password(
 ):
     try:
         # 현재 비밀번호 확인
-        if not pwd_context.verify(password_data.current_password, current_user.password):
+        if not get_pwd_context().verify(password_data.current_password, current_user.password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="현재 비밀번호가 일치하지 않습니다."
@@ -198,7 +202,7 @@ def change_password(
 
         # 새 비밀번호로 업데이트
         user = db.query(User).filter(User.id == current_user.id).first()
-        user.password = pwd_context.hash(password_data.new_password)
+        user.password = get_pwd_context().hash(password_data.new_password)
         db.commit()
         db.refresh(user)
         return {"message": "비밀번호가 변경되었습니다."}
@@ -207,4 +211,25 @@ def change_password(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+
+@router.delete("/account", response_model=DeletionJobResponse)
+def delete_account(
+        delete_data: AccountDelete,
+        background_tasks: BackgroundTasks,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    """회원 탈퇴 - 일기를 배치 단위로 삭제한 뒤 통계와 사용자 정보를 삭제하는 백그라운드 작업을 등록"""
+    if not get_pwd_context().verify(delete_data.password, current_user.password):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="비밀번호가 일치하지 않습니다."
+        )
+
+    job = create_deletion_job(db, current_user.id, "account")
+    db.commit()
+    db.refresh(job)
+    background_tasks.add_task(run_deletion_job, job.id)
+    return job
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field
-from datetime import datetime
-from typing import Optional, List
-from models import ProcessingStatus
+from datetime import date, datetime
+from typing import Optional, List, Dict
+from models import ProcessingStatus, DeletionJobStatus
 
 class UserProfileUpdate(BaseModel):
     nickname: Optional[str] = None
@@ -83,10 +83,46 @@ class DiaryResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class DiaryBulkDelete(BaseModel):
+    # diary_ids 또는 기간(start_date ~ end_date, 양 끝 포함) 중 하나 이상 지정
+    diary_ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=1000)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+class DeletionJobResponse(BaseModel):
+    id: Optional[int] = None  # 요청 안에서 바로 삭제한 경우 None
+    kind: str
+    status: DeletionJobStatus
+    deleted_count: int
+
+    class Config:
+        from_attributes = True
+
+class AccountDelete(BaseModel):
+    password: str
+
 class DiaryTagExtraction(BaseModel):
     diary_id: int
     content: str
 
 class DiaryCommentGeneration(BaseModel):
     diary_id: int
-    similar_diaries_count: int = Field(default=3, ge=1, le=10)
\ No newline at end of file
+    similar_diaries_count: int = Field(default=3, ge=1, le=10)
+
+class TagTrend(BaseModel):
+    id: int
+    name: str
+    category: Optional[str] = None
+    count: int
+
+class TrendBucket(BaseModel):
+    period_start: date
+    emotions: Dict[str, int] = {}
+    top_tags: List[TagTrend] = []
+    categories: Dict[str, int] = {}
+
+class TrendResponse(BaseModel):
+    period: str
+    start: date
+    end: date
+    trends: List[TrendBucket] = []
@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from models import Diary, Tag, diary_tag
+
+load_dotenv()
+
+# 태그 별칭 사전 (JSON 파일 경로, {"별칭": "대표 태그"} 형식) - 기본 사전에 추가/덮어씀
+TAG_ALIAS_PATH = os.getenv("TAG_ALIAS_PATH")
+TAG_CANONICAL_CACHE_SIZE = int(os.getenv("TAG_CANONICAL_CACHE_SIZE", "10000"))
+TAG_MERGE_BATCH_SIZE = int(os.getenv("TAG_MERGE_BATCH_SIZE", "1000"))
+TAG_NAME_MAX_LENGTH = 50  # Tag.name 컬럼 길이
+
+# 기본 별칭 사전 - 조사 제거/공백 정리 후의 형태 기준
+DEFAULT_ALIASES: Dict[str, str] = {
+    "친구 관계": "친구", "친구 사이": "친구", "가족 관계": "가족", "연인 관계": "연인",
+    "직장 동료": "동료", "회사 동료": "동료", "산행": "등산", "책 읽기": "독서",
+    "야간 근무": "야근", "잠 부족": "수면 부족",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+# 앞뒤 따옴표/문장부호 ("#친구", "'여행'", "운동.") - "C++", "C#" 처럼 이름의 일부인 기호는 유지
+_LEADING_SYMBOLS = re.compile(r"^[#'\"`“”‘’.,!?~·]+")
+_TRAILING_SYMBOLS = re.compile(r"['\"`“”‘’.,!?~·]+$")
+# 마지막 단어에서는 복수 접미사만 제거 ("친구들" -> "친구") - "고양이", "성형외과" 등이 잘리지 않도록
+_PLURAL_SUFFIX = "들"
+# 단어를 잇는 조사는 마지막이 아닌 단어에서만 제거 ("친구와의 관계" -> "친구 관계")
+_CONNECTIVE_PARTICLES = sorted(
+    ["에서의", "와의", "과의", "에서", "에게", "으로", "로의", "에의", "랑", "하고"],
+    key=len, reverse=True
+)
+# 명사의 마지막 글자와 같은 한 글자 조사 ("자본주의", "피부과") - 제거한 형태가 별칭일 때만 제거
+_AMBIGUOUS_PARTICLES = ("의", "와", "과")
+
+
+def _normalize(name: str) -> str:
+    """유니코드(NFKC)/공백/앞뒤 기호 정리"""
+    name = unicodedata.normalize("NFKC", name or "")
+    name = _WHITESPACE.sub(" ", name).strip()
+    name = _TRAILING_SYMBOLS.sub("", _LEADING_SYMBOLS.sub("", name))
+    return name.strip()
+
+
+def _strip_suffix(word: str, suffixes, min_stem: int = 2) -> str:
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            return word[:-len(suffix)]
+    return word
+
+
+class TagCanonicalizer:
+    """LLM 이 돌려준 태그 표기를 대표 태그 이름으로 변환"""
+
+    def __init__(self, aliases: Dict[str, str], cache_size: int = TAG_CANONICAL_CACHE_SIZE):
+        # 별칭과 대표 이름을 모두 정규화해 두고 한 번의 dict 조회로 찾음
+        self._aliases: Dict[str, str] = {}
+        for alias, canonical in aliases.items():
+            canonical = _normalize(canonical)
+            if canonical:
+                self._aliases[_normalize(alias)] = canonical
+        # 대표 이름 자체는 조사 제거 대상에서 제외 (여러 번 적용해도 결과가 같도록)
+        for canonical in list(self._aliases.values()):
+            self._aliases.setdefault(canonical, canonical)
+
+        self.canonicalize = lru_cache(maxsize=cache_size)(self._canonicalize)
+
+    def _canonicalize(self, name: str) -> str:
+        normalized = _normalize(name)
+        if normalized in self._aliases:
+            return self._aliases[normalized]
+
+        words = normalized.split(" ")
+        heads = [_strip_suffix(word, _CONNECTIVE_PARTICLES) for word in words[:-1]]
+        last = _strip_suffix(words[-1], (_PLURAL_SUFFIX,))
+        stripped = " ".join(word for word in heads + [last] if word)
+        if stripped not in self._aliases and heads:
+            # "친구의 관계" 처럼 한 글자 조사까지 떼어야 별칭이 되는 경우만 제거
+            loose = " ".join(word for word in [_strip_suffix(head, _AMBIGUOUS_PARTICLES) for head in heads] + [last]
+                             if word)
+            if loose in self._aliases:
+                stripped = loose
+        return self._aliases.get(stripped, stripped)[:TAG_NAME_MAX_LENGTH].rstrip()
+
+
+def load_aliases(path: Optional[str] = TAG_ALIAS_PATH) -> Dict[str, str]:
+    """기본 별칭 사전에 설정 파일의 별칭을 합쳐 반환"""
+    aliases = dict(DEFAULT_ALIASES)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            aliases.update({str(alias): str(canonical) for alias, canonical in json.load(f).items()})
+    return aliases
+
+
+@lru_cache(maxsize=1)
+def get_tag_canonicalizer() -> TagCanonicalizer:
+    """프로세스당 한 번만 별칭 사전을 로드"""
+    return TagCanonicalizer(load_aliases())
+
+
+def canonicalize_tag(name: str) -> str:
+    """
+    태그 이름을 대표 형태로 변환 ("친구들", " 친구 ", "친구와의 관계" -> "친구")
+
+    Returns:
+        str: 대표 태그 이름 (유효한 글자가 없으면 빈 문자열)
+    """
+    return get_tag_canonicalizer().canonicalize(name)
+
+
+class TagMerge(NamedTuple):
+    """같은 대표 이름으로 합쳐질 태그 묶음"""
+    survivor_id: int
+    canonical: str
+    category: Optional[str]
+    duplicate_ids: List[int]
+
+
+def plan_tag_merges(db: Session) -> List[TagMerge]:
+    """tags 테이블을 대표 이름별로 묶어 병합이 필요한 묶음만 반환"""
+    groups = defaultdict(list)
+    for tag_id, name, category in db.query(Tag.id, Tag.name, Tag.category).order_by(Tag.id):
+        canonical = canonicalize_tag(name)
+        if canonical:
+            groups[canonical].append((tag_id, name, category))
+
+    merges = []
+    for canonical, members in groups.items():
+        if len(members) == 1 and members[0][1] == canonical:
+            continue
+        # 이미 대표 이름을 가진 태그가 있으면 그 태그를, 없으면 가장 먼저 만들어진 태그를 남김
+        survivor = next((member for member in members if member[1] == canonical), members[0])
+        category = survivor[2] or next((member[2] for member in members if member[2]), None)
+        merges.append(TagMerge(
+            survivor_id=survivor[0],
+            canonical=canonical,
+            category=category,
+            duplicate_ids=[member[0] for member in members if member[0] != survivor[0]],
+        ))
+    return merges
+
+
+def _move_tag_links(db: Session, from_tag_id: int, to_tag_id: int, batch_size: int) -> Set[int]:
+    """
+    diary_tag 의 연결을 배치 단위로 옮기는 함수 (이미 대표 태그가 연결된 일기는 중복 연결만 삭제)
+
+    Returns:
+        Set[int]: 연결이 바뀐 일기의 사용자 ID 목록
+    """
+    user_ids = set()
+    while True:
+        diary_ids = [diary_id for (diary_id,) in db.query(diary_tag.c.diary_id).filter(
+            diary_tag.c.tag_id == from_tag_id
+        ).order_by(diary_tag.c.diary_id).limit(batch_size)]
+        if not diary_ids:
+            return user_ids
+
+        already_linked = {diary_id for (diary_id,) in db.query(diary_tag.c.diary_id).filter(
+            diary_tag.c.tag_id == to_tag_id,
+            diary_tag.c.diary_id.in_(diary_ids)
+        )}
+        user_ids.update(user_id for (user_id,) in db.query(Diary.user_id).filter(
+            Diary.id.in_(diary_ids)
+        ).distinct())
+
+        if already_linked:
+            db.execute(delete(diary_tag).where(
+                diary_tag.c.tag_id == from_tag_id,
+                diary_tag.c.diary_id.in_(already_linked)
+            ))
+        moving = [diary_id for diary_id in diary_ids if diary_id not in already_linked]
+        if moving:
+            db.execute(update(diary_tag).where(
+                diary_tag.c.tag_id == from_tag_id,
+                diary_tag.c.diary_id.in_(moving)
+            ).values(tag_id=to_tag_id))
+        db.commit()
+
+
+def merge_duplicate_tags(db: Session, batch_size: int = TAG_MERGE_BATCH_SIZE, dry_run: bool = False) -> Dict:
+    """
+    표기만 다른 중복 태그를 대표 태그 하나로 합치는 오프라인 작업
+
+    diary_tag 연결을 배치 단위로 대표 태그로 옮긴 뒤 중복 태그를 삭제하고,
+    연결이 바뀐 사용자의 통계 롤업을 다시 계산한다. 중간에 중단되어도 다시 실행하면 이어서 처리되며,
+    통계 재계산 전에 중단되었다면 'python analytics.py rebuild' 로 복구한다.
+
+    Args:
+        db: DB 세션
+        batch_size: 한 번에 옮길 diary_tag 행 수
+        dry_run: True 면 병합 계획만 출력
+
+    Returns:
+        Dict: {"groups", "merged_tags", "affected_users"}
+    """
+    from analytics import rebuild_rollups
+
+    merges = plan_tag_merges(db)
+    affected_users = set()
+    merged_tags = 0
+
+    for merge in merges:
+        print(f"태그 병합: {merge.duplicate_ids} -> {merge.survivor_id} ({merge.canonical})")
+        if dry_run:
+            continue
+
+        for duplicate_id in merge.duplicate_ids:
+            affected_users |= _move_tag_links(db, duplicate_id, merge.survivor_id, batch_size)
+
+        if merge.duplicate_ids:
+            db.query(Tag).filter(Tag.id.in_(merge.duplicate_ids)).delete(synchronize_session=False)
+            merged_tags += len(merge.duplicate_ids)
+        # 중복 태그를 지운 뒤에 이름을 바꿔야 unique 제약에 걸리지 않음
+        db.query(Tag).filter(Tag.id == merge.survivor_id).update(
+            {Tag.name: merge.canonical, Tag.category: merge.category}, synchronize_session=False
+        )
+        db.commit()
+
+    for user_id in sorted(affected_users):
+        rebuild_rollups(db, user_id)
+
+    return {"groups": len(merges), "merged_tags": merged_tags, "affected_users": len(affected_users)}
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="태그 정규화/중복 병합")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    merge_parser = subparsers.add_parser("merge", help="표기만 다른 중복 태그 병합")
+    merge_parser.add_argument("--batch-size", type=int, default=TAG_MERGE_BATCH_SIZE)
+    merge_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        result = merge_duplicate_tags(session, args.batch_size, args.dry_run)
+        print(f"{result['groups']}개 묶음, 태그 {result['merged_tags']}개 병합, "
+              f"사용자 {result['affected_users']}명의 통계 재계산")
+    finally:
+        session.close()
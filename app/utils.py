@@ -1,11 +1,15 @@
 import os
+import time
 import jwt
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set, Tuple
-import httpx
 from dotenv import load_dotenv
 import json
 
+from metrics import record_llm_call
+from db_guard import check_no_session_held
+from prompt import build_comment_prompt, COMMENT_MODEL, COMMENT_SYSTEM_MESSAGE
+
 load_dotenv()
 
 # JWT 토큰 설정
@@ -16,7 +20,14 @@ REFRESH_TOKEN_EXPIRE_DAYS = 7
 
 # ChatGPT API 설정
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
+OPENAI_API_URL = os.getenv("OPENAI_API_URL", "https://api.openai.com/v1/chat/completions")
+
+# LLM 서킷 브레이커 설정
+LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+LLM_CIRCUIT_RESET_SECONDS = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "60"))
+
+# 코멘트 생성 실패 시 사용자에게 보여주는 메시지 (캐시/멱등성 저장 대상에서 제외)
+COMMENT_ERROR_MESSAGE = "코멘트 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해 주세요."
 
 
 class TokenError(Exception):
@@ -24,6 +35,38 @@ class TokenError(Exception):
     pass
 
 
+class CircuitBreaker:
+    """연속 실패가 임계치를 넘으면 일정 시간 동안 외부 호출을 차단"""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        if self.opened_at is None:
+            return False
+        # 대기 시간이 지나면 half-open 상태로 한 번 더 시도 허용
+        return time.monotonic() - self.opened_at < self.reset_seconds
+
+    def allow(self) -> bool:
+        return not self.is_open
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+llm_circuit = CircuitBreaker(LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_RESET_SECONDS)
+
+
 def create_access_token(data: dict):
     """Access 토큰 생성"""
     to_encode = data.copy()
@@ -78,6 +121,14 @@ async def extract_tags_from_diary(diary_content: str) -> List[Dict[str, str]]:
     Returns:
         List[Dict[str, str]]: 태그 목록 (이름과 카테고리 포함)
     """
+    if not llm_circuit.allow():
+        print("LLM 서킷이 열려 있어 태그 추출을 건너뜁니다")
+        return []
+
+    # DB 커넥션을 잡은 채 최대 30초를 기다리지 않도록 검사
+    check_no_session_held("extract_tags")
+
+    started = time.perf_counter()
     try:
         headers = {
             "Authorization": f"Bearer {OPENAI_API_KEY}",
@@ -115,6 +166,8 @@ async def extract_tags_from_diary(diary_content: str) -> List[Dict[str, str]]:
             "max_tokens": 500
         }
 
+        import httpx  # 앱 시작 시간을 줄이기 위해 실제 호출 시점에 로드
+
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 OPENAI_API_URL,
@@ -125,9 +178,14 @@ async def extract_tags_from_diary(diary_content: str) -> List[Dict[str, str]]:
 
             if response.status_code != 200:
                 print(f"API 오류: {response.status_code} - {response.text}")
+                llm_circuit.record_failure()
+                record_llm_call("extract_tags", time.perf_counter() - started, "error")
                 return []
 
+            llm_circuit.record_success()
+
             result = response.json()
+            record_llm_call("extract_tags", time.perf_counter() - started, "success", result.get("usage"))
             content = result['choices'][0]['message']['content']
 
             # JSON 문자열 추출 및 파싱
@@ -148,58 +206,51 @@ async def extract_tags_from_diary(diary_content: str) -> List[Dict[str, str]]:
 
     except Exception as e:
         print(f"태그 추출 중 오류 발생: {str(e)}")
+        llm_circuit.record_failure()
+        record_llm_call("extract_tags", time.perf_counter() - started, "exception")
         return []
 
 
-async def generate_diary_comment(diary_content: str, similar_contents: List[str]) -> str:
+async def generate_diary_comment(diary_content: str, similar_summaries: List[str]) -> str:
     """
     현재 일기와 유사한 과거 일기들을 바탕으로 개인화된 코멘트 생성
 
     Args:
         diary_content: 현재 일기 내용
-        similar_contents: 유사한 과거 일기 내용 목록
+        similar_summaries: 유사한 과거 일기 요약 목록 (유사도 순)
 
     Returns:
         str: 생성된 코멘트
     """
+    if not llm_circuit.allow():
+        print("LLM 서킷이 열려 있어 코멘트 생성을 건너뜁니다")
+        return COMMENT_ERROR_MESSAGE
+
+    # DB 커넥션을 잡은 채 최대 30초를 기다리지 않도록 검사
+    check_no_session_held("generate_comment")
+
+    started = time.perf_counter()
     try:
         headers = {
             "Authorization": f"Bearer {OPENAI_API_KEY}",
             "Content-Type": "application/json"
         }
 
-        # 유사 일기 내용 결합
-        similar_texts = "\n\n".join([f"유사 일기 {i + 1}:\n{content}" for i, content in enumerate(similar_contents)])
-
-        prompt = f"""
-        사용자의 현재 일기와 과거에 작성한 유사한 일기들을 분석하여 개인화된 코멘트를 작성해 주세요.
-
-        코멘트는 다음과 같은 내용을 포함해야 합니다:
-        1. 사용자의 감정 상태 분석
-        2. 우울함이 감지된다면 적절한 조언
-        3. 사용자의 패턴이나 습관에 대한 통찰
-        4. 긍정적인 측면 강조 및 격려
-        5. 필요하다면 전문가 상담 권유
-
-        코멘트는 따뜻하고 공감적이며 지지적인 톤으로 작성해 주세요.
-
-        현재 일기:
-        {diary_content}
-
-        과거 유사 일기들:
-        {similar_texts}
-        """
+        # 토큰 예산 안에서 현재 일기와 유사 일기 요약으로 프롬프트 구성
+        prompt = build_comment_prompt(diary_content, similar_summaries)
 
         payload = {
-            "model": "gpt-3.5-turbo",
+            "model": COMMENT_MODEL,
             "messages": [
-                {"role": "system", "content": "당신은 공감적이고 전문적인 심리 상담사입니다. 사용자가 자신의 감정을 이해하고 정신 건강을 개선할 수 있도록 도와주세요."},
+                {"role": "system", "content": COMMENT_SYSTEM_MESSAGE},
                 {"role": "user", "content": prompt}
             ],
             "temperature": 0.7,
             "max_tokens": 1000
         }
 
+        import httpx
+
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 OPENAI_API_URL,
@@ -210,15 +261,22 @@ async def generate_diary_comment(diary_content: str, similar_contents: List[str]
 
             if response.status_code != 200:
                 print(f"API 오류: {response.status_code} - {response.text}")
-                return "코멘트 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해 주세요."
+                llm_circuit.record_failure()
+                record_llm_call("generate_comment", time.perf_counter() - started, "error")
+                return COMMENT_ERROR_MESSAGE
+
+            llm_circuit.record_success()
 
             result = response.json()
+            record_llm_call("generate_comment", time.perf_counter() - started, "success", result.get("usage"))
             content = result['choices'][0]['message']['content']
             return content
 
     except Exception as e:
         print(f"코멘트 생성 중 오류 발생: {str(e)}")
-        return "코멘트 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해 주세요."
+        llm_circuit.record_failure()
+        record_llm_call("generate_comment", time.perf_counter() - started, "exception")
+        return COMMENT_ERROR_MESSAGE
 
 
 def find_similar_diaries(db_session, current_diary_id: int, user_id: int, tags: List[str], min_matching_tags: int = 2,
@@ -237,7 +295,7 @@ def find_similar_diaries(db_session, current_diary_id: int, user_id: int, tags:
     Returns:
         List[Tuple[int, str]]: (일기ID, 일기내용) 튜플 목록
     """
-    from sqlalchemy import text
+    from sqlalchemy import bindparam, text
 
     # 태그 이름만 추출
     tag_names = [tag for tag in tags]
@@ -245,29 +303,26 @@ def find_similar_diaries(db_session, current_diary_id: int, user_id: int, tags:
     if not tag_names:
         return []
 
-    # 태그 목록을 문자열로 변환 (SQL 쿼리용)
-    tags_str = ", ".join(f"'{tag}'" for tag in tag_names)
-
     # SQL 쿼리
-    sql = text(f"""
+    sql = text("""
     SELECT d.id, d.content, COUNT(t.id) as matching_tags
     FROM diaries d
     JOIN diary_tag dt ON d.id = dt.diary_id
     JOIN tags t ON dt.tag_id = t.id
     WHERE d.user_id = :user_id
     AND d.id != :current_diary_id
-    AND t.name IN ({tags_str})
+    AND t.name IN :tag_names
     GROUP BY d.id
     HAVING COUNT(t.id) >= :min_matching_tags
     ORDER BY matching_tags DESC, d.date DESC
     LIMIT :limit
-    """)
+    """).bindparams(bindparam("tag_names", expanding=True))
 
     # 쿼리 실행
     result = db_session.execute(
         sql,
-        {"user_id": user_id, "current_diary_id": current_diary_id, "min_matching_tags": min_matching_tags,
-         "limit": limit}
+        {"user_id": user_id, "current_diary_id": current_diary_id, "tag_names": tag_names,
+         "min_matching_tags": min_matching_tags, "limit": limit}
     )
 
     # 결과 반환
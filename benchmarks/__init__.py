@@ -0,0 +1,7 @@
+import os
+import sys
+
+# app 디렉터리의 모듈들은 최상위 모듈로 import 되므로 경로에 추가
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
@@ -0,0 +1,33 @@
+import random
+from typing import List
+
+# 벤치마크용 샘플 일기 문장 조각
+_OPENINGS = [
+    "오늘은 아침부터 비가 왔다.", "출근길 지하철이 유난히 붐볐다.", "주말이라 늦잠을 잤다.",
+    "오랜만에 친구를 만났다.", "회사에서 회의가 길게 이어졌다.", "저녁에 가족과 외식을 했다.",
+    "퇴근 후 헬스장에 다녀왔다.", "하루 종일 집에서 책을 읽었다.", "점심으로 김치찌개를 먹었다.",
+]
+_FEELINGS = [
+    "정말 행복했고 감사한 마음이 들었다.", "조금 피곤했지만 뿌듯했다.", "왠지 모르게 우울하고 무기력했다.",
+    "기분이 좋았다.", "불안해서 잠이 오지 않았다.", "짜증이 나고 답답했다.", "행복하지 않았다.",
+    "걱정 없이 푹 쉬었다.", "친구와 웃었던 시간이 즐거웠다.", "외롭고 서운한 하루였다.",
+    "스트레스 때문에 머리가 아팠다.", "별다른 일 없이 평범하게 지나갔다.",
+]
+_DETAILS = [
+    "요즘 운동을 꾸준히 하려고 노력 중이다.", "다음 주 프로젝트 마감이 걱정된다.",
+    "등산을 다시 시작해볼까 생각했다.", "두통이 있어서 일찍 자려고 한다.",
+    "동료와의 관계가 조금 나아진 것 같다.", "커피를 너무 많이 마신 것 같다.",
+    "새로 산 화분에 물을 주었다.", "내일은 더 나은 하루가 되었으면 좋겠다.",
+]
+
+
+def sample_diaries(count: int, seed: int = 42, min_sentences: int = 3, max_sentences: int = 12) -> List[str]:
+    """재현 가능한 샘플 일기 본문 목록 생성"""
+    rng = random.Random(seed)
+    diaries = []
+    for _ in range(count):
+        sentences = [rng.choice(_OPENINGS)]
+        for _ in range(rng.randint(min_sentences, max_sentences) - 1):
+            sentences.append(rng.choice(_FEELINGS if rng.random() < 0.4 else _DETAILS))
+        diaries.append(" ".join(sentences))
+    return diaries
@@ -0,0 +1,53 @@
+"""
+로컬 감정 분석기 처리량 벤치마크
+
+    python -m benchmarks.emotion_throughput --count 5000 --repeat 5
+"""
+import argparse
+import json
+import statistics
+import time
+
+from . import corpus  # noqa: F401 - app 경로 설정
+from emotion import EmotionAnalyzer, load_lexicon
+
+
+def run(count: int, repeat: int, seed: int) -> dict:
+    diaries = corpus.sample_diaries(count, seed=seed)
+    total_chars = sum(len(diary) for diary in diaries)
+
+    started = time.perf_counter()
+    analyzer = EmotionAnalyzer(load_lexicon())
+    compile_seconds = time.perf_counter() - started
+
+    per_diary = []
+    labels = {}
+    for _ in range(repeat):
+        for diary in diaries:
+            started = time.perf_counter()
+            label = analyzer.analyze(diary)
+            per_diary.append(time.perf_counter() - started)
+            labels[label] = labels.get(label, 0) + 1
+
+    elapsed = sum(per_diary)
+    per_diary.sort()
+    return {
+        "diaries": count * repeat,
+        "avg_chars": total_chars / count,
+        "compile_ms": compile_seconds * 1000,
+        "diaries_per_sec": len(per_diary) / elapsed,
+        "mb_per_sec": total_chars * repeat * 3 / elapsed / 1_000_000,  # UTF-8 한글 기준
+        "mean_us": statistics.mean(per_diary) * 1_000_000,
+        "p50_us": per_diary[len(per_diary) // 2] * 1_000_000,
+        "p99_us": per_diary[int(len(per_diary) * 0.99)] * 1_000_000,
+        "labels": labels,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 감정 분석기 처리량 벤치마크")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(json.dumps(run(args.count, args.repeat, args.seed), ensure_ascii=False, indent=2))
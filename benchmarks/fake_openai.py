@@ -0,0 +1,89 @@
+"""
+지연 시간과 실패율을 조절할 수 있는 가짜 chat-completions 서버
+
+    python -m benchmarks.fake_openai --port 8081 --latency-ms 800 --failure-rate 0.05
+
+실행 중에도 POST /__control 로 지연/실패율을 바꿀 수 있다.
+"""
+import argparse
+import asyncio
+import json
+import random
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+_TAG_POOL = [
+    ("친구", "인간관계"), ("가족", "인간관계"), ("동료", "인간관계"), ("등산", "취미"), ("독서", "취미"),
+    ("운동", "생활습관"), ("늦잠", "생활습관"), ("커피", "좋아하는 것"), ("두통", "몸에 나타나는 증상"),
+    ("피로", "몸에 나타나는 증상"), ("마감", "고민거리"), ("이직", "고민거리"), ("야근", "싫어하는 것"),
+    ("행복", "좋아하는 것"), ("우울", "고민거리"),
+]
+
+
+def create_app(latency_ms: float = 500, jitter_ms: float = 100, failure_rate: float = 0.0,
+               seed: int = 42) -> FastAPI:
+    app = FastAPI()
+    app.state.settings = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "failure_rate": failure_rate}
+    app.state.stats = {"requests": 0, "failures": 0}
+    rng = random.Random(seed)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        settings = request.app.state.settings
+        stats = request.app.state.stats
+        stats["requests"] += 1
+
+        delay = max(0.0, rng.gauss(settings["latency_ms"], settings["jitter_ms"])) / 1000
+        await asyncio.sleep(delay)
+
+        if rng.random() < settings["failure_rate"]:
+            stats["failures"] += 1
+            return JSONResponse(status_code=500, content={"error": {"message": "fake upstream failure"}})
+
+        prompt = body["messages"][-1]["content"]
+        if "중심 단어" in prompt:
+            tags = rng.sample(_TAG_POOL, rng.randint(2, 5))
+            content = json.dumps([{"name": name, "category": category} for name, category in tags],
+                                 ensure_ascii=False)
+        else:
+            content = "오늘 하루도 수고 많으셨어요. 꾸준히 기록하는 모습이 정말 멋져요."
+
+        prompt_tokens = sum(len(message["content"]) for message in body["messages"]) // 2
+        completion_tokens = len(content) // 2
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    @app.post("/__control")
+    async def control(request: Request):
+        request.app.state.settings.update(await request.json())
+        return request.app.state.settings
+
+    @app.get("/__stats")
+    async def get_stats(request: Request):
+        return {**request.app.state.stats, **request.app.state.settings}
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가짜 OpenAI chat-completions 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.latency_ms, args.jitter_ms, args.failure_rate, args.seed),
+                host=args.host, port=args.port, log_level="warning")
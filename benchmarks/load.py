@@ -0,0 +1,358 @@
+"""
+로컬 SQLite + 가짜 OpenAI 서버로 앱을 띄워 시나리오별 부하를 주는 벤치마크
+
+    python -m benchmarks.load --users 50 --diaries-per-user 40 --output bench.json
+    python -m benchmarks.load --scenarios read,comment --llm-latency-ms 2000
+    python -m benchmarks.load --scenarios slow_llm --slow-llm-latency-ms 5000 [--no-admission]
+
+엔드포인트별 p50/p95/p99 지연, 처리량, 요청당 DB 쿼리 수를 JSON 으로 출력한다.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+import httpx
+
+from . import APP_DIR
+
+REPO_DIR = os.path.dirname(APP_DIR)
+SCENARIOS = ("auth", "create", "read", "comment", "slow_llm")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Recorder:
+    """엔드포인트별 지연 시간/상태 코드 기록"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, label: str, seconds: float, status_code: int):
+        self.latencies[label].append(seconds)
+        self.statuses[label][status_code] += 1
+
+    def summary(self, duration: float, query_counts: Dict[str, Dict]) -> Dict:
+        endpoints = {}
+        for label, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            statuses = dict(self.statuses[label])
+            queries = query_counts.get(label)
+            endpoints[label] = {
+                "count": len(values),
+                "errors": sum(count for code, count in statuses.items() if code >= 400 or code == 0),
+                "status_codes": {str(code): count for code, count in statuses.items()},
+                "throughput_rps": len(values) / duration if duration else 0.0,
+                "mean_ms": sum(values) / len(values) * 1000,
+                "p50_ms": _percentile(values, 50) * 1000,
+                "p95_ms": _percentile(values, 95) * 1000,
+                "p99_ms": _percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+                "db_queries_per_request": (queries["queries"] / queries["requests"]
+                                           if queries and queries["requests"] else None),
+                # 응답 후 실행된 백그라운드 태스크(태그 파이프라인)의 요청당 쿼리 수
+                "db_background_queries_per_request": (queries["background_queries"] / queries["requests"]
+                                                      if queries and queries["requests"] else None),
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "duration_s": duration,
+            "requests": total,
+            "throughput_rps": total / duration if duration else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+async def _timed(client: httpx.AsyncClient, recorder: Recorder, label: str, method: str, url: str, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        status_code = response.status_code
+    except httpx.HTTPError:
+        response, status_code = None, 0
+    recorder.record(label, time.perf_counter() - started, status_code)
+    return response
+
+
+async def _run_concurrently(jobs: List[Callable], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        async with semaphore:
+            await job()
+
+    await asyncio.gather(*(run(job) for job in jobs))
+
+
+class Bench:
+    def __init__(self, base_url: str, llm_url: str, users: List[Dict], args):
+        self.base_url = base_url
+        self.llm_url = llm_url
+        self.users = users
+        self.args = args
+        self.rng = random.Random(args.seed)
+
+    def _headers(self, user: Dict) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {user['token']}"}
+
+    async def scenario_auth(self, client, recorder):
+        """가입/로그인 폭주"""
+        run_id = int(time.time() * 1000)
+        jobs = []
+        for i in range(self.args.requests):
+            email = f"storm{run_id}_{i}@example.com"
+
+            async def job(email=email):
+                await _timed(client, recorder, "POST /user/signup", "POST", "/user/signup",
+                             json={"email": email, "password": "storm-password", "nickname": "storm"})
+                await _timed(client, recorder, "POST /user/signin", "POST", "/user/signin",
+                             json={"email": email, "password": "storm-password"})
+            jobs.append(job)
+        await _run_concurrently(jobs, self.args.concurrency)
+
+    async def scenario_create(self, client, recorder):
+        """일기 작성 + 백그라운드 태그 파이프라인"""
+        await _run_concurrently(self._create_jobs(client, recorder, seed=self.args.seed + 1), self.args.concurrency)
+
+    def _read_jobs(self, client, recorder, prefix: str = "") -> List[Callable]:
+        jobs = []
+        for _ in range(self.args.requests):
+            user = self.rng.choice(self.users)
+            diary_id = self.rng.choice(user["diary_ids"]) if user["diary_ids"] else 0
+            kind = self.rng.random()
+
+            async def job(user=user, diary_id=diary_id, kind=kind):
+                headers = self._headers(user)
+                if kind < 0.2:
+                    await _timed(client, recorder, f"{prefix}GET /diaries/", "GET", "/diaries/", headers=headers)
+                elif kind < 0.8:
+                    await _timed(client, recorder, f"{prefix}GET /diaries/{{diary_id}}", "GET",
+                                 f"/diaries/{diary_id}", headers=headers)
+                else:
+                    await _timed(client, recorder, f"{prefix}GET /user/profile", "GET", "/user/profile",
+                                 headers=headers)
+            jobs.append(job)
+        return jobs
+
+    def _comment_jobs(self, client, recorder) -> List[Callable]:
+        jobs = []
+        for _ in range(self.args.requests):
+            user = self.rng.choice(self.users)
+            if not user["diary_ids"]:
+                continue
+            diary_id = self.rng.choice(user["diary_ids"])
+
+            async def job(user=user, diary_id=diary_id):
+                await _timed(client, recorder, "POST /diaries/{diary_id}/comment", "POST",
+                             f"/diaries/{diary_id}/comment", headers=self._headers(user),
+                             json={"diary_id": diary_id, "similar_diaries_count": 3})
+            jobs.append(job)
+        return jobs
+
+    def _create_jobs(self, client, recorder, seed: int) -> List[Callable]:
+        from .corpus import sample_diaries
+        jobs = []
+        for content in sample_diaries(self.args.requests, seed=seed):
+            user = self.rng.choice(self.users)
+
+            async def job(user=user, content=content):
+                await _timed(client, recorder, "POST /diaries/", "POST", "/diaries/", headers=self._headers(user),
+                             json={"title": "벤치마크", "content": content, "date": "2026-01-01T00:00:00"})
+            jobs.append(job)
+        return jobs
+
+    async def scenario_read(self, client, recorder):
+        """목록/단건/프로필 조회"""
+        await _run_concurrently(self._read_jobs(client, recorder), self.args.concurrency)
+
+    async def scenario_comment(self, client, recorder):
+        """AI 코멘트 생성"""
+        await _run_concurrently(self._comment_jobs(client, recorder), self.args.concurrency)
+
+    async def scenario_slow_llm(self, client, recorder):
+        """
+        LLM 지연 유도 중 조회 지연 비교
+
+        평상시 조회(baseline) 를 먼저 측정하고, 가짜 LLM 서버를 /__control 로 느리게 만든 뒤
+        일기 작성(태그 파이프라인)/코멘트 요청을 몰아넣으면서 같은 조회(slow_llm) 를 다시 측정한다.
+        """
+        await _run_concurrently(self._read_jobs(client, recorder, "baseline "), self.args.concurrency)
+
+        flood_concurrency = self.args.concurrency * 4
+        limits = httpx.Limits(max_connections=flood_concurrency)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=httpx.Timeout(self.args.timeout),
+                                     limits=limits) as flood_client:
+            await flood_client.post(f"{self.llm_url}/__control",
+                                    json={"latency_ms": self.args.slow_llm_latency_ms})
+            try:
+                flood_jobs = self._create_jobs(flood_client, recorder, seed=self.args.seed + 2) + self._comment_jobs(flood_client, recorder)
+                self.rng.shuffle(flood_jobs)
+                flood = asyncio.ensure_future(_run_concurrently(flood_jobs, flood_concurrency))
+                # LLM 대기 요청/파이프라인이 쌓일 때까지 기다린 뒤 조회 측정
+                await asyncio.sleep(self.args.slow_llm_warmup_s)
+                await _run_concurrently(self._read_jobs(client, recorder, "slow_llm "), self.args.concurrency)
+                await flood
+            finally:
+                await flood_client.post(f"{self.llm_url}/__control",
+                                        json={"latency_ms": self.args.llm_latency_ms})
+
+    async def run(self, scenarios: List[str]) -> Dict:
+        results = {}
+        timeout = httpx.Timeout(self.args.timeout)
+        limits = httpx.Limits(max_connections=self.args.concurrency * 2)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=timeout, limits=limits) as client:
+            for name in scenarios:
+                await client.get("/__bench/queries", params={"reset": True})
+                recorder = Recorder()
+                started = time.perf_counter()
+                await getattr(self, f"scenario_{name}")(client, recorder)
+                duration = time.perf_counter() - started
+                query_counts = (await client.get("/__bench/queries")).json()
+                results[name] = recorder.summary(duration, query_counts)
+        return results
+
+
+def _admission_rejections(metrics_text: str) -> Dict[str, float]:
+    """/metrics 에서 우선순위/사유별 거절 수만 추출"""
+    rejected = {}
+    for line in metrics_text.splitlines():
+        if line.startswith("admission_rejected_total{"):
+            labels, value = line[len("admission_rejected_total"):].rsplit(" ", 1)
+            rejected[labels] = float(value)
+    return rejected
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버 프로세스가 종료되었습니다: {url}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"서버가 준비되지 않았습니다: {url}")
+
+
+@contextlib.contextmanager
+def bench_environment(args):
+    """임시 작업 디렉터리에 SQLite DB 를 만들고 가짜 LLM 서버와 앱 서버를 띄움"""
+    workdir = tempfile.mkdtemp(prefix="diary-bench-")
+    app_port, llm_port = _free_port(), _free_port()
+    llm_url = f"http://127.0.0.1:{llm_port}"
+
+    os.environ.update({
+        "DATABASE_URL": args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "OPENAI_API_URL": f"{llm_url}/v1/chat/completions",
+        "OPENAI_API_KEY": "bench",
+        "JWT_SECRET_KEY": os.environ.get("JWT_SECRET_KEY") or "bench-secret-key-for-local-runs-only",
+        "ADMISSION_CONTROL": "false" if args.no_admission else "true",
+    })
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [REPO_DIR, os.environ.get("PYTHONPATH")]))}
+
+    os.makedirs(os.path.join(workdir, "static"), exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            from .seed import seed_database
+            users = seed_database(args.users, args.diaries_per_user, seed=args.seed)
+    finally:
+        os.chdir(cwd)
+
+    from utils import create_access_token
+    for user in users:
+        user["token"] = create_access_token({"user_id": user["id"]})
+
+    log = open(os.path.join(workdir, "server.log"), "w")
+    processes = [
+        subprocess.Popen([sys.executable, "-m", "benchmarks.fake_openai", "--port", str(llm_port),
+                          "--latency-ms", str(args.llm_latency_ms), "--jitter-ms", str(args.llm_jitter_ms),
+                          "--failure-rate", str(args.llm_failure_rate), "--seed", str(args.seed)],
+                         cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT),
+        subprocess.Popen([sys.executable, "-m", "benchmarks.serve", "--port", str(app_port)],
+                         cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT),
+    ]
+    try:
+        _wait_ready(f"{llm_url}/__stats", processes[0])
+        _wait_ready(f"http://127.0.0.1:{app_port}/", processes[1])
+        yield f"http://127.0.0.1:{app_port}", llm_url, users, workdir
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+        log.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="다이어리 서비스 부하/벤치마크")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"쉼표로 구분한 시나리오 목록 ({', '.join(SCENARIOS)})")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--diaries-per-user", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=200, help="시나리오당 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=500)
+    parser.add_argument("--llm-jitter-ms", type=float, default=100)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--slow-llm-latency-ms", type=float, default=5000, help="slow_llm 시나리오의 LLM 지연")
+    parser.add_argument("--slow-llm-warmup-s", type=float, default=2.0,
+                        help="slow_llm 시나리오에서 조회 측정 전 부하를 쌓는 시간")
+    parser.add_argument("--no-admission", action="store_true", help="비교용으로 admission control 끄기")
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 디렉터리의 SQLite 파일")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (기본값: stdout)")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+
+    with bench_environment(args) as (base_url, llm_url, users, workdir):
+        results = asyncio.run(Bench(base_url, llm_url, users, args).run(scenarios))
+        llm_stats = httpx.get(f"{llm_url}/__stats").json()
+        metrics_text = httpx.get(f"{base_url}/metrics").text
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "workdir": workdir,
+        "llm": llm_stats,
+        "admission_rejected": _admission_rejections(metrics_text),
+        "scenarios": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
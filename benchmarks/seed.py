@@ -0,0 +1,91 @@
+"""
+벤치마크용 데이터 적재 (사용자 x 일기 x 태그)
+
+DATABASE_URL 환경 변수가 가리키는 DB 에 직접 적재하므로 app 모듈을 import 하기 전에 설정해야 한다.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from . import corpus
+
+BENCH_PASSWORD = "bench-password"
+
+_TAGS = [
+    ("친구", "인간관계"), ("가족", "인간관계"), ("동료", "인간관계"), ("연인", "인간관계"),
+    ("등산", "취미"), ("독서", "취미"), ("게임", "취미"), ("요리", "취미"), ("사진", "취미"),
+    ("운동", "생활습관"), ("늦잠", "생활습관"), ("야식", "생활습관"), ("산책", "생활습관"),
+    ("두통", "몸에 나타나는 증상"), ("피로", "몸에 나타나는 증상"), ("불면", "몸에 나타나는 증상"),
+    ("마감", "고민거리"), ("이직", "고민거리"), ("돈", "고민거리"), ("시험", "고민거리"),
+    ("커피", "좋아하는 것"), ("음악", "좋아하는 것"), ("여행", "좋아하는 것"),
+    ("야근", "싫어하는 것"), ("출근", "싫어하는 것"), ("소음", "싫어하는 것"),
+]
+
+
+def seed_database(users: int, diaries_per_user: int, tags_per_diary: int = 3, seed: int = 42) -> List[Dict]:
+    """
+    스키마를 만들고 샘플 데이터를 적재하는 함수
+
+    Returns:
+        List[Dict]: 사용자별 {"id", "email", "diary_ids"} 목록
+    """
+    from sqlalchemy import insert
+    from database import engine, SessionLocal
+    from models import User, Diary, DiaryStatus, Tag, ProcessingStatus, diary_tag
+    from routers.user_router import get_pwd_context
+    from analytics import rebuild_rollups
+    from migrations import upgrade
+    from emotion import analyze_emotion
+
+    upgrade(engine)
+
+    rng = random.Random(seed)
+    hashed_password = get_pwd_context().hash(BENCH_PASSWORD)
+    contents = corpus.sample_diaries(max(users * diaries_per_user, 1), seed=seed)
+    now = datetime.utcnow()
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(Tag), [{"name": name, "category": category, "created_at": now} for name, category in _TAGS])
+        tag_ids = [tag_id for (tag_id,) in db.query(Tag.id)]
+
+        db.execute(insert(User), [
+            {"email": f"bench{i}@example.com", "password": hashed_password, "nickname": f"bench{i}"}
+            for i in range(users)
+        ])
+        user_rows = db.query(User.id, User.email).order_by(User.id).all()
+
+        seeded = []
+        for index, (user_id, email) in enumerate(user_rows):
+            diary_rows = []
+            for j in range(diaries_per_user):
+                content = contents[index * diaries_per_user + j]
+                diary_date = now - timedelta(days=diaries_per_user - j)
+                diary_rows.append({
+                    "title": f"{diary_date:%Y-%m-%d} 일기", "content": content, "date": diary_date,
+                    "created_at": diary_date, "updated_at": diary_date, "user_id": user_id,
+                    "emotion": analyze_emotion(content),
+                })
+            if diary_rows:
+                db.execute(insert(Diary), diary_rows)
+            diary_ids = [diary_id for (diary_id,) in
+                         db.query(Diary.id).filter(Diary.user_id == user_id).order_by(Diary.id)]
+
+            if diary_ids:
+                db.execute(insert(DiaryStatus), [
+                    {"diary_id": diary_id, "status": ProcessingStatus.COMPLETED, "created_at": now, "updated_at": now}
+                    for diary_id in diary_ids
+                ])
+                db.execute(insert(diary_tag), [
+                    {"diary_id": diary_id, "tag_id": tag_id}
+                    for diary_id in diary_ids
+                    for tag_id in rng.sample(tag_ids, min(tags_per_diary, len(tag_ids)))
+                ])
+            seeded.append({"id": user_id, "email": email, "diary_ids": diary_ids})
+
+        db.commit()
+        rebuild_rollups(db)
+    finally:
+        db.close()
+
+    return seeded
@@ -0,0 +1,86 @@
+"""
+벤치마크용으로 app/main.py 의 FastAPI 앱을 띄우는 엔트리포인트.
+DATABASE_URL, OPENAI_API_URL, JWT_SECRET_KEY 는 환경 변수로 전달받는다.
+
+    python -m benchmarks.serve --port 8000
+
+엔드포인트별 DB 쿼리 수는 GET /__bench/queries 로 조회한다 (?reset=true 면 초기화).
+응답을 보낸 뒤 실행된 백그라운드 태스크의 쿼리는 background_queries 로 따로 집계한다.
+"""
+import argparse
+import contextvars
+import threading
+from collections import defaultdict
+
+import uvicorn
+from sqlalchemy import event
+
+from . import APP_DIR  # noqa: F401 - app 경로 설정
+
+_current_counter: contextvars.ContextVar = contextvars.ContextVar("bench_query_counter", default=None)
+_lock = threading.Lock()
+_query_counts = defaultdict(lambda: {"requests": 0, "queries": 0, "background_queries": 0})
+
+
+class QueryCountMiddleware:
+    """요청마다 실행된 SQL 수를 세어 라우트 템플릿별로 합산 (응답 전송 후 쿼리는 백그라운드로 구분)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/__bench"):
+            await self.app(scope, receive, send)
+            return
+
+        # [응답 전까지 쿼리 수, 응답 후(백그라운드 태스크) 쿼리 수, 현재 집계 위치]
+        counter = [0, 0, 0]
+
+        async def send_wrapper(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                counter[2] = 1
+
+        token = _current_counter.set(counter)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_counter.reset(token)
+            route = scope.get("route")
+            label = f"{scope['method']} {route.path if route else scope['path']}"
+            with _lock:
+                _query_counts[label]["requests"] += 1
+                _query_counts[label]["queries"] += counter[0]
+                _query_counts[label]["background_queries"] += counter[1]
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter[counter[2]] += 1
+
+
+def create_app():
+    import main
+    from database import engine
+
+    event.listen(engine, "before_cursor_execute", _count_query)
+
+    @main.app.get("/__bench/queries", include_in_schema=False)
+    def get_query_counts(reset: bool = False):
+        with _lock:
+            counts = {label: dict(value) for label, value in _query_counts.items()}
+            if reset:
+                _query_counts.clear()
+        return counts
+
+    return QueryCountMiddleware(main.app)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 앱 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,122 @@
+"""
+앱 시작 시간 벤치마크 (새 프로세스 기준)
+
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --database-url mysql+pymysql://user:pw@localhost/diary
+
+프로세스마다 다음을 측정해 JSON 으로 출력한다.
+  - import_main_ms: `import main` 에 걸린 시간
+  - schema_check_ms: 시작 시 스키마 버전 확인 (check_schema_version)
+  - create_all_ms: 예전처럼 시작할 때마다 create_all 을 실행했을 때의 비용 (비교용)
+  - first_request_ms: uvicorn 프로세스를 띄운 뒤 첫 요청이 성공할 때까지의 시간
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from . import APP_DIR
+from .load import _free_port
+
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from database import engine
+from migrations import check_schema_version
+with engine.connect():
+    pass
+connected = time.perf_counter()
+check_schema_version(engine)
+checked = time.perf_counter()
+from models import Base
+Base.metadata.create_all(bind=engine)
+created = time.perf_counter()
+print(json.dumps({
+    "import_main_ms": (imported - started) * 1000,
+    "schema_check_ms": (checked - connected) * 1000,
+    "create_all_ms": (created - checked) * 1000,
+}))
+"""
+
+
+def _summary(values):
+    values = sorted(values)
+    return {
+        "mean": statistics.mean(values),
+        "p50": values[len(values) // 2],
+        "min": values[0],
+        "max": values[-1],
+    }
+
+
+def _probe(env, workdir) -> dict:
+    output = subprocess.run([sys.executable, "-c", _PROBE], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _first_request(env, workdir, timeout: float = 30.0) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+                                "--log-level", "warning"],
+                               cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("서버 프로세스가 종료되었습니다")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/", timeout=1.0).status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except httpx.HTTPError:
+                time.sleep(0.01)
+        raise RuntimeError("서버가 준비되지 않았습니다")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def run(runs: int, database_url: str = None) -> dict:
+    workdir = tempfile.mkdtemp(prefix="diary-startup-")
+    os.makedirs(os.path.join(workdir, "static"), exist_ok=True)
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url or f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+        "JWT_SECRET_KEY": os.environ.get("JWT_SECRET_KEY") or "bench-secret-key-for-local-runs-only",
+        "PYTHONPATH": os.pathsep.join(filter(None, [APP_DIR, os.environ.get("PYTHONPATH")])),
+    }
+    env.pop("DB_AUTO_MIGRATE", None)
+
+    # 마이그레이션은 배포 단계에서 한 번만
+    started = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(APP_DIR, "migrate.py"), "upgrade"],
+                   cwd=workdir, env=env, capture_output=True, check=True)
+    migrate_ms = (time.perf_counter() - started) * 1000
+
+    probes = [_probe(env, workdir) for _ in range(runs)]
+    first_requests = [_first_request(env, workdir) for _ in range(runs)]
+
+    return {
+        "runs": runs,
+        "workdir": workdir,
+        "migrate_upgrade_ms": migrate_ms,
+        **{key: _summary([probe[key] for probe in probes]) for key in probes[0]},
+        "first_request_ms": _summary(first_requests),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="앱 시작 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 디렉터리의 SQLite 파일")
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.database_url), ensure_ascii=False, indent=2))
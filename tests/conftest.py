@@ -0,0 +1,109 @@
+"""
+테스트 공통 설정
+
+app 모듈은 app/ 디렉터리 기준으로 import 하므로 경로를 추가하고,
+app 모듈이 import 되기 전에 메모리 SQLite 와 테스트용 환경 변수를 설정한다.
+
+    python -m pytest -q
+"""
+import itertools
+import json as pyjson
+import os
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+
+os.environ.update({
+    "APP_ENV": "test",
+    "DATABASE_URL": "sqlite://",
+    "DB_REPLICA_URLS": "",
+    "JWT_SECRET_KEY": "test-secret-key-for-local-test-runs-only",
+    "DB_AWAIT_GUARD": "strict",
+    "ADMISSION_CONTROL": "false",
+})
+sys.path.insert(0, APP_DIR)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from database import SessionLocal, engine  # noqa: E402
+from migrations import upgrade  # noqa: E402
+from models import User  # noqa: E402
+
+_user_numbers = itertools.count(1)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    upgrade(engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture
+def user(db):
+    number = next(_user_numbers)
+    user = User(email=f"user{number}@example.com", password="x", nickname=f"user{number}")
+    db.add(user)
+    db.commit()
+    return user
+
+
+class FakeLLM:
+    """OpenAI API 대신 응답하는 가짜 LLM - httpx.AsyncClient.post 를 대체"""
+
+    def __init__(self):
+        self.tags = [{"name": "친구", "category": "인간관계"}, {"name": "산책", "category": "취미"}]
+        self.comment = "오늘 하루도 수고했어요."
+        self.status_code = 200
+        self.calls = []
+
+    async def post(self, url, headers=None, json=None, timeout=None):
+        from prompt import COMMENT_SYSTEM_MESSAGE
+
+        operation = "generate_comment" if json["messages"][0]["content"] == COMMENT_SYSTEM_MESSAGE else "extract_tags"
+        self.calls.append(operation)
+        content = self.comment if operation == "generate_comment" else pyjson.dumps(self.tags, ensure_ascii=False)
+        return httpx.Response(
+            self.status_code,
+            json={"choices": [{"message": {"content": content}}],
+                  "usage": {"prompt_tokens": 10, "completion_tokens": 10}},
+            request=httpx.Request("POST", url),
+        )
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    from utils import llm_circuit
+
+    llm = FakeLLM()
+    monkeypatch.setattr(httpx.AsyncClient, "post", llm.post)
+    llm_circuit.record_success()
+    return llm
+
+
+@pytest.fixture
+def client(fake_llm):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client):
+    number = next(_user_numbers)
+    response = client.post("/user/signup", json={
+        "email": f"api{number}@example.com", "password": "password", "nickname": f"api{number}"
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,120 @@
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+
+import admission
+from admission import (ADMISSION_RETRY_AFTER_SECONDS, ADMISSION_WRITE_PRESSURE, AdmissionController,
+                       AdmissionControlMiddleware, LoadSignals, Priority, classify_request)
+
+
+class FixedSignals:
+    """pressure() 가 정해진 값을 반환하는 부하 신호"""
+
+    def __init__(self, ratio: float = 0.0, signal: str = "loop_lag"):
+        self.ratio = ratio
+        self.signal = signal
+
+    def pressure(self):
+        return self.ratio, self.signal
+
+
+@pytest.mark.parametrize("method, path, expected", [
+    ("POST", "/diaries/12/comment", Priority.AI),
+    ("POST", "/diaries/12/comment/", Priority.AI),
+    ("POST", "/user/signin", Priority.CRITICAL),
+    ("POST", "/user/token/refresh", Priority.CRITICAL),
+    ("GET", "/diaries/12", Priority.CRITICAL),
+    ("GET", "/diaries/12/comment", Priority.CRITICAL),
+    ("POST", "/diaries/", Priority.WRITE),
+    ("PUT", "/diaries/12", Priority.WRITE),
+    ("DELETE", "/user/account", Priority.WRITE),
+])
+def test_classify_request(method, path, expected):
+    assert classify_request(method, path) == expected
+
+
+def test_ai_is_shed_before_writes():
+    signals = FixedSignals()
+    controller = AdmissionController(signals)
+
+    assert controller.check(Priority.AI) is None
+    signals.ratio = 1.0
+    assert controller.check(Priority.AI) == "loop_lag"
+    assert controller.check(Priority.WRITE) is None
+    signals.ratio = ADMISSION_WRITE_PRESSURE
+    assert controller.check(Priority.WRITE) == "loop_lag"
+    signals.ratio = 100.0
+    assert controller.check(Priority.CRITICAL) is None
+
+
+def test_in_flight_cap_and_retry_after():
+    signals = FixedSignals()
+    controller = AdmissionController(signals)
+    controller.in_flight[Priority.AI] = admission.ADMISSION_AI_MAX_IN_FLIGHT
+    assert controller.check(Priority.AI) == "in_flight"
+    assert controller.check(Priority.WRITE) is None
+
+    assert controller.retry_after() == ADMISSION_RETRY_AFTER_SECONDS
+    signals.ratio = 2.5
+    assert controller.retry_after() == ADMISSION_RETRY_AFTER_SECONDS * 3
+    signals.ratio = 50.0
+    assert controller.retry_after() == ADMISSION_RETRY_AFTER_SECONDS * 6
+
+
+def test_signals_smooth_loop_lag():
+    signals = LoadSignals(alpha=0.5)
+    signals.sample(0.2)
+    signals.sample(0.2)
+    assert signals.loop_lag == pytest.approx(0.15)
+    assert signals.checkout_wait == 0.0
+
+    signals.loop_lag = admission.ADMISSION_LOOP_LAG_MS / 1000 * 2
+    ratio, signal = signals.pressure()
+    assert signal == "loop_lag"
+    assert ratio == pytest.approx(2.0)
+
+
+@pytest.fixture
+def admission_enabled(monkeypatch):
+    monkeypatch.setattr(admission, "ADMISSION_CONTROL", True)
+
+
+def _app(controller):
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+    seen = {}
+
+    @app.post("/diaries/")
+    def create(background_tasks: BackgroundTasks):
+        seen["during_request"] = controller.in_flight[Priority.WRITE]
+        background_tasks.add_task(lambda: seen.setdefault("during_background", controller.in_flight[Priority.WRITE]))
+        return {"ok": True}
+
+    return app, seen
+
+
+def test_middleware_rejects_with_retry_after(admission_enabled):
+    controller = AdmissionController(FixedSignals(ratio=ADMISSION_WRITE_PRESSURE, signal="pool_utilization"))
+    app, seen = _app(controller)
+    rejected = admission.admission_rejected_total.value(priority="WRITE", reason="pool_utilization")
+
+    with TestClient(app) as client:
+        response = client.post("/diaries/")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(ADMISSION_RETRY_AFTER_SECONDS * 2)
+    assert "detail" in response.json()
+    assert seen == {}
+    assert admission.admission_rejected_total.value(priority="WRITE", reason="pool_utilization") == rejected + 1
+
+
+def test_middleware_releases_slot_before_background_tasks(admission_enabled):
+    controller = AdmissionController(FixedSignals())
+    app, seen = _app(controller)
+
+    with TestClient(app) as client:
+        response = client.post("/diaries/")
+
+    assert response.status_code == 200
+    assert seen == {"during_request": 1, "during_background": 0}
+    assert controller.in_flight[Priority.WRITE] == 0
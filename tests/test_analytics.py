@@ -0,0 +1,86 @@
+from datetime import date, datetime
+
+import pytest
+
+from analytics import DiaryContribution, apply_contribution_change, get_trends, rebuild_rollups
+from models import CategoryRollup, Diary, EmotionRollup, Tag, TagRollup
+
+
+@pytest.fixture
+def tags(db, user):
+    created = [Tag(name=f"롤업태그{user.id}-{index}", category="취미" if index % 2 else "인간관계") for index in range(3)]
+    db.add_all(created)
+    db.commit()
+    return created
+
+
+_KEY_COLUMNS = {EmotionRollup: "emotion", TagRollup: "tag_id", CategoryRollup: "category"}
+
+
+def _rollups(db, model, user_id):
+    """{(period, period_start, 키): count}"""
+    return {
+        (row.period, row.period_start, getattr(row, _KEY_COLUMNS[model])): row.count
+        for row in db.query(model).filter(model.user_id == user_id)
+    }
+
+
+def _contribution(day: date, emotion, tags):
+    return DiaryContribution(date=day, emotion=emotion, tags=tuple(sorted((tag.id, tag.category) for tag in tags)))
+
+
+def test_insert_then_increment_existing_rows(db, user, tags):
+    first = _contribution(date(2026, 3, 5), "긍정적", tags[:2])
+    second = _contribution(date(2026, 3, 20), "긍정적", tags[1:])
+    apply_contribution_change(db, user.id, None, first)
+    apply_contribution_change(db, user.id, None, second)
+    db.flush()
+
+    emotions = _rollups(db, EmotionRollup, user.id)
+    assert emotions[("day", date(2026, 3, 5), "긍정적")] == 1
+    assert emotions[("month", date(2026, 3, 1), "긍정적")] == 2
+
+    tag_counts = _rollups(db, TagRollup, user.id)
+    assert tag_counts[("month", date(2026, 3, 1), tags[1].id)] == 2
+    assert tag_counts[("month", date(2026, 3, 1), tags[0].id)] == 1
+
+    categories = _rollups(db, CategoryRollup, user.id)
+    assert categories[("month", date(2026, 3, 1), "취미")] == 2
+
+
+def test_change_moves_counts_between_keys(db, user, tags):
+    before = _contribution(date(2026, 4, 1), "부정적", tags[:1])
+    after = _contribution(date(2026, 4, 1), "긍정적", tags[1:2])
+    apply_contribution_change(db, user.id, None, before)
+    apply_contribution_change(db, user.id, before, after)
+    apply_contribution_change(db, user.id, after, None)
+    db.flush()
+
+    assert set(_rollups(db, EmotionRollup, user.id).values()) == {0}
+    assert set(_rollups(db, TagRollup, user.id).values()) == {0}
+    assert get_trends(db, user.id, "month", date(2026, 1, 1), date(2026, 12, 31)) == []
+
+
+def test_decrement_of_missing_row_is_ignored(db, user, tags):
+    apply_contribution_change(db, user.id, _contribution(date(2026, 5, 1), "중립적", tags[:1]), None)
+    db.flush()
+    assert _rollups(db, EmotionRollup, user.id) == {}
+
+
+def test_incremental_rollups_match_rebuild(db, user, tags):
+    diaries = [
+        Diary(title="t", content="c", date=datetime(2026, 6, day), user_id=user.id, emotion=emotion)
+        for day, emotion in ((1, "긍정적"), (2, "부정적"), (15, "긍정적"))
+    ]
+    diaries[0].tags = tags[:2]
+    diaries[2].tags = tags
+    db.add_all(diaries)
+    db.flush()
+    for diary in diaries:
+        apply_contribution_change(db, user.id, None, _contribution(diary.date.date(), diary.emotion, diary.tags))
+    db.commit()
+    incremental = [_rollups(db, model, user.id) for model in (EmotionRollup, TagRollup, CategoryRollup)]
+
+    rebuild_rollups(db, user.id)
+    rebuilt = [_rollups(db, model, user.id) for model in (EmotionRollup, TagRollup, CategoryRollup)]
+    assert incremental == rebuilt
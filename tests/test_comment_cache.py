@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime
+
+from comment_cache import SingleFlight, comment_cache_key, get_cached_comment, store_cached_comment
+from models import CommentCache, Diary
+
+
+def test_cache_key_changes_with_content_and_similar_diaries():
+    similar = [(2, datetime(2026, 1, 1)), (3, None)]
+    key = comment_cache_key(1, "내용", similar)
+
+    assert comment_cache_key(1, "내용", list(similar)) == key
+    assert comment_cache_key(1, "바뀐 내용", similar) != key
+    assert comment_cache_key(1, "내용", [(2, datetime(2026, 1, 2)), (3, None)]) != key
+    assert comment_cache_key(1, "내용", similar[:1]) != key
+    assert comment_cache_key(4, "내용", similar) != key
+
+
+def test_store_keeps_latest_key_per_diary(db, user):
+    diary = Diary(title="t", content="c", date=datetime(2026, 9, 1), user_id=user.id)
+    db.add(diary)
+    db.commit()
+
+    store_cached_comment(db, diary.id, "old-key", "이전 코멘트")
+    store_cached_comment(db, diary.id, "new-key", "새 코멘트")
+    # 다른 요청이 같은 키를 먼저 저장한 경우 무시
+    store_cached_comment(db, diary.id, "new-key", "중복 코멘트")
+    db.commit()
+
+    assert get_cached_comment(db, "old-key") is None
+    assert get_cached_comment(db, "new-key") == "새 코멘트"
+    assert db.query(CommentCache).filter(CommentCache.diary_id == diary.id).count() == 1
+
+
+def test_single_flight_shares_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)))
+        assert flight.in_flight() == 0
+        later = await flight.do("key", work)
+        return results, later
+
+    results, later = asyncio.run(scenario())
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert {value for value, _ in results} == {1}
+    assert later == (2, False)
+
+
+def test_single_flight_survives_cancelled_waiter():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == ("done", True)
+
+
+def _create_diary(client, auth_headers):
+    response = client.post("/diaries/", json={
+        "title": "산책", "content": "친구와 공원을 산책했다", "date": "2026-05-01T10:00:00"
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_comment_is_cached_until_content_changes(client, auth_headers, fake_llm):
+    diary_id = _create_diary(client, auth_headers)
+    url = f"/diaries/{diary_id}/comment"
+
+    first = client.post(url, json={"diary_id": diary_id}, headers=auth_headers)
+    second = client.post(url, json={"diary_id": diary_id}, headers=auth_headers)
+    assert first.json()["ai_comment"] == second.json()["ai_comment"] == fake_llm.comment
+    assert fake_llm.calls.count("generate_comment") == 1
+
+    response = client.put(f"/diaries/{diary_id}", json={
+        "title": "산책", "content": "친구와 공원을 오래 산책했다", "date": "2026-05-01T10:00:00"
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    fake_llm.comment = "내용이 바뀌어 새로 쓴 코멘트"
+
+    response = client.post(url, json={"diary_id": diary_id}, headers=auth_headers)
+    assert response.json()["ai_comment"] == "내용이 바뀌어 새로 쓴 코멘트"
+    assert fake_llm.calls.count("generate_comment") == 2
+
+
+def test_idempotency_key_replays_response(client, auth_headers, fake_llm):
+    diary_id = _create_diary(client, auth_headers)
+    url = f"/diaries/{diary_id}/comment"
+    headers = {**auth_headers, "Idempotency-Key": f"comment-{diary_id}"}
+
+    first = client.post(url, json={"diary_id": diary_id}, headers=headers)
+    fake_llm.comment = "재시도에서는 쓰이지 않아야 하는 코멘트"
+    replay = client.post(url, json={"diary_id": diary_id}, headers=headers)
+    assert replay.status_code == 200
+    assert replay.json() == first.json()
+    assert fake_llm.calls.count("generate_comment") == 1
+
+    conflict = client.post(url, json={"diary_id": diary_id, "similar_diaries_count": 5}, headers=headers)
+    assert conflict.status_code == 409
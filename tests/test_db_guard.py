@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from database import SessionLocal
+from db_guard import DBAwaitGuardMiddleware, SessionHeldAcrossAwait, check_no_session_held, sessions_held_across_await
+from models import Diary, DiaryStatus, ProcessingStatus
+
+
+def _run_in_request_scope(handler):
+    """DBAwaitGuardMiddleware 가 만든 요청 scope 안에서 handler 실행"""
+    async def app(scope, receive, send):
+        handler()
+
+    asyncio.run(DBAwaitGuardMiddleware(app)({"type": "http"}, None, None))
+
+
+def test_session_in_transaction_is_detected():
+    def handler():
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT 1"))
+            with pytest.raises(SessionHeldAcrossAwait):
+                check_no_session_held("test")
+        finally:
+            db.close()
+        # 세션을 닫으면 커넥션을 반납했으므로 통과
+        check_no_session_held("test")
+
+    _run_in_request_scope(handler)
+
+
+def test_session_without_transaction_is_not_reported():
+    def handler():
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+            db.commit()
+            check_no_session_held("test")
+
+    _run_in_request_scope(handler)
+
+
+def test_sessions_outside_request_scope_are_ignored():
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+        check_no_session_held("test")
+
+
+def _guard_hits(operation: str) -> float:
+    return sessions_held_across_await.value(operation=operation)
+
+
+def test_tag_pipeline_and_comment_do_not_hold_sessions(client, auth_headers, fake_llm, db):
+    tag_hits, comment_hits = _guard_hits("extract_tags"), _guard_hits("generate_comment")
+
+    response = client.post("/diaries/", json={
+        "title": "산책", "content": "친구와 공원을 산책했다", "date": "2026-05-01T10:00:00"
+    }, headers=auth_headers)
+    assert response.status_code == 200
+    diary_id = response.json()["id"]
+
+    # TestClient 는 응답 후 백그라운드 태스크(process_diary_tags)까지 실행하고 반환
+    status = db.query(DiaryStatus).filter(DiaryStatus.diary_id == diary_id).one()
+    assert status.status == ProcessingStatus.COMPLETED
+    assert {tag.name for tag in db.get(Diary, diary_id).tags} == {"친구", "산책"}
+
+    response = client.post(f"/diaries/{diary_id}/comment", json={"diary_id": diary_id}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["ai_comment"] == fake_llm.comment
+
+    assert fake_llm.calls == ["extract_tags", "generate_comment"]
+    assert _guard_hits("extract_tags") == tag_hits
+    assert _guard_hits("generate_comment") == comment_hits
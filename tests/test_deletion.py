@@ -0,0 +1,145 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import deletion
+from analytics import DiaryContribution, apply_contribution_change
+from deletion import create_deletion_job, delete_diary_batch, resume_deletion_jobs, run_deletion_job
+from models import DeletionJob, DeletionJobStatus, Diary, EmotionRollup, User
+
+
+def _add_diaries(db, user, days, emotion="긍정적"):
+    diaries = [Diary(title="t", content="c", date=datetime(2026, 7, day), user_id=user.id, emotion=emotion)
+               for day in days]
+    db.add_all(diaries)
+    db.flush()
+    for diary in diaries:
+        apply_contribution_change(db, user.id, None, DiaryContribution(date=diary.date.date(), emotion=emotion, tags=()))
+    db.commit()
+    return [diary.id for diary in diaries]
+
+
+def _remaining(db, user):
+    return sorted(diary_id for (diary_id,) in db.query(Diary.id).filter(Diary.user_id == user.id))
+
+
+def _month_count(db, user):
+    row = db.query(EmotionRollup).filter(
+        EmotionRollup.user_id == user.id,
+        EmotionRollup.period == "month",
+        EmotionRollup.period_start == date(2026, 7, 1),
+    ).first()
+    return row.count if row else None
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    monkeypatch.setattr(deletion, "DELETE_BATCH_SIZE", 2)
+
+
+def test_batch_deletes_only_owned_diaries(db, user):
+    other = User(email=f"other{user.id}@example.com", password="x", nickname=f"other{user.id}")
+    db.add(other)
+    db.commit()
+    own_ids = _add_diaries(db, user, [1, 2])
+    other_ids = _add_diaries(db, other, [1])
+
+    assert delete_diary_batch(db, user.id, own_ids[:1] + other_ids) == 1
+    db.commit()
+
+    assert _remaining(db, user) == own_ids[1:]
+    assert _remaining(db, other) == other_ids
+    assert _month_count(db, user) == 1
+
+
+def test_job_deletes_date_range_in_batches(db, user, small_batches):
+    ids = _add_diaries(db, user, [1, 3, 5, 7, 9, 20])
+    job = create_deletion_job(db, user.id, "diaries", start_date=datetime(2026, 7, 1), end_date=datetime(2026, 7, 10))
+    db.commit()
+
+    run_deletion_job(job.id)
+    db.expire_all()
+
+    job = db.query(DeletionJob).filter(DeletionJob.id == job.id).one()
+    assert job.status == DeletionJobStatus.COMPLETED
+    assert job.deleted_count == 5
+    assert job.cursor == ids[4]
+    assert _remaining(db, user) == ids[5:]
+    assert _month_count(db, user) == 1
+
+
+def test_resume_picks_up_stale_running_job_from_cursor(db, user, small_batches):
+    ids = _add_diaries(db, user, [1, 2, 3, 4])
+    job = create_deletion_job(db, user.id, "diaries", diary_ids=ids)
+    # 첫 배치를 지운 뒤 프로세스가 중단된 상태
+    job.status = DeletionJobStatus.RUNNING
+    job.cursor = ids[1]
+    job.deleted_count = 2
+    delete_diary_batch(db, user.id, ids[:2])
+    db.commit()
+    job_id = job.id
+
+    # 아직 진행 중으로 보이는 작업은 다른 프로세스가 가져가지 않음
+    run_deletion_job(job_id)
+    db.expire_all()
+    assert _remaining(db, user) == ids[2:]
+
+    db.query(DeletionJob).filter(DeletionJob.id == job_id).update(
+        {DeletionJob.updated_at: datetime.utcnow() - timedelta(seconds=deletion.DELETE_JOB_STALE_SECONDS + 1)},
+        synchronize_session=False
+    )
+    db.commit()
+    assert resume_deletion_jobs() >= 1
+    db.expire_all()
+
+    job = db.query(DeletionJob).filter(DeletionJob.id == job_id).one()
+    assert job.status == DeletionJobStatus.COMPLETED
+    assert job.deleted_count == 4
+    assert _remaining(db, user) == []
+    assert _month_count(db, user) == 0
+
+
+def test_account_job_removes_user_and_rollups(db, user, small_batches):
+    _add_diaries(db, user, [1, 2, 3])
+    job = create_deletion_job(db, user.id, "account")
+    db.commit()
+    user_id = user.id
+
+    run_deletion_job(job.id)
+    db.expire_all()
+
+    assert db.query(User).filter(User.id == user_id).first() is None
+    assert db.query(Diary).filter(Diary.user_id == user_id).count() == 0
+    assert db.query(EmotionRollup).filter(EmotionRollup.user_id == user_id).count() == 0
+    assert db.query(DeletionJob).filter(DeletionJob.id == job.id).one().status == DeletionJobStatus.COMPLETED
+
+
+def test_bulk_delete_endpoint(client, auth_headers):
+    for day in ("2026-08-01", "2026-08-02", "2026-08-10"):
+        response = client.post("/diaries/", headers=auth_headers, json={"title": "t", "content": "c", "date": day})
+        assert response.status_code == 200
+
+    response = client.post("/diaries/bulk-delete", headers=auth_headers,
+                           json={"start_date": "2026-08-01", "end_date": "2026-08-02"})
+    assert response.status_code == 200
+    assert response.json() == {"id": None, "kind": "diaries", "status": "COMPLETED", "deleted_count": 2}
+
+    response = client.post("/diaries/bulk-delete", headers=auth_headers, json={})
+    assert response.status_code == 400
+    response = client.post("/diaries/bulk-delete", headers=auth_headers,
+                           json={"start_date": "2026-08-10", "end_date": "2026-08-01"})
+    assert response.status_code == 400
+
+
+def test_startup_resume_failure_is_reported(capsys):
+    import main
+
+    async def scenario():
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(main._report_resume_failure)
+        future.set_exception(RuntimeError("no such table: deletion_jobs"))
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert "no such table: deletion_jobs" in capsys.readouterr().out
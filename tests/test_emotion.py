@@ -0,0 +1,77 @@
+import re
+
+import pytest
+
+from emotion import NEGATIVE, NEUTRAL, POSITIVE, AhoCorasick, EmotionAnalyzer, analyze_emotion
+
+
+def _naive_matches(patterns, text):
+    return sorted(
+        (index, match.start() + len(pattern))
+        for index, pattern in enumerate(patterns)
+        for match in re.finditer(f"(?={re.escape(pattern)})", text)
+    )
+
+
+@pytest.mark.parametrize("patterns, text", [
+    (["he", "she", "his", "hers"], "ushers"),
+    (["a", "ab", "bab", "bc", "bca", "c", "caa"], "abccab"),
+    (["행복", "행복하", "복", "우울", "울"], "행복하고 우울했던 하루, 울었다"),
+    (["aa", "aaa"], "aaaaa"),
+])
+def test_aho_corasick_finds_all_overlapping_matches(patterns, text):
+    automaton = AhoCorasick(patterns)
+    assert sorted(automaton.iter_matches(text)) == _naive_matches(automaton.patterns, text)
+
+
+def test_aho_corasick_skips_empty_patterns():
+    automaton = AhoCorasick(["", "ab"])
+    assert automaton.patterns == ["ab"]
+    assert list(automaton.iter_matches("xab")) == [(0, 3)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("오늘 정말 행복했다", POSITIVE),
+    ("너무 슬펐고 우울했다", NEGATIVE),
+    ("회의를 했다", NEUTRAL),
+    ("안 행복했다", NEGATIVE),
+    ("행복하지 않았다", NEGATIVE),
+    ("하루 종일. 안 슬펐다", POSITIVE),
+    # 안으로 끝나는 단어는 부정 부사가 아님
+    ("며칠 동안 우울했다", NEGATIVE),
+    ("한동안 슬펐다", NEGATIVE),
+    ("미안 우울해", NEGATIVE),
+    ("불안 걱정", NEGATIVE),
+    # 다른 어절을 건너뛴 없/않 은 부정이 아님
+    ("우울했다 없는 돈", NEGATIVE),
+    ("슬펐다 그래도 잊지 않겠다", NEGATIVE),
+])
+def test_analyze_emotion(text, expected):
+    assert analyze_emotion(text) == expected
+
+
+def test_longer_pattern_wins_over_shorter_prefix():
+    analyzer = EmotionAnalyzer({"재미있": 3.0, "재미": 1.0}, threshold=1.0)
+    assert analyzer.score("재미있다") == 3.0
+    assert analyzer.score("재미") == 1.0
+    assert analyzer.score("재미있고 재미") == 4.0
+
+
+@pytest.mark.parametrize("text, negated", [
+    ("행복하지 않았다", True),
+    ("행복하지않았다", True),
+    ("행복이 없었다", True),
+    ("행복없이", True),
+    ("행복 없는 하루", True),
+    ("행복했다 없는 돈을 벌었다", False),
+    ("행복했다 그래도 잊지 않겠다", False),
+])
+def test_negation_suffix_stays_within_next_word(text, negated):
+    analyzer = EmotionAnalyzer({"행복": 2.0}, threshold=1.0)
+    assert analyzer.score(text) == (-1.0 if negated else 2.0)
+
+
+def test_tag_names_adjust_score():
+    analyzer = EmotionAnalyzer({"행복": 1.0, "우울": -1.0}, threshold=1.0)
+    assert analyzer.analyze("그냥 그랬다") == NEUTRAL
+    assert analyzer.analyze("그냥 그랬다", ["우울"]) == NEGATIVE
@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+
+import keywords
+from keywords import _match_vocabulary, _UserCorpusCache, extract_keywords, tokenize
+from models import Diary, Tag
+
+
+@pytest.fixture
+def vocabulary(db, user):
+    suffix = f"{user.id}"
+    tags = [
+        Tag(name="친구", category="인간관계"),
+        Tag(name="사랑", category="좋아하는 것"),
+        Tag(name="운동", category="취미"),
+        Tag(name=f"미분류{suffix}", category=None),
+    ]
+    for tag in tags:
+        if db.query(Tag).filter(Tag.name == tag.name).first() is None:
+            db.add(tag)
+    db.commit()
+    keywords._vocabulary._loaded_at = 0.0
+    yield keywords._vocabulary.get(db)
+    keywords._vocabulary._loaded_at = 0.0
+
+
+def test_tokenize_strips_particles_and_skips_stopwords():
+    assert tokenize("며칠 동안 친구들과 운동을 했다") == ["친구들", "운동"]
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("친구", "친구"),
+    ("친구들", "친구"),
+    ("사랑니", None),
+    ("운동화", None),
+    ("운동장", None),
+])
+def test_match_vocabulary_requires_known_suffix(token, expected):
+    assert _match_vocabulary(token, {"친구": "인간관계", "사랑": "좋아하는 것", "운동": "취미"}) == expected
+
+
+def test_extract_keywords_only_returns_existing_categorized_tags(db, user, vocabulary):
+    assert f"미분류{user.id}" not in vocabulary
+    tags = extract_keywords(db, user.id, f"며칠 동안 우울했다. 친구들과 운동을 했다. 미분류{user.id} 사랑니")
+    assert sorted(tags, key=lambda tag: tag["name"]) == [
+        {"name": "운동", "category": "취미"},
+        {"name": "친구", "category": "인간관계"},
+    ]
+
+
+def test_extract_keywords_without_matches_creates_nothing(db, user, vocabulary):
+    assert extract_keywords(db, user.id, "며칠 동안 우울했다") == []
+
+
+def _add_diary(db, user, content):
+    db.add(Diary(title="t", content=content, date=datetime(2026, 9, 1), user_id=user.id))
+    db.commit()
+
+
+def test_corpus_cache_observes_and_invalidates(db, user):
+    cache = _UserCorpusCache(max_users=10, ttl=600)
+    _add_diary(db, user, "친구와 운동")
+    assert cache.get(db, user.id)[0] == 1
+
+    cache.observe(user.id, tokenize("친구들과 산책"))
+    document_count, document_frequency = cache.get(db, user.id)
+    assert document_count == 2
+    assert document_frequency["산책"] == 1
+
+    # 캐시만 늘어난 상태에서 무효화하면 DB 기준으로 다시 계산
+    cache.invalidate(user.id)
+    document_count, document_frequency = cache.get(db, user.id)
+    assert document_count == 1
+    assert "산책" not in document_frequency
+
+
+def test_corpus_cache_expires_and_is_bounded(db, user):
+    cache = _UserCorpusCache(max_users=1, ttl=60)
+    _add_diary(db, user, "친구와 운동")
+    assert cache.get(db, user.id)[0] == 1
+
+    _add_diary(db, user, "운동")
+    assert cache.get(db, user.id)[0] == 1
+    cache._loaded_at[user.id] -= 61
+    assert cache.get(db, user.id)[0] == 2
+
+    cache.get(db, user.id + 100000)
+    assert list(cache._stats) == [user.id + 100000]
+    assert list(cache._loaded_at) == [user.id + 100000]
+
+
+def test_invalid_tag_merge_policy_fails_at_import():
+    result = subprocess.run(
+        [sys.executable, "-c", "import keywords"],
+        cwd=os.path.dirname(keywords.__file__),
+        env={**os.environ, "TAG_MERGE_POLICY": "mrege"},
+        capture_output=True, text=True,
+    )
+    assert result.returncode != 0
+    assert "TAG_MERGE_POLICY" in result.stderr
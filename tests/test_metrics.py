@@ -0,0 +1,66 @@
+import time
+
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import main  # noqa: F401 - 엔진 SQL 계측 설치
+from database import SessionLocal
+from metrics import (MetricsMiddleware, http_request_db_queries, http_request_duration, http_requests_in_progress,
+                     http_requests_total)
+
+
+def _slow_background_query():
+    time.sleep(0.3)
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+
+
+def _create_app():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.post("/metrics-test/background")
+    def with_background(background_tasks: BackgroundTasks):
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+        background_tasks.add_task(_slow_background_query)
+        return {"ok": True}
+
+    return app
+
+
+def test_request_metrics_exclude_background_tasks():
+    labels = {"method": "POST", "route": "/metrics-test/background"}
+    in_progress = http_requests_in_progress.value()
+    with TestClient(_create_app()) as client:
+        assert client.post("/metrics-test/background").status_code == 200
+
+    count, total = http_request_duration.totals(**labels)
+    assert count == 1
+    assert total < 0.3
+    assert http_request_db_queries.totals(**labels) == (1, 1.0)
+    assert http_requests_total.value(status="200", **labels) == 1
+    assert http_requests_in_progress.value() == in_progress
+
+
+def test_pool_instrumentation_survives_dispose(tmp_path):
+    from database import DatabaseSettings, create_db_engine
+    from metrics import _pool_gauges, db_pool_checkout_wait, instrument_engine
+
+    test_engine = create_db_engine(DatabaseSettings(f"sqlite:///{tmp_path / 'dispose.db'}", prefix="DB_TEST_"))
+    instrument_engine(test_engine, role="dispose-test")
+    labels = {"role": "dispose-test", "pool": f"/{tmp_path / 'dispose.db'}"}
+    try:
+        with test_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        assert db_pool_checkout_wait.totals(role="dispose-test")[0] == 1
+
+        test_engine.dispose()
+        with test_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert _pool_gauges["checkedout"].value(**labels) == 1
+        assert db_pool_checkout_wait.totals(role="dispose-test")[0] == 2
+        assert _pool_gauges["checkedout"].value(**labels) == 0
+    finally:
+        test_engine.dispose()
@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import inspect
+
+import migrations
+from database import DatabaseSettings, create_db_engine
+from migrations import (MigrationLockError, SchemaVersionError, check_schema_version, latest_version,
+                        load_migrations, upgrade)
+from models import Base
+
+
+@pytest.fixture
+def fresh_engine():
+    engine = create_db_engine(DatabaseSettings("sqlite://"))
+    yield engine
+    engine.dispose()
+
+
+def test_migrations_are_ordered_and_match_latest_version():
+    versions = [migration.VERSION for migration in load_migrations()]
+    assert versions == sorted(set(versions))
+    assert versions[-1] == latest_version()
+
+
+def test_upgrade_is_idempotent(fresh_engine):
+    with pytest.raises(SchemaVersionError):
+        check_schema_version(fresh_engine)
+
+    assert upgrade(fresh_engine) == [migration.VERSION for migration in load_migrations()]
+    assert upgrade(fresh_engine) == []
+    assert check_schema_version(fresh_engine) == latest_version()
+
+
+def test_upgrade_to_target_then_latest(fresh_engine):
+    assert upgrade(fresh_engine, target=2) == [1, 2]
+    with pytest.raises(SchemaVersionError):
+        check_schema_version(fresh_engine)
+    assert upgrade(fresh_engine)[0] == 3
+
+
+def test_migrated_schema_matches_models(fresh_engine):
+    upgrade(fresh_engine)
+    inspector = inspect(fresh_engine)
+    for table in Base.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert columns == set(table.columns.keys()), table.name
+
+
+class _FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class _FakeConnection:
+    def __init__(self, lock_result):
+        self.lock_result = lock_result
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def exec_driver_sql(self, statement):
+        self.statements.append(statement)
+        return _FakeResult(self.lock_result)
+
+
+class _FakeMySQLEngine:
+    class dialect:
+        name = "mysql"
+
+    def __init__(self, lock_result):
+        self.connection = _FakeConnection(lock_result)
+
+    def connect(self):
+        return self.connection
+
+
+@pytest.mark.parametrize("lock_result", [0, None])
+def test_upgrade_refuses_to_run_without_mysql_lock(lock_result, monkeypatch):
+    monkeypatch.setattr(migrations, "load_migrations", lambda: pytest.fail("락 없이 마이그레이션을 실행함"))
+    engine = _FakeMySQLEngine(lock_result)
+
+    with pytest.raises(MigrationLockError):
+        upgrade(engine)
+    assert len(engine.connection.statements) == 1
+    assert "GET_LOCK" in engine.connection.statements[0]
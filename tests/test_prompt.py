@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import prompt
+from models import Diary
+from prompt import (COMMENT_SYSTEM_MESSAGE, build_comment_prompt, count_tokens, get_diary_summaries,
+                    summarize_diary, truncate_to_tokens)
+
+LONG_DIARY = " ".join(
+    f"오늘은 {index}번째로 친구와 공원에서 산책을 했다. 날씨가 좋아서 정말 행복했다."
+    for index in range(80)
+)
+
+
+def _prompt_tokens(text: str) -> int:
+    return count_tokens(COMMENT_SYSTEM_MESSAGE) + count_tokens(text)
+
+
+def test_count_tokens_estimate(monkeypatch):
+    # tiktoken 설치 여부와 관계없이 추정치 검사
+    monkeypatch.setattr(prompt, "_tiktoken_encoding", lambda: None)
+    assert count_tokens("") == 0
+    assert count_tokens("가나다") == 3
+    assert count_tokens("abcdefgh") == 2
+    assert count_tokens("가 abc") == 2
+
+
+def test_truncate_to_tokens_fits_budget():
+    assert truncate_to_tokens("짧은 일기", 100) == "짧은 일기"
+    truncated = truncate_to_tokens(LONG_DIARY, 50)
+    assert count_tokens(truncated) <= 50
+    assert truncated.endswith("…")
+    assert LONG_DIARY.startswith(truncated[:-1])
+
+
+def test_summarize_diary_keeps_sentence_order_within_budget():
+    content = "아침에 일어났다. 회사에서 너무 우울하고 힘들었다. 저녁에는 친구를 만나서 행복했다. 잠을 잤다."
+    assert summarize_diary(content, 100) == content
+
+    summary = summarize_diary(content, 30)
+    assert count_tokens(summary) <= 30
+    chosen = [sentence + "." for sentence in summary.rstrip(".").split(". ")]
+    assert "회사에서 너무 우울하고 힘들었다." in chosen
+    positions = [content.index(sentence) for sentence in chosen]
+    assert positions == sorted(positions)
+
+
+def test_prompt_stays_within_budget():
+    summaries = [summarize_diary(LONG_DIARY, 120) for _ in range(10)]
+    for budget in (400, 1000, 2500):
+        prompt = build_comment_prompt(LONG_DIARY, summaries, budget)
+        assert _prompt_tokens(prompt) <= budget
+
+
+def test_prompt_keeps_short_diary_and_drops_lowest_ranked_summaries():
+    summaries = [f"{index}번 유사 일기 요약입니다. " * 10 for index in range(1, 6)]
+    prompt = build_comment_prompt("오늘은 평범한 하루였다.", summaries, 500)
+
+    assert "오늘은 평범한 하루였다." in prompt
+    assert "유사 일기 1:" in prompt
+    included = [index for index in range(1, 6) if f"유사 일기 {index}:" in prompt]
+    assert included == list(range(1, len(included) + 1))
+    assert len(included) < 5
+
+    assert "(없음)" in build_comment_prompt("오늘은 평범한 하루였다.", [], 500)
+
+
+def test_summaries_are_stored_and_refreshed_on_change(db, user):
+    diary = Diary(title="t", content=LONG_DIARY, date=datetime(2026, 9, 1), user_id=user.id)
+    db.add(diary)
+    db.commit()
+    updated_at = diary.updated_at
+
+    [summary] = get_diary_summaries(db, [(diary.id, diary.content)])
+    db.commit()
+    db.refresh(diary)
+    assert diary.summary == summary
+    assert diary.updated_at == updated_at
+    stored_hash = diary.summary_hash
+
+    assert get_diary_summaries(db, [(diary.id, diary.content)]) == [summary]
+
+    [changed] = get_diary_summaries(db, [(diary.id, "내용을 새로 고쳤다.")])
+    db.commit()
+    db.refresh(diary)
+    assert changed == "내용을 새로 고쳤다."
+    assert diary.summary_hash != stored_hash
+    assert get_diary_summaries(db, []) == []
@@ -0,0 +1,92 @@
+import itertools
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import database
+from database import (READ_YOUR_WRITES_HEADER, DatabaseSettings, create_db_engine, create_write_marker,
+                      write_marker_is_fresh)
+from migrations import upgrade
+
+
+def test_write_marker_round_trip():
+    marker = create_write_marker(7, time.time())
+    assert write_marker_is_fresh(marker, 7)
+    assert not write_marker_is_fresh(marker, 8)
+    assert not write_marker_is_fresh(None, 7)
+    assert not write_marker_is_fresh("garbage", 7)
+
+
+def test_write_marker_rejects_tampering_and_expiry():
+    marker = create_write_marker(7, time.time())
+    user_id, written_ms, signature = marker.split(".")
+    assert not write_marker_is_fresh(f"{user_id}.{int(written_ms) + 1}.{signature}", 7)
+    assert not write_marker_is_fresh(f"8.{written_ms}.{signature}", 8)
+
+    expired = create_write_marker(7, time.time() - database.DB_READ_YOUR_WRITES_SECONDS - 1)
+    assert not write_marker_is_fresh(expired, 7)
+
+
+@pytest.fixture
+def lagging_replica(monkeypatch):
+    """복제가 전혀 되지 않은 복제본 - primary 에만 있는 데이터는 보이지 않음"""
+    replica_engine = create_db_engine(DatabaseSettings("sqlite://", prefix="DB_REPLICA_"))
+    upgrade(replica_engine)
+    replica_session = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    monkeypatch.setattr(database, "ReadSessionLocals", [replica_session])
+    monkeypatch.setattr(database, "_reader_cycle", itertools.cycle([replica_session]))
+    yield
+    replica_engine.dispose()
+
+
+def _as_other_worker():
+    """다른 워커로 간 요청처럼 프로세스 내 쓰기 기록을 비움"""
+    database._recent_writes.clear()
+
+
+def test_write_marker_routes_reads_to_primary_across_workers(lagging_replica, client, fake_llm):
+    response = client.post("/user/signup", json={
+        "email": "replica@example.com", "password": "password", "nickname": "replica"
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert READ_YOUR_WRITES_HEADER in response.headers
+    _as_other_worker()
+    client.cookies.clear()
+
+    # 복제본에 없는 사용자는 primary 에서 확인하므로 401 이 아님
+    assert client.get("/user/profile", headers=headers).status_code == 200
+
+    response = client.post("/diaries/", json={
+        "title": "t", "content": "오늘은 친구와 산책했다", "date": "2026-07-01T10:00:00"
+    }, headers=headers)
+    diary_id = response.json()["id"]
+    marker = response.headers[READ_YOUR_WRITES_HEADER]
+    assert response.cookies.get(database.READ_YOUR_WRITES_COOKIE) == marker
+    _as_other_worker()
+    client.cookies.clear()
+
+    # 쓰기 표시가 없으면 복제본에서 읽으므로 아직 보이지 않음
+    assert client.get(f"/diaries/{diary_id}", headers=headers).status_code == 404
+    # 헤더나 쿠키로 쓰기 표시를 보내면 다른 워커에서도 primary 에서 읽음
+    assert client.get(f"/diaries/{diary_id}", headers={**headers, READ_YOUR_WRITES_HEADER: marker}).status_code == 200
+    client.cookies.set(database.READ_YOUR_WRITES_COOKIE, marker)
+    assert client.get(f"/diaries/{diary_id}", headers=headers).status_code == 200
+
+
+def test_statement_delete_sets_write_marker(lagging_replica, client, auth_headers):
+    diary_ids = [client.post("/diaries/", json={
+        "title": "t", "content": "지울 일기", "date": f"2026-07-0{day}T10:00:00"
+    }, headers=auth_headers).json()["id"] for day in (2, 3)]
+    _as_other_worker()
+
+    # 일기 삭제는 flush 없이 DELETE 문으로 실행됨
+    response = client.delete(f"/diaries/{diary_ids[0]}", headers=auth_headers)
+    assert response.status_code == 200
+    assert READ_YOUR_WRITES_HEADER in response.headers
+    assert database._recent_writes
+
+    _as_other_worker()
+    response = client.post("/diaries/bulk-delete", json={"start_date": "2026-07-01"}, headers=auth_headers)
+    assert response.json()["deleted_count"] == 1
+    assert READ_YOUR_WRITES_HEADER in response.headers
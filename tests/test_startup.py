@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+
+import database
+
+# main 을 import 한 직후 상태를 새 프로세스에서 확인 - 무거운 객체는 첫 사용 시점에 만들어져야 함
+_PROBE = """
+import json, sys
+import main, emotion, keywords, prompt
+print(json.dumps({
+    "emotion_analyzer": emotion.get_emotion_analyzer.cache_info().currsize,
+    "tiktoken_encoding": prompt._tiktoken_encoding.cache_info().currsize,
+    "tag_vocabulary": keywords._vocabulary._loaded_at,
+    "lazy_modules": sorted(name for name in ("httpx", "passlib", "tiktoken") if name in sys.modules),
+}))
+"""
+
+
+def test_import_does_not_build_heavy_objects():
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=os.path.dirname(database.__file__),
+        env=os.environ.copy(),
+        capture_output=True, text=True, check=True,
+    )
+    state = json.loads(result.stdout.strip().splitlines()[-1])
+    assert state == {"emotion_analyzer": 0, "tiktoken_encoding": 0, "tag_vocabulary": 0.0, "lazy_modules": []}
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pytest
+
+from models import Diary, Tag, TagRollup, diary_tag
+from tags import TagCanonicalizer, canonicalize_tag, merge_duplicate_tags, plan_tag_merges
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("친구", "친구"),
+    ("  친구  ", "친구"),
+    ("친구들", "친구"),
+    ("#친구", "친구"),
+    ("'여행'", "여행"),
+    ("운동.", "운동"),
+    ("친구와의 관계", "친구"),
+    ("친구의 관계", "친구"),
+    ("친구랑 여행", "친구 여행"),
+    ("책 읽기", "독서"),
+    ("고양이", "고양이"),
+    # 명사의 일부인 글자/기호는 유지
+    ("자본주의 사회", "자본주의 사회"),
+    ("개인주의 성향", "개인주의 성향"),
+    ("피부과 진료", "피부과 진료"),
+    ("C++", "C++"),
+    ("C#", "C#"),
+    ("!!!", ""),
+])
+def test_canonicalize_tag(name, expected):
+    assert canonicalize_tag(name) == expected
+
+
+@pytest.mark.parametrize("name", ["친구와의 관계", "자본주의 사회", "#여행들", "C++", "가족과 갈등"])
+def test_canonicalize_is_idempotent(name):
+    once = canonicalize_tag(name)
+    assert canonicalize_tag(once) == once
+
+
+def test_custom_aliases_are_normalized():
+    canonicalizer = TagCanonicalizer({"  헬스장 운동 ": "#운동"})
+    assert canonicalizer.canonicalize("헬스장 운동") == "운동"
+    assert canonicalizer.canonicalize("운동") == "운동"
+
+
+def test_merge_duplicate_tags_moves_links_and_rebuilds_rollups(db, user):
+    suffix = f"병합{user.id}"
+    canonical = Tag(name=f"산책{suffix}", category=None)
+    plural = Tag(name=f"산책{suffix}들", category="취미")
+    hashtag = Tag(name=f"#산책{suffix}", category=None)
+    db.add_all([canonical, plural, hashtag])
+    db.flush()
+
+    first = Diary(title="t", content="c", date=datetime(2026, 8, 1), user_id=user.id)
+    second = Diary(title="t", content="c", date=datetime(2026, 8, 2), user_id=user.id)
+    first.tags = [canonical, plural]
+    second.tags = [hashtag]
+    db.add_all([first, second])
+    db.commit()
+    canonical_id = canonical.id
+    duplicate_ids = sorted([plural.id, hashtag.id])
+    diary_ids = sorted([first.id, second.id])
+
+    merges = [merge for merge in plan_tag_merges(db) if merge.canonical == f"산책{suffix}"]
+    assert len(merges) == 1
+    assert merges[0].survivor_id == canonical_id
+    assert sorted(merges[0].duplicate_ids) == duplicate_ids
+
+    merge_duplicate_tags(db)
+
+    survivor = db.get(Tag, canonical_id)
+    assert survivor.category == "취미"
+    assert db.query(Tag).filter(Tag.id.in_(duplicate_ids)).count() == 0
+    links = db.query(diary_tag.c.diary_id).filter(diary_tag.c.tag_id == canonical_id).all()
+    assert sorted(diary_id for (diary_id,) in links) == diary_ids
+    rollup = db.query(TagRollup).filter(
+        TagRollup.user_id == user.id, TagRollup.period == "month", TagRollup.tag_id == canonical_id
+    ).one()
+    assert rollup.count == 2